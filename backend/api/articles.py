@@ -2,11 +2,12 @@
 Articles API Endpoints
 """
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
-from models.database import get_db
-from models import ArticleSchema
+from sqlalchemy import select
+from models.database import ReadSession, get_read_db
+from models import Article, ArticleSchema
+from services.serialization import ARTICLE_FIELDS, FastJSONResponse, columns, rows_to_dicts
 from services.storage_service import storage_service
 
 router = APIRouter()
@@ -20,13 +21,16 @@ async def get_articles(
     language: Optional[str] = None,
     country: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Get articles with filters and pagination
+
+    Solo le colonne di ArticleSchema, codificate direttamente (senza
+    ri-validare ogni riga col response_model)
     """
-    articles = storage_service.get_articles(
-        db=db,
+    statement = storage_service.article_rows_statement(
+        ARTICLE_FIELDS,
         limit=limit,
         offset=offset,
         source=source,
@@ -34,31 +38,32 @@ async def get_articles(
         country=country,
         search_query=search
     )
-    return articles
+    rows = (await db.execute(statement)).all()
+    return FastJSONResponse(rows_to_dicts(ARTICLE_FIELDS, rows))
 
 
 @router.get("/{article_id}", response_model=ArticleSchema)
 async def get_article(
     article_id: int,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Get single article by ID
     """
-    article = storage_service.get_article_by_id(article_id, db)
-    if not article:
+    row = (await db.execute(select(*columns(Article, ARTICLE_FIELDS)).where(Article.id == article_id))).first()
+    if not row:
         from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    return FastJSONResponse(dict(zip(ARTICLE_FIELDS, row)))
 
 
 @router.get("/count/total")
 async def count_articles(
     source: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Count articles with optional source filter
     """
-    count = storage_service.count_articles(db=db, source=source)
+    count = await db.scalar(storage_service.count_statement(source=source))
     return {"count": count}
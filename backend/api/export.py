@@ -0,0 +1,57 @@
+"""
+Export API
+Dump in streaming degli articoli filtrati (NDJSON, Arrow IPC, Parquet)
+Al posto di paginare /api/articles: una query, memoria costante, gzip opzionale
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from services.export_service import ARROW_AVAILABLE, EXPORT_FIELDS, FORMATS, export_filename, export_service
+
+router = APIRouter(prefix="/api/export", tags=["export"])
+
+
+@router.get("/articles")
+def export_articles(
+    format: str = Query(default="ndjson", regex="^(ndjson|arrow|parquet)$"),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    source: Optional[str] = None,
+    topic_id: Optional[str] = None,
+    language: Optional[str] = None,
+    country: Optional[str] = None,
+    fields: Optional[str] = Query(default=None, description="Colonne separate da virgola (default: tutte)"),
+    gzip: bool = False
+):
+    """
+    Export completo degli articoli che rispettano i filtri
+
+    Esempi:
+    - /api/export/articles?start_date=2025-01-01&gzip=true  (NDJSON gzip)
+    - /api/export/articles?format=parquet&source=ansa&fields=id,title,published_at
+
+    Le righe escono in ordine di id; il body è generato a blocchi mentre
+    viene inviato (iterator sincrono: gira nel threadpool).
+    """
+    selected = tuple(f.strip() for f in fields.split(',') if f.strip()) if fields else EXPORT_FIELDS
+    unknown = set(selected) - set(EXPORT_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    if format != 'ndjson' and not ARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail=f"Format {format} requires pyarrow")
+    if format == 'parquet' and gzip:
+        raise HTTPException(status_code=400, detail="Parquet is already compressed (zstd), drop gzip")
+
+    chunks = export_service.export(
+        format, selected, gzip=gzip,
+        start_date=start_date, end_date=end_date, source=source,
+        topic_id=topic_id, language=language, country=country
+    )
+    return StreamingResponse(
+        chunks,
+        media_type='application/gzip' if gzip else FORMATS[format][0],
+        headers={'Content-Disposition': f'attachment; filename="{export_filename(format, gzip)}"'}
+    )
@@ -3,8 +3,9 @@ Health Monitoring API
 Provides status information about scheduled jobs and system health
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from models.database import get_db
+from sqlalchemy import func, select
+from models.database import ReadSession, engine, get_read_db
+from models.sqlite import write_queue
 from models.article import Article
 from models.topic import Topic
 from jobs.scheduler import get_scheduler_status
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/health", tags=["health"])
 
 
 @router.get("")
-async def get_health(db: Session = Depends(get_db)):
+async def get_health(db: ReadSession = Depends(get_read_db)):
     """
     Get comprehensive health status of the Pulse system
     
@@ -28,25 +29,25 @@ async def get_health(db: Session = Depends(get_db)):
     scheduler_status = get_scheduler_status()
     
     # Database statistics
-    total_articles = db.query(Article).count()
-    total_topics = db.query(Topic).count()
+    total_articles = await db.scalar(select(func.count(Article.id)))
+    total_topics = await db.scalar(select(func.count(Topic.id)))
     
     # Articles by source
     articles_by_source = {}
     for source in ['ansa', 'reddit', 'hackernews']:
-        count = db.query(Article).filter(Article.source == source).count()
+        count = await db.scalar(select(func.count(Article.id)).where(Article.source == source))
         articles_by_source[source] = count
     
     # Recent articles (last 24 hours)
     yesterday = datetime.utcnow() - timedelta(hours=24)
-    recent_articles = db.query(Article).filter(
+    recent_articles = await db.scalar(select(func.count(Article.id)).where(
         Article.scraped_at >= yesterday
-    ).count()
+    ))
     
     # Latest article timestamp
-    latest_article = db.query(Article).order_by(
+    latest_article = (await db.execute(select(Article.published_at).order_by(
         Article.published_at.desc()
-    ).first()
+    ).limit(1))).first()
     
     latest_article_time = None
     data_freshness = "unknown"
@@ -67,7 +68,7 @@ async def get_health(db: Session = Depends(get_db)):
     # Topics info
     topics_info = {
         'total': total_topics,
-        'with_metrics': db.query(Topic).filter(Topic.pulse_score.isnot(None)).count()
+        'with_metrics': await db.scalar(select(func.count(Topic.id)).where(Topic.pulse_score.isnot(None)))
     }
     
     # System health summary
@@ -88,23 +89,39 @@ async def get_health(db: Session = Depends(get_db)):
         health_status = "critical"
         issues.append("Scheduler is not running")
     
+    ingest = scheduler_status.get('ingest_queue')
+    if ingest and ingest['depth'] >= ingest['capacity']:
+        if health_status == "healthy":
+            health_status = "warning"
+        issues.append(f"Ingest queue full (lag {ingest['lag_seconds']:.1f}s)")
+    
+    event_loop = scheduler_status.get('event_loop')
+    if event_loop and event_loop['p99_ms'] >= event_loop['warn_ms']:
+        if health_status == "healthy":
+            health_status = "warning"
+        issues.append(f"Event loop lag p99 {event_loop['p99_ms']:.0f}ms")
+    
     if scheduler_status.get('scraping_stats', {}).get('last_error'):
         if health_status == "healthy":
             health_status = "warning"
         issues.append(f"Last scraping error: {scheduler_status['scraping_stats']['last_error']}")
     
+    database = {
+        'total_articles': total_articles,
+        'articles_by_source': articles_by_source,
+        'recent_articles_24h': recent_articles,
+        'latest_article': latest_article_time,
+        'data_freshness': data_freshness
+    }
+    if engine.dialect.name == 'sqlite':
+        database['write_queue'] = write_queue.snapshot()
+    
     return {
         'status': health_status,
         'timestamp': datetime.utcnow().isoformat(),
         'issues': issues,
         'scheduler': scheduler_status,
-        'database': {
-            'total_articles': total_articles,
-            'articles_by_source': articles_by_source,
-            'recent_articles_24h': recent_articles,
-            'latest_article': latest_article_time,
-            'data_freshness': data_freshness
-        },
+        'database': database,
         'topics': topics_info
     }
 
@@ -127,14 +144,37 @@ async def trigger_scraping():
     Manually trigger the scraping job
     Useful for testing or on-demand updates
     """
-    from jobs.scheduler import scrape_all_sources
-    import asyncio
+    from jobs.scheduler import trigger_scraping as start_scraping
     
-    # Run scraping in background
-    asyncio.create_task(scrape_all_sources())
+    # Run scraping in background (at most one run; not while ingest is backed up)
+    if not start_scraping():
+        return {
+            'status': 'busy',
+            'message': 'Scraping already running or ingest queue full',
+            'ingest_queue': get_scheduler_status().get('ingest_queue'),
+            'timestamp': datetime.utcnow().isoformat()
+        }
     
     return {
         'status': 'triggered',
         'message': 'Scraping job started',
         'timestamp': datetime.utcnow().isoformat()
     }
+
+
+@router.post("/trigger-refresh")
+async def trigger_refresh():
+    """
+    Manually request a topic refresh
+    Coalesced with other pending requests; supersedes a refresh in progress
+    """
+    from jobs.scheduler import trigger_refresh as request_refresh, refresh_coordinator
+    
+    request_refresh()
+    
+    return {
+        'status': 'scheduled',
+        'message': f"Topic refresh scheduled (debounce {refresh_coordinator.debounce_seconds:.0f}s)",
+        'refresh': refresh_coordinator.snapshot(),
+        'timestamp': datetime.utcnow().isoformat()
+    }
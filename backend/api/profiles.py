@@ -0,0 +1,70 @@
+"""
+Profiles API
+Profili campionati dei job (refresh, scrape, cleanup): sommari e artifact
+Gli endpoint che leggono file sono def (threadpool), non bloccano l'event loop
+"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from config import settings
+from services.profiling import format_stats, job_profiler
+
+router = APIRouter(prefix="/api/profiles", tags=["profiles"])
+
+
+@router.get("")
+def list_profiles(job: Optional[str] = None):
+    """Profili salvati, dal più recente (durata, query SQL, artifact)"""
+    return {
+        'enabled': settings.PROFILING_ENABLED,
+        'sample_rate': settings.PROFILING_SAMPLE_RATE,
+        'jobs': settings.PROFILING_JOBS,
+        'profiles': job_profiler.list_profiles(job),
+    }
+
+
+@router.post("/{job}/arm")
+async def arm_profile(job: str):
+    """Profila il prossimo run del job (anche con profiling disabilitato)"""
+    if job not in ('refresh', 'scrape', 'cleanup'):
+        raise HTTPException(status_code=404, detail=f"Unknown job {job}")
+    job_profiler.arm(job)
+    return {
+        'status': 'armed',
+        'message': f"Next {job} run will be profiled",
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str):
+    """Sommario completo: funzioni più costose e statement SQL più lenti"""
+    report = job_profiler.load(profile_id)
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return report
+
+
+@router.get("/{profile_id}/stats", response_class=PlainTextResponse)
+def get_profile_stats(profile_id: str, limit: int = 30):
+    """Tabella pstats (cProfile) o albero delle chiamate (pyinstrument)"""
+    path = job_profiler.artifact_path(profile_id + '.prof')
+    if path is not None:
+        return format_stats(path, limit)
+    path = job_profiler.artifact_path(profile_id + '.txt')
+    if path is not None:
+        with open(path) as f:
+            return f.read()
+    raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+
+@router.get("/{profile_id}/download")
+async def download_profile(profile_id: str):
+    """Artifact .prof da aprire con snakeviz/pstats"""
+    path = job_profiler.artifact_path(profile_id + '.prof')
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} has no .prof artifact")
+    return FileResponse(path, media_type='application/octet-stream', filename=profile_id + '.prof')
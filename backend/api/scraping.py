@@ -6,9 +6,9 @@ from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime, timedelta
 
-from scrapers import scraper_registry
-from services.parser_service import parser_service
-from services.language_service import language_service
+from scrapers import scraper_registry, http_client
+from services.processing_service import processing_service
+from services.ingest_pipeline import run_streaming_ingest
 from services.storage_service import storage_service
 
 router = APIRouter()
@@ -19,6 +19,7 @@ class ScrapeRequest(BaseModel):
     sources: Optional[List[str]] = None
     max_pages: int = 3
     days_back: int = 7
+    streaming: bool = False  # Pipeline a record senza DataFrame (backfill grandi)
 
 
 class ScrapeResponse(BaseModel):
@@ -42,7 +43,8 @@ async def scrape_articles(request: ScrapeRequest, background_tasks: BackgroundTa
         query=request.query,
         sources=request.sources,
         max_pages=request.max_pages,
-        days_back=request.days_back
+        days_back=request.days_back,
+        streaming=request.streaming
     )
     
     return ScrapeResponse(
@@ -62,7 +64,8 @@ async def scrape_now(request: ScrapeRequest):
         query=request.query,
         sources=request.sources,
         max_pages=request.max_pages,
-        days_back=request.days_back
+        days_back=request.days_back,
+        streaming=request.streaming
     )
     
     return result
@@ -72,7 +75,8 @@ async def run_scraping_pipeline(
     query: str,
     sources: Optional[List[str]] = None,
     max_pages: int = 3,
-    days_back: int = 7
+    days_back: int = 7,
+    streaming: bool = False
 ):
     """
     Complete scraping pipeline:
@@ -80,21 +84,42 @@ async def run_scraping_pipeline(
     2. Parse and normalize
     3. Detect language & country
     4. Save to database
+    
+    Con streaming=True gli step girano a batch mentre gli scraper scaricano
     """
     try:
-        # Step 1: Scrape
+        # Step 1: Scrape (retry budget nuovo per ogni run)
+        http_client.start_run()
         start_date = datetime.now() - timedelta(days=days_back)
         end_date = datetime.now()
         
-        df = scraper_registry.scrape_all(
+        if streaming:
+            stats = run_streaming_ingest(
+                query=query,
+                sources=sources,
+                max_pages=max_pages,
+                start_date=start_date,
+                end_date=end_date
+            )
+            return {
+                "status": "success",
+                "articles_scraped": stats['scraped'],
+                "articles_parsed": stats['parsed'],
+                "articles_failed": stats['errors'],
+                "articles_saved": stats['saved'],
+                "first_save_seconds": stats['first_save_s'],
+                "message": f"Successfully processed {stats['saved']} articles"
+            }
+        
+        records = list(scraper_registry.iter_all(
             query=query,
             sources=sources,
             max_pages=max_pages,
             start_date=start_date,
             end_date=end_date
-        )
+        ))
         
-        if df.empty:
+        if not records:
             return {
                 "status": "success",
                 "articles_scraped": 0,
@@ -102,28 +127,21 @@ async def run_scraping_pipeline(
                 "message": "No articles found"
             }
         
-        # Step 2: Parse
-        articles = parser_service.parse_dataframe(df)
-        
-        # Step 3: Enrich
-        enriched = []
-        for article in articles:
-            article_dict = article.model_dump()
-            enriched_dict = language_service.enrich_article(article_dict)
-            
-            from models import ArticleCreate
-            enriched_article = ArticleCreate(**enriched_dict)
-            enriched.append(enriched_article)
+        # Step 2+3: Parse, clean, dedup ed enrich (process pool per batch grandi)
+        result = processing_service.process_records(records)
+        articles = result['articles']
         
-        # Step 4: Save
-        saved = storage_service.save_articles(enriched)
+        # Step 4: Save (bulk, senza passare da Pydantic)
+        saved = storage_service.save_records(articles)
         
         return {
             "status": "success",
-            "articles_scraped": len(df),
+            "articles_scraped": len(records),
             "articles_parsed": len(articles),
-            "articles_saved": len(saved),
-            "message": f"Successfully processed {len(saved)} articles"
+            "articles_duplicates": result['duplicates'],
+            "articles_failed": result['errors'],
+            "articles_saved": saved,
+            "message": f"Successfully processed {saved} articles"
         }
         
     except Exception as e:
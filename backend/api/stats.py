@@ -1,29 +1,36 @@
 """
 Statistics API Endpoints
 """
+from typing import Dict
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from models.database import get_db
+from models.database import ReadSession, get_read_db
 from services.storage_service import storage_service
 
 router = APIRouter()
 
 
+async def _article_stats(db: ReadSession) -> Dict:
+    """storage_service.get_article_stats con le query sulla sessione di lettura"""
+    statements = storage_service.stats_statements()
+    results = await db.execute_all(list(statements.values()))
+    return storage_service.stats_from_rows({name: result.all() for name, result in zip(statements, results)})
+
+
 @router.get("/overview")
-async def get_stats_overview(db: Session = Depends(get_db)):
+async def get_stats_overview(db: ReadSession = Depends(get_read_db)):
     """
     Get general statistics overview
     """
-    stats = storage_service.get_article_stats(db)
+    stats = await _article_stats(db)
     return stats
 
 
 @router.get("/sources")
-async def get_source_stats(db: Session = Depends(get_db)):
+async def get_source_stats(db: ReadSession = Depends(get_read_db)):
     """
     Get statistics by source
     """
-    stats = storage_service.get_article_stats(db)
+    stats = await _article_stats(db)
     return {
         "by_source": stats.get('by_source', {}),
         "total": stats.get('total_articles', 0)
@@ -31,11 +38,11 @@ async def get_source_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/languages")
-async def get_language_stats(db: Session = Depends(get_db)):
+async def get_language_stats(db: ReadSession = Depends(get_read_db)):
     """
     Get statistics by language
     """
-    stats = storage_service.get_article_stats(db)
+    stats = await _article_stats(db)
     return {
         "by_language": stats.get('by_language', {}),
         "total": stats.get('total_articles', 0)
@@ -43,11 +50,11 @@ async def get_language_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/countries")
-async def get_country_stats(db: Session = Depends(get_db)):
+async def get_country_stats(db: ReadSession = Depends(get_read_db)):
     """
     Get statistics by country
     """
-    stats = storage_service.get_article_stats(db)
+    stats = await _article_stats(db)
     return {
         "by_country": stats.get('by_country', {}),
         "total": stats.get('total_articles', 0)
@@ -0,0 +1,51 @@
+"""
+Stream API
+Aggiornamenti live della dashboard via Server-Sent Events
+
+Eventi (data JSON compatto):
+- articles: articoli nuovi salvati {total, sources: {fonte: n}}
+- topics: metriche cambiate {topics: [{topic_id, pulse_score, volume, velocity, ...}]}
+- refresh: refresh topic completato {topics, articles, metrics_updated}
+- resync: eventi persi (client lento o storico scaduto), ricaricare via REST
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+
+from config import settings
+from services.event_bus import event_bus
+
+router = APIRouter(prefix="/api/stream", tags=["stream"])
+
+
+@router.get("")
+async def stream_events(types: Optional[str] = None, last_event_id: Optional[str] = Header(default=None)):
+    """
+    Stream SSE (EventSource); types=articles,topics filtra gli eventi
+    
+    Il browser alla riconnessione manda Last-Event-ID e riceve gli eventi
+    persi finché sono nello storico.
+    """
+    if event_bus.clients >= settings.STREAM_MAX_CLIENTS:
+        raise HTTPException(status_code=503, detail="Too many stream clients")
+    
+    wanted = [t.strip() for t in types.split(',') if t.strip()] if types else None
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    
+    async def events():
+        # Registrazione nel generatore: il finally la rimuove qualunque cosa succeda
+        subscription = event_bus.subscribe(types=wanted, last_event_id=resume_from)
+        try:
+            yield f"retry: 5000\n: connected ({event_bus.clients} clients)\n\n".encode('utf-8')
+            while True:
+                event = await subscription.get(timeout=settings.STREAM_KEEPALIVE_SECONDS)
+                yield event.encode() if event is not None else b": keepalive\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}  # Niente buffering di nginx
+    )
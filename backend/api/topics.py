@@ -1,38 +1,69 @@
 """
 Topics API Endpoints
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from models.database import get_db
+from models.database import ReadSession, get_db, get_read_db
 from models.topic import Topic, TopicSchema, TopicWithSources
 from models.article import Article
 from services.metrics_service import metrics_service
+from services.serialization import ARTICLE_FIELDS, TOPIC_FIELDS, FastJSONResponse, columns, rows_to_dicts
 
 router = APIRouter(prefix="/api/topics", tags=["topics"])
 
+# Articoli di un topic: colonne di ArticleSchema + topic/authority (niente embedding_vector)
+TOPIC_ARTICLE_FIELDS = ARTICLE_FIELDS + ('topic_id', 'authority_score')
+
+
+async def _with_sources(db: ReadSession, topics: List[Dict]) -> List[Dict]:
+    """
+    article_count e sources per i topic con una sola query aggregata
+    (topic_id, source) invece di caricare tutti gli articoli di ogni topic
+    """
+    counts = {topic['topic_id']: 0 for topic in topics}
+    sources = {topic['topic_id']: [] for topic in topics}
+    if counts:
+        grouped = await db.execute(
+            select(Article.topic_id, Article.source, func.count(Article.id)).where(
+                Article.topic_id.in_(list(counts))
+            ).group_by(Article.topic_id, Article.source)
+        )
+        for topic_id, source, count in grouped:
+            counts[topic_id] += count
+            if source:
+                sources[topic_id].append(source)
+    
+    for topic in topics:
+        topic['keywords'] = topic['keywords'] or []
+        topic['sources'] = sorted(sources[topic['topic_id']])
+        topic['article_count'] = counts[topic['topic_id']]
+        topic['sample_articles'] = []
+    return topics
+
 
 @router.get("", response_model=List[TopicWithSources])
-def get_topics(
+async def get_topics(
     limit: int = Query(default=20, ge=1, le=100),
-    sort_by: str = Query(default="pulse_score", regex="^(pulse_score|volume|velocity|novelty|last_updated)$"),
+    sort_by: str = Query(default="pulse_score", regex="^(pulse_score|volume|velocity|novelty|last_updated|forecast_velocity)$"),
     country: Optional[str] = None,
     sector: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Get list of topics with metrics
     
     Query params:
     - limit: max topics to return (default 20)
-    - sort_by: sorting field (pulse_score, volume, velocity, novelty, last_updated)
+    - sort_by: sorting field (pulse_score, volume, velocity, novelty, last_updated, forecast_velocity)
     - country: filter by country (ITA, USA, GLOBAL, etc)
     - sector: filter by sector (Tech, Politics, etc)
     
     Returns:
         List of topics with article counts and sources
     """
-    query = db.query(Topic)
+    query = select(*columns(Topic, TOPIC_FIELDS))
     
     # Filtri opzionali
     if country:
@@ -51,31 +82,19 @@ def get_topics(
         query = query.order_by(Topic.novelty.desc())
     elif sort_by == "last_updated":
         query = query.order_by(Topic.last_updated.desc())
+    elif sort_by == "forecast_velocity":
+        query = query.order_by(Topic.forecast_velocity.desc())
     
-    topics = query.limit(limit).all()
+    topics = rows_to_dicts(TOPIC_FIELDS, await db.execute(query.limit(limit)))
     
     # Arricchisci con counts e sources
-    results = []
-    for topic in topics:
-        articles = db.query(Article).filter(Article.topic_id == topic.topic_id).all()
-        
-        sources = list(set(art.source for art in articles if art.source))
-        
-        topic_dict = {
-            **topic.__dict__,
-            'article_count': len(articles),
-            'sources': sources
-        }
-        
-        results.append(TopicWithSources(**topic_dict))
-    
-    return results
+    return FastJSONResponse(await _with_sources(db, topics))
 
 
 @router.get("/{topic_id}", response_model=TopicWithSources)
-def get_topic(
+async def get_topic(
     topic_id: str,
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Get single topic by ID with all details
@@ -86,29 +105,19 @@ def get_topic(
     Returns:
         Topic with metrics, articles, and sources
     """
-    topic = db.query(Topic).filter(Topic.topic_id == topic_id).first()
+    topic = (await db.execute(select(*columns(Topic, TOPIC_FIELDS)).where(Topic.topic_id == topic_id))).first()
     
     if not topic:
         raise HTTPException(status_code=404, detail=f"Topic {topic_id} not found")
     
-    # Query articoli
-    articles = db.query(Article).filter(Article.topic_id == topic_id).all()
-    sources = list(set(art.source for art in articles if art.source))
-    
-    topic_dict = {
-        **topic.__dict__,
-        'article_count': len(articles),
-        'sources': sources
-    }
-    
-    return TopicWithSources(**topic_dict)
+    return FastJSONResponse((await _with_sources(db, rows_to_dicts(TOPIC_FIELDS, [topic])))[0])
 
 
 @router.get("/{topic_id}/articles")
-def get_topic_articles(
+async def get_topic_articles(
     topic_id: str,
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db)
+    db: ReadSession = Depends(get_read_db)
 ):
     """
     Get all articles belonging to a topic
@@ -121,17 +130,17 @@ def get_topic_articles(
         List of articles
     """
     # Verifica topic exists
-    topic = db.query(Topic).filter(Topic.topic_id == topic_id).first()
-    if not topic:
+    topic = await db.scalar(select(Topic.id).where(Topic.topic_id == topic_id))
+    if topic is None:
         raise HTTPException(status_code=404, detail=f"Topic {topic_id} not found")
     
-    articles = db.query(Article).filter(
+    rows = await db.execute(select(*columns(Article, TOPIC_ARTICLE_FIELDS)).where(
         Article.topic_id == topic_id
     ).order_by(
         Article.published_at.desc()
-    ).limit(limit).all()
+    ).limit(limit))
     
-    return articles
+    return FastJSONResponse(rows_to_dicts(TOPIC_ARTICLE_FIELDS, rows))
 
 
 @router.post("/{topic_id}/refresh")
@@ -0,0 +1,5 @@
+"""
+Benchmark Pulse - eseguire dalla cartella backend/:
+
+    python -m benchmarks.bench_language --n 10000
+"""
@@ -0,0 +1,116 @@
+"""
+Benchmark ParserService.clean_html
+
+Corpus dalle fixture ANSA (pagina di ricerca) e Reddit (listing JSON):
+titoli e testi già estratti dagli scraper (niente markup), frammenti
+HTML per articolo, selftext_html Reddit e pagine intere.
+
+    python -m benchmarks.bench_clean_html --n 20000
+"""
+import argparse
+import html
+import json
+import os
+import re
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from config import settings
+from services.parser_service import ParserService, SelectolaxParser, lxml_html
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def legacy_clean_html(text: str) -> str:
+    """clean_html originale: BeautifulSoup su ogni stringa + due regex non compilate"""
+    if not text:
+        return ""
+    soup = BeautifulSoup(text, 'html.parser')
+    text = soup.get_text(separator=' ', strip=True)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s.,!?;:()\-\'"àèéìòùÀÈÉÌÒÙäöüÄÖÜßñÑ]', '', text)
+    return text.strip()
+
+
+def load_corpus() -> Dict[str, List[str]]:
+    """Stringhe reali passate a clean_html, raggruppate per tipo"""
+    with open(os.path.join(FIXTURES_DIR, 'ansa_search.html'), encoding='utf-8') as f:
+        ansa_page = f.read()
+    with open(os.path.join(FIXTURES_DIR, 'reddit_search.json'), encoding='utf-8') as f:
+        reddit = json.load(f)
+
+    soup = BeautifulSoup(ansa_page, 'html.parser')
+    articles = soup.find_all('article')
+    posts = [child['data'] for child in reddit['data']['children']]
+
+    return {
+        'plain_text': (
+            [a.find('h2').get_text(strip=True) for a in articles]
+            + [a.find('div', 'text').get_text(strip=True) for a in articles]
+            + [p['title'] for p in posts]
+            + [p['selftext'] for p in posts if p['selftext']]
+        ),
+        'html_fragment': (
+            [str(a) for a in articles]
+            + [html.unescape(p['selftext_html']) for p in posts if p['selftext_html']]
+        ),
+        'html_page': [ansa_page],
+    }
+
+
+def build_workload(corpus: Dict[str, List[str]], n: int) -> List[str]:
+    """Mix realistico: per lo più testo già pulito, pochi frammenti, rare pagine"""
+    mix = corpus['plain_text'] * 8 + corpus['html_fragment'] * 2 + corpus['html_page']
+    return (mix * (n // len(mix) + 1))[:n]
+
+
+def _timed(fn, texts: List[str]) -> float:
+    started = time.perf_counter()
+    fn(texts)
+    return time.perf_counter() - started
+
+
+def run(n: int) -> dict:
+    corpus = load_corpus()
+    workload = build_workload(corpus, n)
+    results = {'n': n, 'by_kind': {}}
+
+    engines = ['bs4']
+    if lxml_html is not None:
+        engines.append('lxml')
+    if SelectolaxParser is not None:
+        engines.append('selectolax')
+
+    original_engine = settings.HTML_CLEANER_ENGINE
+    try:
+        for kind, texts in corpus.items():
+            reps = max(1, 2000 // len(texts))
+            batch = texts * reps
+            row = {'legacy_us': _timed(lambda t: [legacy_clean_html(x) for x in t], batch)}
+            for engine in engines:
+                settings.HTML_CLEANER_ENGINE = engine
+                row[f'{engine}_us'] = _timed(lambda t: [ParserService.clean_html(x) for x in t], batch)
+            results['by_kind'][kind] = {k: round(v / len(batch) * 1e6, 2) for k, v in row.items()}
+
+        legacy_s = _timed(lambda t: [legacy_clean_html(x) for x in t], workload)
+        results['legacy_s'] = round(legacy_s, 3)
+        for engine in engines:
+            settings.HTML_CLEANER_ENGINE = engine
+            results[f'{engine}_s'] = round(_timed(lambda t: [ParserService.clean_html(x) for x in t], workload), 3)
+            results[f'{engine}_clean_many_s'] = round(_timed(ParserService.clean_many, workload), 3)
+            results[f'{engine}_speedup'] = round(legacy_s / max(results[f'{engine}_s'], 1e-9), 2)
+    finally:
+        settings.HTML_CLEANER_ENGINE = original_engine
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.n), indent=2))
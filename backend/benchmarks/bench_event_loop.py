@@ -0,0 +1,127 @@
+"""
+Benchmark latenza API durante un job CPU-bound
+
+Un'app FastAPI minimale riceve richieste continue (in-process, httpx
+ASGITransport) mentre gira un clustering K-Means in numpy: inline
+nell'event loop come i vecchi job `async def`, in un thread (run_io) o in
+un processo (run_cpu). Il riferimento è la latenza a loop inattivo.
+
+    python -m benchmarks.bench_event_loop --points 4000 --iterations 30
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+from jobs.executors import LoopLagMonitor, run_cpu, run_io, shutdown_executors
+
+
+def kmeans_workload(points: int, dims: int, k: int, iterations: int, seed: int = 42) -> int:
+    """K-Means su embedding casuali (stesso ordine di grandezza del refresh topic)"""
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((points, dims)).astype(np.float32)
+    centroids = data[rng.choice(points, k, replace=False)]
+    for _ in range(iterations):
+        distances = ((data[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        for cluster in range(k):
+            members = data[labels == cluster]
+            if len(members):
+                centroids[cluster] = members.mean(axis=0)
+    return int(np.bincount(labels, minlength=k).max())
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+def _percentiles(latencies: list) -> dict:
+    ordered = sorted(latencies)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        'requests': len(ordered),
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'p99_ms': pick(0.99),
+        'max_ms': round(ordered[-1] * 1000, 2),
+    }
+
+
+async def _measure(mode: str, workload: dict, idle_seconds: float, pause: float) -> dict:
+    app = create_app()
+    monitor = LoopLagMonitor(interval=0.05, warn_ms=float('inf'))
+    monitor.start()
+    latencies = []
+
+    async def job():
+        if mode == 'idle':
+            await asyncio.sleep(idle_seconds)
+        elif mode == 'inline':
+            kmeans_workload(**workload)  # Come un job async def con codice sincrono
+        elif mode == 'thread':
+            await run_io('refresh', kmeans_workload, **workload)
+        elif mode == 'process':
+            await run_cpu('refresh', kmeans_workload, **workload)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        await client.get("/ping")  # Warm-up
+        started = time.perf_counter()
+        finished = []
+        task = asyncio.create_task(job())
+        task.add_done_callback(lambda _: finished.append(time.perf_counter()))
+
+        # Carico a intervalli fissi: la latenza parte dall'istante previsto di
+        # invio, così le richieste rimaste bloccate dietro al job contano
+        sent = 0
+        while not finished or started + sent * pause <= finished[0]:
+            intended = started + sent * pause
+            await asyncio.sleep(max(0.0, intended - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append(time.perf_counter() - intended)
+            sent += 1
+        await task
+        elapsed = finished[0] - started
+
+    await monitor.stop()
+    result = {'mode': mode, 'job_s': round(elapsed, 3)}
+    result.update(_percentiles(latencies))
+    result['loop_lag_max_ms'] = monitor.snapshot()['max_ms']
+    return result
+
+
+async def run(points: int, dims: int, k: int, iterations: int, pause: float) -> dict:
+    workload = {'points': points, 'dims': dims, 'k': k, 'iterations': iterations}
+
+    # Avvio del process pool (spawn + import) fuori dalle misure
+    await run_cpu('refresh', kmeans_workload, points=64, dims=dims, k=2, iterations=1)
+
+    results = {'workload': workload, 'runs': []}
+    for mode in ('idle', 'inline', 'thread', 'process'):
+        results['runs'].append(await _measure(mode, workload, idle_seconds=2.0, pause=pause))
+    shutdown_executors()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--points', type=int, default=4000)
+    parser.add_argument('--dims', type=int, default=384)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--pause', type=float, default=0.01, help='secondi tra due invii previsti')
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args.points, args.dims, args.k, args.iterations, args.pause)), indent=2))
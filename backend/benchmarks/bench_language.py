@@ -0,0 +1,130 @@
+"""
+Benchmark enrichment lingua/paese/entità
+
+Confronta il loop per-articolo originale (langdetect su tutto il testo,
+nessuna cache) con LanguageService.enrich_articles seriale, con process
+pool e a cache calda (secondo ciclo di scraping con le stesse storie).
+
+    python -m benchmarks.bench_language --n 10000 --duplicate-rate 0.3
+"""
+import argparse
+import json
+import random
+import re
+import time
+from typing import List
+
+from langdetect import detect, LangDetectException
+
+from services.language_service import LanguageService
+
+
+SENTENCES = {
+    'it': [
+        "Il governo italiano ha approvato la nuova legge di bilancio.",
+        "A Milano la borsa chiude in rialzo dopo una settimana difficile.",
+        "Gli esperti discutono il futuro dell'intelligenza artificiale in Europa.",
+        "La partita di ieri sera ha regalato grandi emozioni ai tifosi.",
+    ],
+    'en': [
+        "The company announced record quarterly earnings on Tuesday.",
+        "Researchers published a new study about climate change impacts.",
+        "The startup raised fifty million dollars in its latest round.",
+        "Lawmakers in Washington are debating the new technology bill.",
+    ],
+    'de': [
+        "Die Regierung in Berlin plant neue Investitionen in die Bahn.",
+        "Der Automobilhersteller meldet einen Rückgang der Verkäufe.",
+        "Forscher haben eine neue Methode zur Energiespeicherung entwickelt.",
+    ],
+    'fr': [
+        "Le gouvernement français présente une réforme des retraites.",
+        "Les chercheurs de Paris ont découvert une nouvelle molécule.",
+        "La start-up a levé des fonds pour développer son application.",
+    ],
+}
+
+
+def generate_articles(n: int, duplicate_rate: float, seed: int = 42) -> List[dict]:
+    """Articoli multilingua; una quota ripete storie già viste (cross-source)"""
+    rng = random.Random(seed)
+    articles = []
+    for i in range(n):
+        if articles and rng.random() < duplicate_rate:
+            original = rng.choice(articles)
+            articles.append({'title': original['title'], 'content': original['content']})
+            continue
+        lang = rng.choice(list(SENTENCES))
+        body = " ".join(rng.choice(SENTENCES[lang]) for _ in range(rng.randint(3, 40)))
+        articles.append({
+            'title': f"{rng.choice(SENTENCES[lang])[:60]} #{i}",
+            'content': body,
+        })
+    return articles
+
+
+def legacy_enrich(service: LanguageService, article: dict) -> dict:
+    """Replica del percorso pre-batch: testo completo, regex non compilata, nessuna cache"""
+    text = article.get('content', '')
+    title = article.get('title', '')
+    try:
+        language = detect(text) if text and len(text.strip()) >= 10 else None
+    except LangDetectException:
+        language = None
+    combined = f"{title} {text}".lower()
+    country = None
+    for code, keywords in service.GEO_KEYWORDS.items():
+        if any(kw in combined for kw in keywords):
+            country = code
+            break
+    re.findall(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b', f"{title}. {text}")
+    article['language'] = language
+    article['country'] = country or service.COUNTRY_CODES.get(language, 'GLOBAL')
+    return article
+
+
+def _timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def run(n: int, duplicate_rate: float, workers: int) -> dict:
+    articles = generate_articles(n, duplicate_rate)
+    copy = lambda: [dict(a) for a in articles]
+    results = {'n': n, 'duplicate_rate': duplicate_rate}
+
+    # Warm-up profili langdetect (caricati una volta per processo)
+    detect("warm up the language profiles")
+
+    legacy_service = LanguageService()
+    batch = copy()
+    results['legacy_s'] = _timed(lambda: [legacy_enrich(legacy_service, a) for a in batch])
+
+    serial_service = LanguageService()
+    results['batch_serial_s'] = _timed(lambda: serial_service.enrich_articles(copy(), workers=0))
+
+    if workers > 1:
+        pool_service = LanguageService()
+        results['batch_pool_s'] = _timed(lambda: pool_service.enrich_articles(copy(), workers=workers))
+
+    # Secondo ciclo: stesse storie di nuovo dalle fonti
+    results['batch_warm_cache_s'] = _timed(lambda: serial_service.enrich_articles(copy(), workers=0))
+
+    for key in [k for k in results if k.endswith('_s')]:
+        results[key] = round(results[key], 3)
+        results[key[:-2] + '_articles_per_s'] = round(n / max(results[key], 1e-9), 1)
+    results['speedup_serial'] = round(results['legacy_s'] / results['batch_serial_s'], 2)
+    if 'batch_pool_s' in results:
+        results['speedup_pool'] = round(results['legacy_s'] / results['batch_pool_s'], 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=10000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.3)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.n, args.duplicate_rate, args.workers), indent=2))
@@ -0,0 +1,106 @@
+"""
+Benchmark end-to-end scrape -> parse -> enrich -> store, offline
+
+Gli scraper ANSA e HN girano contro risposte riprodotte (cassetta
+registrata o sorgenti sintetiche) con latenza e banda simulate; gli
+articoli finiscono in un DB SQLite temporaneo.
+
+    python -m benchmarks.bench_pipeline --pages 50 --latency 0.08
+    python -m benchmarks.bench_pipeline --cassette /tmp/live.jsonl.gz
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+
+from benchmarks.synthetic import SyntheticSources
+from config import settings
+from models import database
+from scrapers import http_client
+from scrapers.replay import use_cassette
+from services.ingest_pipeline import run_streaming_ingest
+from services.language_service import language_service
+
+
+def run(
+    query: str,
+    pages: int,
+    latency: float,
+    throughput: float,
+    cassette: str = None,
+    respect_rate_limits: bool = False,
+    batch_size: int = None
+) -> dict:
+    results = {
+        'query': query,
+        'pages': pages,
+        'latency_s': latency,
+        'throughput_bps': throughput,
+        'source': cassette or 'synthetic',
+    }
+    sources = SyntheticSources(pages=pages)
+
+    original_limits = settings.HTTP_RATE_LIMITS
+    if not respect_rate_limits:
+        # Si misura la pipeline, non le attese imposte ai siti reali
+        settings.HTTP_RATE_LIMITS = {'www.ansa.it': 1000.0, 'hn.algolia.com': 1000.0}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        language_service._cache.clear()
+        http_client.start_run()
+
+        try:
+            with use_cassette(
+                cassette,
+                latency=latency,
+                throughput=throughput or None,
+                generator=None if cassette else sources,
+                strict=bool(cassette)
+            ) as adapter:
+                started = time.perf_counter()
+                stats = run_streaming_ingest(
+                    query=query,
+                    sources=['ansa', 'hackernews'],
+                    max_pages=pages + 1,
+                    batch_size=batch_size
+                )
+                elapsed = time.perf_counter() - started
+        finally:
+            settings.HTTP_RATE_LIMITS = original_limits
+            engine.dispose()
+
+    results.update({
+        'elapsed_s': round(elapsed, 3),
+        'articles_per_s': round(stats['scraped'] / elapsed, 1) if elapsed else None,
+        'first_save_s': stats['first_save_s'],
+        'scraped': stats['scraped'],
+        'saved': stats['saved'],
+        'errors': stats['errors'],
+        'http_requests': adapter.stats['served'] + adapter.stats['generated'],
+        'http_bytes': adapter.stats['bytes'],
+        'rate_limit_wait_s': round(http_client.limiter.waited_seconds, 3),
+    })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--query', default='technology')
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--throughput', type=float, default=5e6, help='byte/s, 0 = illimitato')
+    parser.add_argument('--cassette', default=None, help='cassetta registrata (default: sintetico)')
+    parser.add_argument('--respect-rate-limits', action='store_true')
+    parser.add_argument('--batch-size', type=int, default=None)
+    args = parser.parse_args()
+
+    print(json.dumps(run(
+        args.query, args.pages, args.latency, args.throughput,
+        args.cassette, args.respect_rate_limits, args.batch_size
+    ), indent=2))
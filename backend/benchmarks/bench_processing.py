@@ -0,0 +1,66 @@
+"""
+Benchmark stage parse/clean/dedup/enrich (ProcessingService)
+
+Confronta l'esecuzione seriale con il process pool su un backfill
+sintetico di record grezzi in formato scraper.
+
+    python -m benchmarks.bench_processing --n 50000 --workers 16
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.bench_language import generate_articles
+from models.record import ArticleRecord
+from services.language_service import language_service
+from services.processing_service import ProcessingService
+
+
+def generate_raw_records(n: int, duplicate_rate: float) -> list:
+    """Record come li produce uno scraper (HTML nel contenuto, metadata per fonte)"""
+    now = datetime.now()
+    sources = ('ansa', 'reddit', 'hackernews')
+    records = []
+    for i, article in enumerate(generate_articles(n, duplicate_rate)):
+        source = sources[i % len(sources)]
+        records.append(ArticleRecord(
+            source=source,
+            source_id=f"{source}_{i}",
+            title=article['title'],
+            content=f"<div class=\"text\"><p>{article['content']}</p></div>",
+            published_at=now - timedelta(minutes=i),
+            url=f"https://example.org/{source}/{i}",
+            raw_metadata={'points': i % 100},
+        ))
+    return records
+
+
+def run(n: int, workers: int, duplicate_rate: float) -> dict:
+    results = {'n': n, 'workers': workers, 'cpu_count': os.cpu_count()}
+
+    for label, n_workers in (('serial', 1), ('pool', workers)):
+        # Cache enrichment fredda per entrambi (i worker la ereditano col fork)
+        language_service._cache.clear()
+        # Record nuovi a ogni giro: il processing seriale li modifica in place
+        records = generate_raw_records(n, duplicate_rate)
+        started = time.perf_counter()
+        service_result = ProcessingService().process_records(records, workers=n_workers)
+        elapsed = time.perf_counter() - started
+        results[f'{label}_s'] = round(elapsed, 3)
+        results[f'{label}_articles_per_s'] = round(n / elapsed, 1)
+        results[f'{label}_errors'] = service_result['errors']
+
+    results['speedup'] = round(results['serial_s'] / results['pool_s'], 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=50000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.n, args.workers, args.duplicate_rate), indent=2))
@@ -0,0 +1,119 @@
+"""
+Benchmark del tipo in-flight degli articoli
+
+Confronta il percorso originale (DataFrame -> dict -> ArticleCreate ->
+model_dump -> ArticleCreate -> save_articles) con ArticleRecord
+normalizzati/arricchiti in place e salvati con save_records.
+Cache lingua calda in entrambi i casi: si misura solo il trasporto.
+
+    python -m benchmarks.bench_records --n 50000 --save-n 5000
+"""
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_processing import generate_raw_records
+from models import ArticleCreate
+from models.database import Base
+from scrapers.base_scraper import BaseScraper
+from services.parser_service import ParserService
+from services.language_service import language_service
+from services.storage_service import StorageService
+
+
+def legacy_prepare(records: list) -> List[ArticleCreate]:
+    """Percorso pre-record: DataFrame dello scraper, dict, doppia validazione Pydantic"""
+    df = BaseScraper.records_to_dataframe(records)
+    rows = [ParserService.normalize_fields(row, row['source']) for row in df.to_dict('records')]
+    language_service.enrich_articles(rows, workers=0)
+    articles = [ArticleCreate(**fields) for fields in rows]
+    return [ArticleCreate(**article.model_dump()) for article in articles]
+
+
+def records_prepare(records: list) -> list:
+    """Percorso attuale: stessi oggetti dallo scraper al salvataggio"""
+    for record in records:
+        ParserService.normalize_record(record)
+    return language_service.enrich_records(records, workers=0)
+
+
+def _measure(fn: Callable, n: int) -> dict:
+    """Tempo e picco di memoria in due giri separati (tracemalloc rallenta molto)"""
+    records = generate_raw_records(n, 0.1)
+    gc.collect()
+    started = time.perf_counter()
+    fn(records)
+    elapsed = time.perf_counter() - started
+
+    records = generate_raw_records(n, 0.1)
+    gc.collect()
+    tracemalloc.start()
+    fn(records)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'s': round(elapsed, 3), 'peak_mb': round(peak / 2**20, 1)}
+
+
+def _session_factory(path: str):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+
+def run(n: int, save_n: int) -> dict:
+    results = {'n': n, 'save_n': save_n}
+
+    # Cache enrichment calda per entrambi i percorsi
+    records_prepare(generate_raw_records(n, 0.1))
+
+    legacy = _measure(legacy_prepare, n)
+    current = _measure(records_prepare, n)
+    results['prepare'] = {
+        'legacy_s': legacy['s'],
+        'records_s': current['s'],
+        'speedup': round(legacy['s'] / max(current['s'], 1e-9), 2),
+        'legacy_peak_mb': legacy['peak_mb'],
+        'records_peak_mb': current['peak_mb'],
+        'legacy_us_per_article': round(legacy['s'] / n * 1e6, 2),
+        'records_us_per_article': round(current['s'] / n * 1e6, 2),
+    }
+
+    storage = StorageService()
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_session = _session_factory(os.path.join(tmp, 'legacy.db'))()
+        articles = legacy_prepare(generate_raw_records(save_n, 0.0))
+        started = time.perf_counter()
+        storage.save_articles(articles, db=legacy_session)
+        legacy_save_s = time.perf_counter() - started
+        legacy_session.close()
+
+        records_session = _session_factory(os.path.join(tmp, 'records.db'))()
+        records = records_prepare(generate_raw_records(save_n, 0.0))
+        started = time.perf_counter()
+        storage.save_records(records, db=records_session)
+        records_save_s = time.perf_counter() - started
+        records_session.close()
+
+    results['save'] = {
+        'save_articles_s': round(legacy_save_s, 3),
+        'save_records_s': round(records_save_s, 3),
+        'speedup': round(legacy_save_s / max(records_save_s, 1e-9), 2),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=50000)
+    parser.add_argument('--save-n', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.n, args.save_n), indent=2))
@@ -0,0 +1,94 @@
+"""
+Benchmark RedditScraper: ricerca unica su listing JSON vs ricerche PRAW
+
+Il percorso originale (ricerca combinata + una per ciascuna delle prime
+due keyword, oggetti Submission, un subreddit dopo l'altro) e quello
+attuale girano contro listing sintetici riprodotti a latenza fissa.
+
+    python -m benchmarks.bench_reddit --subreddits italy europe worldnews --pages 3
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from typing import List
+
+from benchmarks.synthetic import SyntheticSources
+from config import settings
+from scrapers.reddit_scraper import RedditScraper
+from scrapers.replay import ReplayAdapter, Cassette, mount_adapter
+
+
+def legacy_scrape(scraper: RedditScraper, query: str, max_pages: int, subreddits: List[str]) -> list:
+    """Percorso pre-listing: 3 ricerche PRAW per subreddit, submission una per una"""
+    keywords = query.split('+')
+    searches = [" ".join(keywords)] + (keywords[:2] if len(keywords) >= 2 else [])
+    rows = {}
+    for subreddit in subreddits:
+        for searched_keyword in searches:
+            results = scraper.reddit.subreddit(subreddit).search(
+                query=searched_keyword, sort="top", time_filter="week", limit=max_pages * 100
+            )
+            for submission in results:
+                if submission.ups < scraper.min_upvotes:
+                    continue
+                title = submission.title or ""
+                text = submission.selftext or ""
+                word_count = len(f"{title} {text}".split())
+                if word_count > scraper.max_words:
+                    continue
+                rows.setdefault(submission.id, {
+                    'title': title,
+                    'content': text,
+                    'published_at': datetime.fromtimestamp(submission.created_utc),
+                    'author': submission.author.name if submission.author else "deleted",
+                })
+    return list(rows.values())
+
+
+def run(query: str, subreddits: List[str], pages: int, latency: float) -> dict:
+    sources = SyntheticSources(pages=pages)
+    results = {'query': query, 'subreddits': subreddits, 'pages': pages, 'latency_s': latency}
+
+    original = settings.REDDIT_SUBREDDITS
+    settings.REDDIT_SUBREDDITS = subreddits
+    try:
+        for label in ('legacy', 'listing'):
+            scraper = RedditScraper()
+            search_calls = []
+
+            def generator(request):
+                if '/search' in request.url:
+                    search_calls.append(request.url)
+                return sources(request)
+
+            adapter = ReplayAdapter(Cassette(), latency=latency, generator=generator, strict=False)
+            with mount_adapter(scraper.sessions(), adapter):
+                started = time.perf_counter()
+                if label == 'legacy':
+                    records = legacy_scrape(scraper, query, pages, subreddits)
+                else:
+                    records = list(scraper.iter_records(query, max_pages=pages))
+                elapsed = time.perf_counter() - started
+
+            results[label] = {
+                'elapsed_s': round(elapsed, 3),
+                'search_requests': len(search_calls),
+                'records': len(records),
+            }
+    finally:
+        settings.REDDIT_SUBREDDITS = original
+
+    results['speedup'] = round(results['legacy']['elapsed_s'] / max(results['listing']['elapsed_s'], 1e-9), 2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--query', default='intelligenza artificiale+AI+tecnologia')
+    parser.add_argument('--subreddits', nargs='+', default=['italy', 'europe', 'technology'])
+    parser.add_argument('--pages', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.query, args.subreddits, args.pages, args.latency), indent=2))
@@ -0,0 +1,163 @@
+"""
+Benchmark della serializzazione delle risposte di lista
+
+Confronta, sullo stesso DB popolato dal corpus sintetico, le route
+attuali (colonne come tuple, dict costruiti una volta, orjson in una
+FastJSONResponse) con le versioni precedenti ricostruite qui: oggetti
+ORM, topic.__dict__ -> TopicWithSources, N+1 per articoli e fonti dei
+topic, validazione del response_model e json della stdlib.
+Si misura il tempo CPU per risposta (process_time) di richieste HTTP
+in-process; il costo fisso del trasporto (route vuota) viene sottratto.
+
+    python -m benchmarks.bench_serialization --articles 20k --repeat 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+from fastapi import APIRouter, Depends, FastAPI
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session
+
+from api import articles, topics
+from benchmarks.bench_suite import load_corpus, parse_scale
+from benchmarks.corpus import SyntheticCorpus
+from models import ArticleSchema, database
+from models.article import Article
+from models.database import get_db
+from models.topic import Topic, TopicWithSources
+from services.metrics_service import metrics_service
+from services.serialization import ORJSON_AVAILABLE
+from services.storage_service import storage_service
+
+# Route precedenti (stesso codice delle versioni sostituite)
+legacy = APIRouter(prefix="/legacy")
+
+
+@legacy.get("/articles", response_model=List[ArticleSchema])
+async def legacy_articles(limit: int = 50, db: Session = Depends(get_db)):
+    return storage_service.get_articles(db=db, limit=limit)
+
+
+@legacy.get("/topics", response_model=List[TopicWithSources])
+def legacy_topics(limit: int = 20, db: Session = Depends(get_db)):
+    results = []
+    for topic in db.query(Topic).order_by(Topic.pulse_score.desc()).limit(limit).all():
+        topic_articles = db.query(Article).filter(Article.topic_id == topic.topic_id).all()
+        sources = list(set(art.source for art in topic_articles if art.source))
+        results.append(TopicWithSources(**{**topic.__dict__, 'article_count': len(topic_articles), 'sources': sources}))
+    return results
+
+
+@legacy.get("/topics/{topic_id}/articles")
+def legacy_topic_articles(topic_id: str, limit: int = 50, db: Session = Depends(get_db)):
+    return db.query(Article).filter(Article.topic_id == topic_id).order_by(Article.published_at.desc()).limit(limit).all()
+
+
+@legacy.get("/ping")
+def ping():
+    return {}
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(articles.router, prefix="/api/articles")
+    app.include_router(topics.router)
+    app.include_router(legacy)
+    return app
+
+
+def _normalize(payload):
+    """Confronto indipendente dall'ordine delle fonti (set nel percorso precedente)"""
+    items = payload if isinstance(payload, list) else [payload]
+    for item in items:
+        if 'sources' in item:
+            item['sources'] = sorted(item['sources'])
+    return payload
+
+
+async def _measure(client: httpx.AsyncClient, path: str, repeat: int) -> Dict:
+    response = await client.get(path)  # Warm-up (cache statement, import lazy)
+    response.raise_for_status()
+    started = time.process_time()
+    for _ in range(repeat):
+        await client.get(path)
+    return {
+        'cpu_ms': (time.process_time() - started) / repeat * 1000,
+        'bytes': len(response.content),
+        'payload': response.json(),
+    }
+
+
+async def _compare(cases: Dict[str, tuple], repeat: int) -> Dict:
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        baseline = (await _measure(client, "/legacy/ping", repeat * 5))['cpu_ms']
+        results = {'transport_cpu_ms': round(baseline, 3)}
+        for name, (legacy_path, current_path) in cases.items():
+            before = await _measure(client, legacy_path, repeat)
+            after = await _measure(client, current_path, repeat)
+            before_ms = before['cpu_ms'] - baseline
+            after_ms = after['cpu_ms'] - baseline
+            # Articoli dei topic: il percorso precedente esponeva tutte le colonne ORM
+            same = [
+                {key: item[key] for key in new} for item, new in zip(_normalize(before.pop('payload')), after['payload'])
+            ] == _normalize(after.pop('payload'))
+            results[name] = {
+                'legacy_cpu_ms': round(before_ms, 3),
+                'current_cpu_ms': round(after_ms, 3),
+                'speedup': round(before_ms / max(after_ms, 1e-9), 2),
+                'legacy_bytes': before['bytes'],
+                'current_bytes': after['bytes'],
+                'same_content': same,
+            }
+        return results
+
+
+def run(articles_n: int, topics_n: int, page: int, repeat: int, seed: int) -> Dict:
+    results = {'articles': articles_n, 'topics': topics_n, 'page': page, 'orjson': ORJSON_AVAILABLE}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'serialization.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        try:
+            load_corpus(SyntheticCorpus(articles_n, topics=topics_n, seed=seed))
+            metrics_service.update_all_topics_metrics()
+            db = database.SessionLocal()
+            try:
+                largest = db.query(Article.topic_id).group_by(Article.topic_id).order_by(
+                    func.count(Article.id).desc()
+                ).first()[0]
+            finally:
+                db.close()
+
+            topic_limit = min(topics_n, 100)
+            cases = {
+                f'articles_{page}': (f"/legacy/articles?limit={page}", f"/api/articles/?limit={page}"),
+                f'topics_{topic_limit}': (f"/legacy/topics?limit={topic_limit}", f"/api/topics?limit={topic_limit}"),
+                'topic_articles_200': (
+                    f"/legacy/topics/{largest}/articles?limit=200", f"/api/topics/{largest}/articles?limit=200"
+                ),
+            }
+            results.update(asyncio.run(_compare(cases, repeat)))
+        finally:
+            database.bind_engines()
+            engine.dispose()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--articles', type=parse_scale, default=20000)
+    parser.add_argument('--topics', type=int, default=50)
+    parser.add_argument('--page', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.articles, args.topics, args.page, args.repeat, args.seed), indent=2))
@@ -0,0 +1,145 @@
+"""
+Benchmark letture/scritture concorrenti su SQLite
+
+Stesso DB (corpus sintetico) e stesso carico con due profili:
+- default: journal rollback, pragma predefiniti, writer che si contendono
+  il lock del file (busy handler di pysqlite, 5s)
+- tuned: profilo di models.sqlite (WAL, synchronous=NORMAL, mmap, cache,
+  coda di scrittura FIFO, lettori query_only su un pool proprio)
+Lettori: pagine di articoli filtrate per fonte e conteggio totale, come
+le route di lista. Writer: save_records di blocchi nuovi, come l'ingest.
+
+    python -m benchmarks.bench_sqlite --articles 20k --readers 8 --writers 4 --seconds 10
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from benchmarks.bench_suite import LOAD_CHUNK, _percentiles, parse_scale
+from benchmarks.corpus import SOURCES, SyntheticCorpus
+from models import database
+from models.sqlite import WriteQueue, tune_sqlite
+from services.serialization import ARTICLE_FIELDS
+from services.storage_service import storage_service
+
+PROFILES = ('default', 'tuned')
+WRITE_HEADROOM = 1_000_000  # Articoli del corpus riservati ai writer, oltre quelli caricati
+
+
+def _engines(path: str, profile: str, readers: int):
+    url = f"sqlite:///{path}"
+    write_engine = create_engine(url, connect_args={"check_same_thread": False})
+    read_engine = create_engine(
+        url, connect_args={"check_same_thread": False}, pool_size=readers, max_overflow=0
+    )
+    queue = None
+    if profile == 'tuned':
+        queue = WriteQueue()
+        tune_sqlite(write_engine, queue=queue)
+        tune_sqlite(read_engine, query_only=True)
+    return write_engine, read_engine, queue
+
+
+def _worker(stop: threading.Event, step, latencies: List[float], errors: List[str]):
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            step()
+        except OperationalError as exc:
+            errors.append(str(exc.orig).split(' (')[0])
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def run_profile(path: str, profile: str, corpus: SyntheticCorpus, loaded: int, readers: int, writers: int,
+                batch: int, seconds: float) -> Dict:
+    write_engine, read_engine, queue = _engines(path, profile, readers)
+    sources = itertools.cycle(SOURCES)
+    # Blocchi nuovi dopo quelli già caricati (next() su count è atomico col GIL)
+    blocks = itertools.count()
+
+    def read():
+        with Session(read_engine) as db:
+            db.execute(storage_service.article_rows_statement(ARTICLE_FIELDS, limit=50, source=next(sources))).all()
+            db.execute(storage_service.count_statement()).scalar()
+
+    def write():
+        start = loaded + next(blocks) * batch
+        with Session(write_engine) as db:
+            storage_service.save_records(corpus.records(start, start + batch, enriched=True), db=db)
+
+    reads, writes, errors = [], [], []
+    stop = threading.Event()
+    threads = [threading.Thread(target=_worker, args=(stop, read, reads, errors)) for _ in range(readers)]
+    threads += [threading.Thread(target=_worker, args=(stop, write, writes, errors)) for _ in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    with write_engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    write_engine.dispose()
+    read_engine.dispose()
+    result = {
+        'journal_mode': journal_mode,
+        'reads_per_s': round(len(reads) / elapsed, 1),
+        'writes_per_s': round(len(writes) / elapsed, 2),
+        'articles_written_per_s': round(len(writes) * batch / elapsed, 1),
+        'read_latency': _percentiles(reads) if reads else None,
+        'write_latency': _percentiles(writes) if writes else None,
+        'lock_errors': len(errors),
+        'error_kinds': sorted(set(errors)),
+    }
+    if queue is not None:
+        result['write_queue'] = queue.snapshot()
+    return result
+
+
+def run(articles_n: int, readers: int, writers: int, batch: int, seconds: float, seed: int) -> Dict:
+    results = {'articles': articles_n, 'readers': readers, 'writers': writers, 'batch': batch, 'seconds': seconds}
+    corpus = SyntheticCorpus(articles_n + WRITE_HEADROOM, seed=seed)
+    for profile in PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'concurrency.db')
+            loader = create_engine(f"sqlite:///{path}")
+            database.Base.metadata.create_all(bind=loader)
+            with Session(loader) as db:
+                for start in range(0, articles_n, LOAD_CHUNK):
+                    stop = min(start + LOAD_CHUNK, articles_n)
+                    storage_service.save_records(corpus.records(start, stop, enriched=True), db=db)
+            loader.dispose()
+            results[profile] = run_profile(path, profile, corpus, articles_n, readers, writers, batch, seconds)
+
+    before, after = results['default'], results['tuned']
+    results['speedup'] = {
+        'reads': round(after['reads_per_s'] / max(before['reads_per_s'], 1e-9), 2),
+        'writes': round(after['writes_per_s'] / max(before['writes_per_s'], 1e-9), 2),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--articles', type=parse_scale, default=20000)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=200, help='Articoli per transazione di scrittura')
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.articles, args.readers, args.writers, args.batch, args.seconds, args.seed), indent=2))
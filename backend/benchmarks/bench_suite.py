@@ -0,0 +1,314 @@
+"""
+Suite di benchmark end-to-end su corpus sintetico
+
+Per ogni scala (1k, 10k, 100k, 1m articoli) misura storage, dedup,
+enrichment, clustering, ricalcolo metriche e le API /api/topics e
+/api/articles?search= su un DB SQLite temporaneo. Il risultato è JSON
+(con commit e parametri) da confrontare tra un commit e l'altro.
+
+    python -m benchmarks.bench_suite --scales 1k,10k --out /tmp/bench.json
+    python -m benchmarks.bench_suite --compare /tmp/before.json /tmp/after.json
+
+Gli stage con costo superlineare hanno un tetto di articoli (CAPS,
+modificabile con --cap stage=N): sopra il tetto lo stage gira su un
+sottoinsieme e il risultato riporta n effettivo.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, update
+
+from benchmarks.corpus import SUBJECTS, SyntheticCorpus
+from models import database
+from models.article import Article
+from models.topic import Topic
+from services.language_service import language_service
+from services.metrics_service import metrics_service
+from services.parser_service import ParserService
+from services.storage_service import storage_service
+
+STAGES = (
+    'save_articles',
+    'save_records',
+    'deduplicate_articles',
+    'enrich_article',
+    'cluster_articles',
+    'update_all_topics_metrics',
+    'api_topics',
+    'api_articles_search',
+)
+
+# Articoli massimi per stage (None = tutta la scala)
+CAPS = {
+    'save_articles': 100_000,        # Una SELECT + refresh per articolo
+    'deduplicate_articles': 5_000,   # SequenceMatcher contro ogni titolo già visto
+    'enrich_article': 20_000,        # langdetect ~3ms per articolo nuovo
+    'cluster_articles': 20_000,      # Embedding su CPU
+}
+
+LOAD_CHUNK = 5_000
+
+
+def parse_scale(value: str) -> int:
+    value = value.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(value[-1], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(fn, n: int) -> Dict:
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    return {
+        'n': n,
+        'elapsed_s': round(elapsed, 4),
+        'per_item_us': round(elapsed / n * 1e6, 2) if n else None,
+    }
+
+
+def _percentiles(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    return {
+        'requests': len(ordered),
+        'p50_ms': pick(0.50),
+        'p95_ms': pick(0.95),
+        'max_ms': round(ordered[-1] * 1000, 2),
+    }
+
+
+def _reset_db(engine):
+    database.Base.metadata.drop_all(bind=engine)
+    database.Base.metadata.create_all(bind=engine)
+
+
+def load_corpus(corpus: SyntheticCorpus) -> Dict:
+    """Tutto il corpus con save_records a blocchi, poi topic e topic_id (setup degli stage di lettura)"""
+    started = time.perf_counter()
+    saved = 0
+    for start in range(0, corpus.n, LOAD_CHUNK):
+        saved += storage_service.save_records(corpus.records(start, start + LOAD_CHUNK, enriched=True))
+    elapsed = time.perf_counter() - started
+
+    db = database.SessionLocal()
+    try:
+        db.add_all([
+            Topic(topic_id=f"topic_{t}", label=corpus.topic_label(t), keywords=[], description='synthetic')
+            for t in range(corpus.topics)
+        ])
+        # DB nuovo: gli id seguono l'ordine di inserimento (id = indice + 1)
+        for start in range(0, corpus.n, LOAD_CHUNK):
+            db.execute(update(Article), [
+                {'id': index + 1, 'topic_id': f"topic_{article['topic']}"}
+                for index, article in enumerate(corpus.iter_articles(start, start + LOAD_CHUNK), start)
+            ])
+        db.commit()
+    finally:
+        db.close()
+
+    return {
+        'n': corpus.n,
+        'saved': saved,
+        'elapsed_s': round(elapsed, 4),
+        'per_item_us': round(elapsed / corpus.n * 1e6, 2) if corpus.n else None,
+        'setup_s': round(time.perf_counter() - started - elapsed, 4),
+    }
+
+
+def _cluster(corpus: SyntheticCorpus, n: int) -> Dict:
+    try:
+        from services.topic_service import topic_service
+    except ImportError as e:
+        return {'n': n, 'skipped': f"topic clustering unavailable: {e}"}
+
+    db = database.SessionLocal()
+    try:
+        articles = db.query(Article).order_by(Article.id).limit(n).all()
+        return _timed(lambda: topic_service.cluster_articles(articles), len(articles))
+    finally:
+        db.close()
+
+
+def _api_app() -> FastAPI:
+    """Solo i router misurati (main importa scheduler e modelli ML)"""
+    from api import articles, topics
+    app = FastAPI()
+    app.include_router(articles.router, prefix="/api/articles")
+    app.include_router(topics.router)
+    return app
+
+
+async def _api(paths: List[str], warmup: int = 2) -> Dict:
+    latencies = []
+    transport = httpx.ASGITransport(app=_api_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in paths[:warmup]:
+            (await client.get(path)).raise_for_status()
+        for path in paths:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+    return _percentiles(latencies)
+
+
+def run_scale(n: int, stages, caps: Dict, requests: int, duplicate_rate: float, topics: int, seed: int) -> Dict:
+    corpus = SyntheticCorpus(n, topics=topics, duplicate_rate=duplicate_rate, seed=seed)
+    results = {}
+
+    def capped(stage: str) -> int:
+        cap = caps.get(stage)
+        return min(n, cap) if cap else n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        database.bind_engines(engine)
+        try:
+            if 'save_articles' in stages:
+                _reset_db(engine)
+                creates = corpus.article_creates(0, capped('save_articles'))
+                results['save_articles'] = _timed(lambda: storage_service.save_articles(creates), len(creates))
+                del creates
+
+            _reset_db(engine)
+            load = load_corpus(corpus)
+            if 'save_records' in stages:
+                results['save_records'] = load
+
+            if 'deduplicate_articles' in stages:
+                creates = corpus.article_creates(0, capped('deduplicate_articles'))
+                results['deduplicate_articles'] = _timed(
+                    lambda: ParserService.deduplicate_articles(creates), len(creates)
+                )
+                del creates
+
+            if 'enrich_article' in stages:
+                dicts = [
+                    {'title': a['title'], 'content': a['content']}
+                    for a in corpus.iter_articles(0, capped('enrich_article'))
+                ]
+                language_service._cache.clear()  # Cache fredda: il primo ciclo di scraping
+                results['enrich_article'] = _timed(
+                    lambda: [language_service.enrich_article(d) for d in dicts], len(dicts)
+                )
+                del dicts
+
+            if 'cluster_articles' in stages:
+                results['cluster_articles'] = _cluster(corpus, capped('cluster_articles'))
+
+            if 'update_all_topics_metrics' in stages:
+                results['update_all_topics_metrics'] = _timed(
+                    metrics_service.update_all_topics_metrics, n
+                )
+                results['update_all_topics_metrics']['topics'] = corpus.topics
+
+            if 'api_topics' in stages:
+                paths = ["/api/topics?limit=20&sort_by=pulse_score"] * requests
+                results['api_topics'] = asyncio.run(_api(paths))
+
+            if 'api_articles_search' in stages:
+                words = [subject['en'].split()[-1] for subject in SUBJECTS]
+                paths = [f"/api/articles/?search={words[i % len(words)]}&limit=50" for i in range(requests)]
+                results['api_articles_search'] = asyncio.run(_api(paths))
+        finally:
+            engine.dispose()
+
+    return results
+
+
+def run(scales: List[int], stages, caps: Dict, requests: int, duplicate_rate: float, topics: int, seed: int) -> Dict:
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'duplicate_rate': duplicate_rate,
+            'topics': topics,
+            'seed': seed,
+            'requests': requests,
+            'caps': caps,
+        },
+        'scales': {},
+    }
+    for n in scales:
+        report['scales'][str(n)] = run_scale(n, stages, caps, requests, duplicate_rate, topics, seed)
+    return report
+
+
+def compare(before: Dict, after: Dict) -> Dict:
+    """Rapporto after/before per stage e scala (<1 = più veloce)"""
+    ratios = {}
+    for scale, stages in after['scales'].items():
+        for stage, result in stages.items():
+            old = before['scales'].get(scale, {}).get(stage)
+            if not old:
+                continue
+            key = 'p50_ms' if 'p50_ms' in result else 'elapsed_s'
+            if old.get(key) and result.get(key) is not None and old.get('n') == result.get('n'):
+                ratios.setdefault(scale, {})[stage] = round(result[key] / old[key], 3)
+    return {'before': before.get('commit'), 'after': after.get('commit'), 'ratio': ratios}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scales', default='1k,10k', help='es. 1k,10k,100k,1m')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--cap', action='append', default=[], help='stage=N (0 = nessun tetto)')
+    parser.add_argument('--requests', type=int, default=50, help='richieste per endpoint API')
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--topics', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default=None, help='salva il JSON anche su file')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), default=None)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as f_before, open(args.compare[1]) as f_after:
+            print(json.dumps(compare(json.load(f_before), json.load(f_after)), indent=2))
+        raise SystemExit(0)
+
+    caps = dict(CAPS)
+    for item in args.cap:
+        stage, value = item.split('=')
+        caps[stage] = int(value) or None
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    report = run(
+        [parse_scale(s) for s in args.scales.split(',')],
+        stages, caps, args.requests, args.duplicate_rate, args.topics, args.seed
+    )
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    print(output)
@@ -0,0 +1,194 @@
+"""
+Corpus sintetico di articoli per i benchmark
+
+Generatore deterministico, multilingua, con struttura a topic (ogni topic
+ha un soggetto e un luogo, tradotti nella lingua dell'articolo) e una
+quota configurabile di duplicati cross-source (stessa storia ripubblicata
+da un'altra fonte). L'articolo i dipende solo da (seed, i): qualsiasi
+intervallo si genera senza tenere il corpus in memoria.
+
+    python -m benchmarks.corpus --n 10000 --out /tmp/corpus.jsonl
+"""
+import argparse
+import hashlib
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from benchmarks.bench_language import SENTENCES
+from models.article import ArticleCreate
+from models.record import ArticleRecord
+
+LANGUAGES = ('it', 'en', 'de', 'fr')
+SOURCES = ('ansa', 'reddit', 'hackernews')
+COUNTRIES = {'it': 'IT', 'en': 'US', 'de': 'DE', 'fr': 'FR'}
+
+SUBJECTS = [
+    {'it': "auto elettriche", 'en': "electric cars", 'de': "Elektroautos", 'fr': "voitures électriques"},
+    {'it': "intelligenza artificiale", 'en': "artificial intelligence", 'de': "künstliche Intelligenz", 'fr': "intelligence artificielle"},
+    {'it': "legge di bilancio", 'en': "budget law", 'de': "Haushaltsgesetz", 'fr': "loi de finances"},
+    {'it': "energia solare", 'en': "solar energy", 'de': "Solarenergie", 'fr': "énergie solaire"},
+    {'it': "borsa", 'en': "stock market", 'de': "Börse", 'fr': "bourse"},
+    {'it': "sciopero dei treni", 'en': "rail strike", 'de': "Bahnstreik", 'fr': "grève des trains"},
+    {'it': "vaccino antinfluenzale", 'en': "flu vaccine", 'de': "Grippeimpfstoff", 'fr': "vaccin contre la grippe"},
+    {'it': "campionato di calcio", 'en': "football league", 'de': "Fußballliga", 'fr': "championnat de football"},
+    {'it': "startup tecnologiche", 'en': "tech startups", 'de': "Tech-Startups", 'fr': "start-up technologiques"},
+    {'it': "cambiamento climatico", 'en': "climate change", 'de': "Klimawandel", 'fr': "changement climatique"},
+    {'it': "prezzi delle case", 'en': "house prices", 'de': "Immobilienpreise", 'fr': "prix de l'immobilier"},
+    {'it': "sicurezza informatica", 'en': "cybersecurity", 'de': "Cybersicherheit", 'fr': "cybersécurité"},
+]
+PLACES = ["Milano", "Roma", "Berlin", "Paris", "London", "New York", "Tokyo", "Madrid", "Bruxelles", "Wien"]
+HEADLINES = {
+    'it': ["{subject}, novità da {place}", "{place}: si discute di {subject}", "Il caso {subject} a {place}"],
+    'en': ["{subject}: what happened in {place}", "{place} debates {subject}", "New report on {subject} in {place}"],
+    'de': ["{subject}: Neues aus {place}", "{place} diskutiert über {subject}", "Bericht zu {subject} in {place}"],
+    'fr': ["{subject} : les nouvelles de {place}", "{place} débat de {subject}", "Nouveau rapport sur {subject} à {place}"],
+}
+
+
+class SyntheticCorpus:
+    """
+    n: articoli nel corpus
+    topics: numero di topic (soggetto x luogo); ogni articolo appartiene a uno
+    duplicate_rate: quota di articoli che ripetono una storia precedente
+    topic_skew: >0 concentra gli articoli sui primi topic (distribuzione Zipf)
+    """
+
+    def __init__(
+        self,
+        n: int,
+        topics: int = 50,
+        duplicate_rate: float = 0.1,
+        topic_skew: float = 1.0,
+        days: int = 7,
+        now: Optional[datetime] = None,
+        seed: int = 42
+    ):
+        self.n = n
+        self.topics = max(1, min(topics, len(SUBJECTS) * len(PLACES)))
+        self.duplicate_rate = duplicate_rate
+        self.days = days
+        self.now = now or datetime(2025, 1, 1)
+        self.seed = seed
+        weights = [1.0 / (rank + 1) ** topic_skew for rank in range(self.topics)]
+        total = sum(weights)
+        self._cumulative = []
+        running = 0.0
+        for weight in weights:
+            running += weight / total
+            self._cumulative.append(running)
+
+    def _rng(self, *parts) -> random.Random:
+        digest = hashlib.blake2b(repr((self.seed,) + parts).encode('utf-8'), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest, 'big'))
+
+    def _topic_of(self, rng: random.Random) -> int:
+        point = rng.random()
+        low, high = 0, len(self._cumulative) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self._cumulative[middle] < point:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def topic_label(self, topic: int, language: str = 'en') -> str:
+        subject = SUBJECTS[topic % len(SUBJECTS)][language]
+        return f"{subject} - {PLACES[topic // len(SUBJECTS) % len(PLACES)]}"
+
+    def _story(self, index: int) -> Dict:
+        """Storia originale dell'articolo index (lingua, topic, testo)"""
+        rng = self._rng('story', index)
+        language = rng.choice(LANGUAGES)
+        topic = self._topic_of(rng)
+        subject = SUBJECTS[topic % len(SUBJECTS)][language]
+        place = PLACES[topic // len(SUBJECTS) % len(PLACES)]
+        title = rng.choice(HEADLINES[language]).format(subject=subject, place=place)
+        sentences = SENTENCES[language]
+        body = [rng.choice(sentences) for _ in range(rng.randint(3, 12))]
+        body.insert(rng.randrange(len(body) + 1), f"{subject.capitalize()} ({place}).")
+        return {
+            'language': language,
+            'topic': topic,
+            'title': f"{title[0].upper()}{title[1:]}",
+            'content': " ".join(body),
+        }
+
+    def _story_index(self, index: int) -> int:
+        """Storia pubblicata dall'articolo index (catene di duplicati risolte)"""
+        while index > 0:
+            rng = self._rng('duplicate', index)
+            if rng.random() >= self.duplicate_rate:
+                break
+            index = rng.randrange(index)
+        return index
+
+    def article(self, index: int) -> Dict:
+        """
+        Articolo index come dict (campi di ArticleCreate + topic)
+
+        I duplicati riprendono titolo e testo di una storia precedente con
+        un'altra fonte e un altro source_id (come le ripubblicazioni reali).
+        """
+        rng = self._rng('article', index)
+        story_index = self._story_index(index)
+        story = self._story(story_index)
+        source = SOURCES[index % len(SOURCES)]
+        published = self.now - timedelta(seconds=rng.randrange(self.days * 86400))
+        return {
+            'source': source,
+            'source_id': f"{source}_{self.seed}_{index}",
+            'title': story['title'],
+            'content': story['content'],
+            'url': f"https://example.org/{source}/{index}",
+            'published_at': published,
+            'language': story['language'],
+            'country': COUNTRIES[story['language']],
+            'raw_metadata': {'duplicate_of': story_index} if story_index != index else {},
+            'topic': story['topic'],
+        }
+
+    def iter_articles(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        for index in range(start, self.n if stop is None else min(stop, self.n)):
+            yield self.article(index)
+
+    def records(self, start: int = 0, stop: Optional[int] = None, enriched: bool = False) -> List[ArticleRecord]:
+        """ArticleRecord come li produce uno scraper (enriched: con lingua/paese già calcolati)"""
+        return [
+            ArticleRecord(
+                source=a['source'], source_id=a['source_id'], title=a['title'], content=a['content'],
+                url=a['url'], published_at=a['published_at'], raw_metadata=a['raw_metadata'],
+                language=a['language'] if enriched else None,
+                country=a['country'] if enriched else None
+            )
+            for a in self.iter_articles(start, stop)
+        ]
+
+    def article_creates(self, start: int = 0, stop: Optional[int] = None) -> List[ArticleCreate]:
+        return [
+            ArticleCreate(**{k: v for k, v in a.items() if k != 'topic'})
+            for a in self.iter_articles(start, stop)
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--n', type=int, default=1000)
+    parser.add_argument('--topics', type=int, default=50)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--out', default='-', help='file JSONL (- = stdout)')
+    args = parser.parse_args()
+
+    corpus = SyntheticCorpus(args.n, topics=args.topics, duplicate_rate=args.duplicate_rate, seed=args.seed)
+    out = open(args.out, 'w') if args.out != '-' else None
+    for article in corpus.iter_articles():
+        line = json.dumps(article, default=str, ensure_ascii=False)
+        if out:
+            out.write(line + '\n')
+        else:
+            print(line)
+    if out:
+        out.close()
@@ -0,0 +1,218 @@
+"""
+Sorgenti sintetiche per il replay degli scraper
+
+Pagine di ricerca ANSA (HTML), risposte Algolia HN e listing Reddit (JSON) generate
+dall'URL richiesto: stesso URL -> stessa pagina, qualsiasi numero di
+pagine. Da usare come `generator` di ReplayAdapter o per scrivere una
+cassetta riproducibile.
+
+    python -m benchmarks.synthetic --pages 50 --out /tmp/synthetic.jsonl.gz
+"""
+import argparse
+import hashlib
+import html
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.bench_language import SENTENCES
+from scrapers.replay import Cassette
+
+ANSA_PER_PAGE = 12
+HN_HITS_PER_PAGE = 20
+REDDIT_TOKEN = b'{"access_token": "synthetic", "token_type": "bearer", "expires_in": 86400, "scope": "*"}'
+
+ANSA_SECTIONS = ('Cronaca', 'Politica', 'Economia', 'Tecnologia', 'Mondo')
+
+
+class SyntheticSources:
+    """
+    Generatore deterministico di pagine ANSA/HN
+
+    pages: pagine con risultati per query (poi pagina vuota, come le API reali)
+    duplicate_rate: quota di articoli che ripetono una storia già vista
+    now: riferimento per le date (articoli negli ultimi `days` giorni)
+    """
+
+    def __init__(
+        self,
+        pages: int = 10,
+        duplicate_rate: float = 0.1,
+        days: int = 7,
+        now: Optional[datetime] = None,
+        seed: int = 42
+    ):
+        self.pages = pages
+        self.duplicate_rate = duplicate_rate
+        self.days = days
+        self.now = now or datetime.now()
+        self.seed = seed
+
+    def _rng(self, *parts) -> random.Random:
+        digest = hashlib.blake2b(repr((self.seed,) + parts).encode('utf-8'), digest_size=8).digest()
+        return random.Random(int.from_bytes(digest, 'big'))
+
+    def _story(self, rng: random.Random, language: str, index: int) -> Tuple[str, str]:
+        """(titolo, testo); una quota ripete una storia precedente (stesso testo)"""
+        if index > 0 and rng.random() < self.duplicate_rate:
+            rng = self._rng('story', language, rng.randrange(index))
+        sentences = SENTENCES[language]
+        title = rng.choice(sentences).rstrip('.')
+        body = " ".join(rng.choice(sentences) for _ in range(rng.randint(3, 12)))
+        return title, body
+
+    def _published(self, rng: random.Random) -> datetime:
+        return self.now - timedelta(seconds=rng.randrange(self.days * 86400))
+
+    def ansa_page(self, query: str, start: int) -> bytes:
+        """Pagina di ricerca ANSA con la stessa struttura letta da AnsaScraper"""
+        page = start // ANSA_PER_PAGE
+        items = []
+        if page < self.pages:
+            for i in range(ANSA_PER_PAGE):
+                index = start + i
+                rng = self._rng('ansa', query, index)
+                title, body = self._story(rng, 'it', index)
+                published = self._published(rng)
+                section = rng.choice(ANSA_SECTIONS)
+                items.append(
+                    '      <article class="news">\n'
+                    f'        <a href="/sito/notizie/{section.lower()}/{published:%Y/%m/%d}/{query}_{index}.html">'
+                    f'<h2 class="title">{html.escape(title)}</h2></a>\n'
+                    f'        <div class="text"><p>{html.escape(body)}</p></div>\n'
+                    f'        <p class="meta">{section}- {published:%d.%m.%Y, %H:%M}</p>\n'
+                    '      </article>'
+                )
+        document = (
+            '<!DOCTYPE html>\n<html lang="it">\n<head><meta charset="utf-8">'
+            f'<title>Ricerca: {html.escape(query)} - ANSA.it</title></head>\n<body>\n'
+            '  <main class="search-results">\n'
+            + "\n".join(items)
+            + '\n  </main>\n</body>\n</html>\n'
+        )
+        return document.encode('utf-8')
+
+    def hn_page(self, query: str, page: int) -> bytes:
+        """Risposta Algolia /api/v1/search con i campi usati da HackerNewsScraper"""
+        hits = []
+        if page < self.pages:
+            for i in range(HN_HITS_PER_PAGE):
+                index = page * HN_HITS_PER_PAGE + i
+                rng = self._rng('hn', query, index)
+                title, body = self._story(rng, 'en', index)
+                published = self._published(rng)
+                object_id = str(30_000_000 + int.from_bytes(
+                    hashlib.blake2b(f"{query}:{index}".encode('utf-8'), digest_size=3).digest(), 'big'
+                ))
+                hits.append({
+                    'title': title,
+                    'story_text': body if rng.random() < 0.4 else None,
+                    'created_at': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'objectID': object_id,
+                    'points': rng.randint(1, 800),
+                    'num_comments': rng.randint(0, 300),
+                    'author': f"user{rng.randint(1, 5000)}",
+                })
+        payload = {
+            'hits': hits,
+            'nbHits': self.pages * HN_HITS_PER_PAGE,
+            'page': page,
+            'nbPages': self.pages,
+            'hitsPerPage': HN_HITS_PER_PAGE,
+            'query': query,
+        }
+        return json.dumps(payload).encode('utf-8')
+
+    def reddit_listing(self, subreddit: str, query: str, after: str, limit: int) -> bytes:
+        """
+        Listing /r/{sub}/search (figli t3 con i campi letti da RedditScraper)
+
+        Risultati per subreddit indipendenti dalla query: query diverse
+        restituiscono gli stessi post (come keyword sovrapposte su Reddit).
+        """
+        limit = min(limit, 100)  # tetto imposto da Reddit
+        offset = int(after.split('_')[-1], 16) + 1 if after else 0
+        page = offset // max(limit, 1)
+        children = []
+        if page < self.pages:
+            for i in range(limit):
+                index = offset + i
+                rng = self._rng('reddit', subreddit, index)
+                language = 'it' if rng.random() < 0.6 else 'en'
+                title, body = self._story(rng, language, index)
+                ups = int(rng.paretovariate(1.2) * 8)
+                post_id = f"{subreddit[:2]}{index:x}"
+                children.append({'kind': 't3', 'data': {
+                    'id': post_id,
+                    'title': title,
+                    'selftext': body if rng.random() < 0.7 else "",
+                    'author': f"user{rng.randint(1, 5000)}",
+                    'created_utc': self._published(rng).timestamp(),
+                    'permalink': f"/r/{subreddit}/comments/{post_id}/",
+                    'score': ups,
+                    'ups': ups,
+                    'subreddit': subreddit,
+                }})
+        last = offset + len(children) - 1
+        next_after = f"t3_{last:x}" if children and page + 1 < self.pages else None
+        return json.dumps({'kind': 'Listing', 'data': {'after': next_after, 'children': children}}).encode('utf-8')
+
+    def __call__(self, request) -> Tuple[int, Dict[str, str], bytes]:
+        """Generator per ReplayAdapter: (status, headers, body) dall'URL della richiesta"""
+        parts = urlsplit(request.url)
+        path = parts.path.rstrip('/')
+        params = {k: v[0] for k, v in parse_qs(parts.query, keep_blank_values=True).items()}
+
+        if parts.hostname == 'www.ansa.it':
+            body = self.ansa_page(params.get('any', ''), int(params.get('start', 0)))
+            return 200, {'content-type': 'text/html; charset=utf-8'}, body
+        if parts.hostname == 'hn.algolia.com':
+            body = self.hn_page(params.get('query', ''), int(params.get('page', 0)))
+            return 200, {'content-type': 'application/json; charset=utf-8'}, body
+        if parts.hostname == 'www.reddit.com' and path.endswith('/access_token'):
+            return 200, {'content-type': 'application/json'}, REDDIT_TOKEN
+        if parts.hostname == 'oauth.reddit.com' and path.endswith('/search'):
+            subreddit = path.split('/')[2]
+            body = self.reddit_listing(
+                subreddit, params.get('q', ''), params.get('after', ''), int(params.get('limit', 25))
+            )
+            return 200, {'content-type': 'application/json; charset=UTF-8'}, body
+        return 404, {'content-type': 'text/plain'}, b'not found'
+
+    def to_cassette(self, query: str, period: str = '7') -> Cassette:
+        """
+        Cassetta con tutte le pagine (più la prima vuota) per una query
+
+        period: parametro `periodo` ANSA ('7' per il job schedulato, '' senza date)
+        """
+        cassette = Cassette()
+        for page in range(self.pages + 1):
+            start = page * ANSA_PER_PAGE
+            cassette.add(
+                'GET',
+                "https://www.ansa.it/ricerca/ansait/search.shtml"
+                f"?start={start}&tag=&any={query}&sezione=&sort=data%3Adesc&periodo={period}",
+                200, {'content-type': 'text/html; charset=utf-8'}, self.ansa_page(query, start)
+            )
+            cassette.add(
+                'GET',
+                f"https://hn.algolia.com/api/v1/search?query={query}&tags=story&page={page}",
+                200, {'content-type': 'application/json; charset=utf-8'}, self.hn_page(query, page)
+            )
+        return cassette
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--query', default='technology')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--duplicate-rate', type=float, default=0.1)
+    parser.add_argument('--period', default='7', help="periodo ANSA ('' se senza date)")
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args()
+
+    cassette = SyntheticSources(args.pages, args.duplicate_rate).to_cassette(args.query, args.period)
+    cassette.save(args.out)
+    print(json.dumps({'interactions': len(cassette), 'path': args.out}, indent=2))
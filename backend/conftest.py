@@ -0,0 +1,36 @@
+"""
+Fixture pytest condivise
+"""
+from contextlib import contextmanager
+
+import pytest
+
+from services.profiling import job_profiler
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--profile-dir",
+        default=None,
+        help="salva qui gli artifact dei profili dei test (default: tmp_path del test)"
+    )
+
+
+@pytest.fixture
+def profiler(request, tmp_path):
+    """
+    Stessi hook dei job schedulati dentro un test
+        
+        def test_refresh(profiler):
+            with profiler('refresh') as session:
+                ...
+            assert session.report['sql']['statements'] < 50
+    """
+    directory = request.config.getoption("--profile-dir") or str(tmp_path)
+    
+    @contextmanager
+    def profile(name: str = request.node.name):
+        with job_profiler.profile(name, force=True, directory=directory) as session:
+            yield session
+    
+    return profile
@@ -0,0 +1,195 @@
+"""
+Job Executors
+Thread pool per l'I/O bloccante, process pool per gli stage CPU-bound,
+limiti di concorrenza per job e watchdog del lag dell'event loop
+"""
+import asyncio
+import functools
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional, Tuple
+
+from config import settings
+from services.telemetry import EVENT_LOOP_LAG_SECONDS
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[ProcessPoolExecutor] = None
+_semaphores: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+_job_stats: Dict[str, Dict] = {}
+
+
+def io_executor() -> ThreadPoolExecutor:
+    """Thread per requests/SQLAlchemy sincroni (creato alla prima richiesta)"""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(
+            max_workers=settings.JOB_IO_WORKERS,
+            thread_name_prefix="job-io"
+        )
+    return _io_executor
+
+
+def cpu_executor() -> ProcessPoolExecutor:
+    """
+    Processi per embedding/clustering (creato alla prima richiesta)
+    
+    spawn invece di fork: il processo API ha già thread attivi (pool HTTP,
+    scheduler, coda di ingest) e un fork ne copierebbe i lock.
+    """
+    global _cpu_executor
+    if _cpu_executor is None:
+        _cpu_executor = ProcessPoolExecutor(
+            max_workers=settings.JOB_CPU_WORKERS or os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _cpu_executor
+
+
+def shutdown_executors():
+    global _io_executor, _cpu_executor
+    if _io_executor is not None:
+        _io_executor.shutdown(wait=False, cancel_futures=True)
+        _io_executor = None
+    if _cpu_executor is not None:
+        _cpu_executor.shutdown(wait=False, cancel_futures=True)
+        _cpu_executor = None
+
+
+def _semaphore(job: str) -> asyncio.Semaphore:
+    """Semaforo del job per il loop corrente (ricreato se il loop cambia, es. nei test)"""
+    loop = asyncio.get_running_loop()
+    entry = _semaphores.get(job)
+    if entry is None or entry[0] is not loop:
+        limit = settings.JOB_CONCURRENCY.get(job, settings.JOB_DEFAULT_CONCURRENCY)
+        entry = (loop, asyncio.Semaphore(limit))
+        _semaphores[job] = entry
+        _job_stats.setdefault(job, {
+            'running': 0, 'waiting': 0, 'completed': 0, 'failed': 0, 'wait_seconds': 0.0
+        })['limit'] = limit
+    return entry[1]
+
+
+@asynccontextmanager
+async def job_slot(job: str):
+    """Al massimo JOB_CONCURRENCY[job] esecuzioni contemporanee dello stesso job"""
+    semaphore = _semaphore(job)
+    stats = _job_stats[job]
+    stats['waiting'] += 1
+    started = time.monotonic()
+    try:
+        await semaphore.acquire()
+    finally:
+        stats['waiting'] -= 1
+    stats['wait_seconds'] += time.monotonic() - started
+    stats['running'] += 1
+    try:
+        yield
+        stats['completed'] += 1
+    except BaseException:
+        stats['failed'] += 1
+        raise
+    finally:
+        stats['running'] -= 1
+        semaphore.release()
+
+
+async def run_io(job: str, fn: Callable, *args, **kwargs):
+    """fn(*args, **kwargs) bloccante in un thread, dentro lo slot del job"""
+    async with job_slot(job):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(io_executor(), functools.partial(fn, *args, **kwargs))
+
+
+async def run_cpu(job: str, fn: Callable, *args, **kwargs):
+    """fn(*args, **kwargs) CPU-bound in un processo (fn e argomenti picklabili)"""
+    async with job_slot(job):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(cpu_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def job_stats() -> Dict[str, Dict]:
+    return {
+        job: dict(stats, wait_seconds=round(stats['wait_seconds'], 3))
+        for job, stats in _job_stats.items()
+    }
+
+
+class LoopLagMonitor:
+    """
+    Watchdog dell'event loop
+    
+    Dorme `interval` secondi e misura di quanto si sveglia in ritardo: il
+    ritardo è il tempo in cui il loop è rimasto bloccato da codice sincrono.
+    """
+    
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        warn_ms: Optional[float] = None,
+        window: int = 600
+    ):
+        self.interval = interval or settings.LOOP_LAG_INTERVAL_SECONDS
+        self.warn_ms = warn_ms if warn_ms is not None else settings.LOOP_LAG_WARN_MS
+        self.samples: deque = deque(maxlen=window)
+        self.stalls = 0
+        self.max_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def start(self):
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+    
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - started - self.interval) * 1000)
+    
+    def record(self, lag_ms: float):
+        self.samples.append(lag_ms)
+        EVENT_LOOP_LAG_SECONDS.observe(lag_ms / 1000)
+        self.max_ms = max(self.max_ms, lag_ms)
+        if lag_ms >= self.warn_ms:
+            self.stalls += 1
+            print(f"⚠️  Event loop blocked for {lag_ms:.0f}ms")
+    
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def snapshot(self) -> Dict:
+        return {
+            'running': self.running,
+            'samples': len(self.samples),
+            'last_ms': round(self.samples[-1], 1) if self.samples else None,
+            'p50_ms': round(self.percentile(0.50), 1),
+            'p99_ms': round(self.percentile(0.99), 1),
+            'max_ms': round(self.max_ms, 1),
+            'stalls': self.stalls,
+            'warn_ms': self.warn_ms,
+        }
+
+
+# Singleton
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,427 @@
+"""
+Leader Election
+Un solo processo del cluster esegue i job schedulati; lock per job
+contro run manuali sovrapposti tra worker/repliche
+"""
+import asyncio
+import functools
+import hashlib
+import os
+import socket
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text, update
+from sqlalchemy.exc import IntegrityError
+
+from config import settings
+from models.database import SessionLocal, engine, database_url
+from models.job_lease import JobLease
+
+try:
+    import fcntl
+except ImportError:  # Windows: niente flock, si usa il lease su DB
+    fcntl = None
+
+# Nome del lock che identifica il leader dello scheduler
+LEADER_LOCK = "scheduler"
+
+
+def _identity() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class FileLockBackend:
+    """
+    flock su un file per lock (SQLite: tutti i worker sono sulla stessa macchina)
+    
+    Il kernel rilascia il lock quando il processo muore: failover immediato.
+    """
+    
+    def __init__(self, directory: str, identity: str):
+        self.directory = directory
+        self.identity = identity
+        self._files: Dict[str, object] = {}
+        os.makedirs(directory, exist_ok=True)
+    
+    def try_acquire(self, name: str) -> bool:
+        if name in self._files:
+            return True
+        path = os.path.join(self.directory, f"pulse-{name.replace(':', '_')}.lock")
+        f = open(path, 'a+')
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(self.identity)
+        f.flush()
+        self._files[name] = f
+        return True
+    
+    def renew(self, name: str) -> bool:
+        return name in self._files
+    
+    def release(self, name: str):
+        f = self._files.pop(name, None)
+        if f is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            f.close()
+
+
+class AdvisoryLockBackend:
+    """
+    pg_try_advisory_lock su una connessione dedicata per lock (PostgreSQL)
+    
+    Il lock è di sessione: se il processo muore o la connessione cade,
+    PostgreSQL lo rilascia e un altro worker lo prende al giro successivo.
+    """
+    
+    def __init__(self, engine, identity: str):
+        self.engine = engine
+        self.identity = identity
+        self._connections: Dict[str, object] = {}
+        # Una Connection SQLAlchemy non è thread-safe: un'operazione per nome alla volta
+        self._locks: Dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+    
+    @staticmethod
+    def lock_key(name: str) -> int:
+        """bigint stabile per nome (stesso valore su tutte le repliche)"""
+        digest = hashlib.blake2b(f"pulse:{name}".encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+    
+    def _lock_for(self, name: str) -> threading.Lock:
+        """Un lock per nome: renew dal thread di poll, acquire/release dai worker di to_thread"""
+        with self._guard:
+            return self._locks.setdefault(name, threading.Lock())
+    
+    def try_acquire(self, name: str) -> bool:
+        with self._lock_for(name):
+            if name in self._connections:
+                return True
+            connection = self.engine.connect()
+            try:
+                acquired = connection.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {'key': self.lock_key(name)}
+                ).scalar()
+                connection.commit()
+            except Exception:
+                connection.close()
+                raise
+            if not acquired:
+                connection.close()
+                return False
+            self._connections[name] = connection
+            return True
+    
+    def renew(self, name: str) -> bool:
+        with self._lock_for(name):
+            connection = self._connections.get(name)
+            if connection is None:
+                return False
+            try:
+                connection.execute(text("SELECT 1"))
+                connection.commit()
+                return True
+            except Exception:
+                # Connessione persa: il lock è già stato rilasciato dal server
+                self._connections.pop(name, None)
+                try:
+                    connection.invalidate()
+                except Exception:
+                    pass
+                return False
+    
+    def release(self, name: str):
+        with self._lock_for(name):
+            connection = self._connections.pop(name, None)
+            if connection is None:
+                return
+            try:
+                connection.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self.lock_key(name)})
+                connection.commit()
+            finally:
+                connection.close()
+
+
+class LeaseBackend:
+    """
+    Riga con scadenza nella tabella job_leases (qualsiasi database)
+    
+    Il lease va rinnovato prima di lease_seconds; se il processo muore la
+    riga scade e un altro worker la rileva. Gli orologi delle repliche
+    devono essere sincronizzati entro un margine ben inferiore al TTL.
+    """
+    
+    def __init__(self, session_factory, identity: str, lease_seconds: float):
+        self.session_factory = session_factory
+        self.identity = identity
+        self.lease_seconds = lease_seconds
+    
+    def try_acquire(self, name: str) -> bool:
+        now = datetime.utcnow()
+        expires = now + timedelta(seconds=self.lease_seconds)
+        db = self.session_factory()
+        try:
+            # Lease scaduto o già nostro: lo prendiamo/rinnoviamo in una sola UPDATE
+            taken = db.execute(
+                update(JobLease)
+                .where(JobLease.name == name)
+                .where((JobLease.expires_at < now) | (JobLease.holder == self.identity))
+                .values(holder=self.identity, acquired_at=now, expires_at=expires)
+            ).rowcount
+            if taken:
+                db.commit()
+                return True
+            db.add(JobLease(name=name, holder=self.identity, acquired_at=now, expires_at=expires))
+            db.commit()
+            return True
+        except IntegrityError:
+            # Riga esistente e valida di un altro processo
+            db.rollback()
+            return False
+        finally:
+            db.close()
+    
+    def renew(self, name: str) -> bool:
+        db = self.session_factory()
+        try:
+            renewed = db.execute(
+                update(JobLease)
+                .where(JobLease.name == name, JobLease.holder == self.identity)
+                .values(expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+            ).rowcount
+            db.commit()
+            return renewed == 1
+        finally:
+            db.close()
+    
+    def release(self, name: str):
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(JobLease)
+                .where(JobLease.name == name, JobLease.holder == self.identity)
+                .values(expires_at=datetime.utcnow())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+class LocalBackend:
+    """Nessun coordinamento (processo singolo): lock solo tra thread dello stesso processo"""
+    
+    def __init__(self):
+        self._held = set()
+        self._lock = threading.Lock()
+    
+    def try_acquire(self, name: str) -> bool:
+        with self._lock:
+            if name in self._held:
+                return False
+            self._held.add(name)
+            return True
+    
+    def renew(self, name: str) -> bool:
+        return name in self._held
+    
+    def release(self, name: str):
+        with self._lock:
+            self._held.discard(name)
+
+
+def create_backend(kind: Optional[str] = None, identity: Optional[str] = None):
+    """
+    Backend dal setting LEADER_ELECTION_BACKEND
+    auto = advisory lock su PostgreSQL, lock file su SQLite, lease altrove
+    """
+    kind = kind or settings.LEADER_ELECTION_BACKEND
+    identity = identity or _identity()
+    if kind == "auto":
+        if database_url.startswith("postgresql"):
+            kind = "advisory"
+        elif database_url.startswith("sqlite") and fcntl is not None:
+            kind = "file"
+        else:
+            kind = "lease"
+    
+    if kind == "advisory":
+        return AdvisoryLockBackend(engine, identity)
+    if kind == "file":
+        return FileLockBackend(settings.LEADER_LOCK_DIR or settings.DATA_DIR, identity)
+    if kind == "lease":
+        return LeaseBackend(SessionLocal, identity, settings.LEADER_LEASE_SECONDS)
+    if kind == "none":
+        return LocalBackend()
+    raise ValueError(f"unknown leader election backend '{kind}'")
+
+
+class LeaderElector:
+    """
+    Leader dello scheduler più lock per singolo job
+    
+    Ogni renew_seconds il leader rinnova i suoi lock; gli altri processi
+    provano a prendere quello del leader, quindi il failover avviene entro
+    un giro (file/advisory) o entro la scadenza del lease (lease).
+    """
+    
+    def __init__(self, backend=None, renew_seconds: Optional[float] = None):
+        self._backend = backend
+        self.renew_seconds = renew_seconds or settings.LEADER_RENEW_SECONDS
+        self.is_leader = False
+        self.elected_at: Optional[datetime] = None
+        self.stats = {'elections': 0, 'lost': 0, 'errors': 0, 'job_locks_denied': 0}
+        self._job_locks = set()
+        self._listeners: Dict[str, List[Callable[[], None]]] = {'elected': [], 'lost': []}
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = create_backend()
+        return self._backend
+    
+    @property
+    def identity(self) -> str:
+        return getattr(self.backend, 'identity', f"local:{os.getpid()}")
+    
+    def on_elected(self, listener: Callable[[], None]):
+        self._listeners['elected'].append(listener)
+    
+    def on_lost(self, listener: Callable[[], None]):
+        self._listeners['lost'].append(listener)
+    
+    def _notify(self, event: str):
+        for listener in self._listeners[event]:
+            try:
+                listener()
+            except Exception as e:
+                print(f"⚠️  Leader listener error: {e}")
+    
+    def _poll(self) -> bool:
+        """Rinnovo dei lock tenuti + elezione (bloccante: chiamato in un thread)"""
+        try:
+            for name in list(self._job_locks):
+                if not self.backend.renew(name):
+                    self._job_locks.discard(name)
+                    print(f"⚠️  Job lock '{name}' lost")
+            
+            if self.is_leader:
+                return self.backend.renew(LEADER_LOCK)
+            return self.backend.try_acquire(LEADER_LOCK)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"⚠️  Leader election error: {e}")
+            return False
+    
+    def _apply(self, held: bool) -> bool:
+        """Transizioni di stato e listener (sul thread dell'event loop)"""
+        if held and not self.is_leader:
+            self.is_leader = True
+            self.elected_at = datetime.utcnow()
+            self.stats['elections'] += 1
+            print(f"👑 Elected scheduler leader ({self.identity})")
+            self._notify('elected')
+        elif not held and self.is_leader:
+            self.is_leader = False
+            self.elected_at = None
+            self.stats['lost'] += 1
+            print(f"⚠️  Scheduler leadership lost ({self.identity})")
+            self._notify('lost')
+        return self.is_leader
+    
+    async def check(self) -> bool:
+        """Un giro di elezione/rinnovo"""
+        return self._apply(await asyncio.to_thread(self._poll))
+    
+    async def start(self):
+        """Primo giro subito (il leader parte con lo scheduler), poi ogni renew_seconds"""
+        await self.check()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+    
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.renew_seconds)
+            await self.check()
+    
+    async def stop(self):
+        """Rilascia leadership e lock: un'altra replica subentra senza aspettare la scadenza"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self._release_all)
+        self._apply(False)
+    
+    def _release_all(self):
+        for name in list(self._job_locks) + ([LEADER_LOCK] if self.is_leader else []):
+            try:
+                self.backend.release(name)
+            except Exception as e:
+                print(f"⚠️  Lock release error ({name}): {e}")
+        self._job_locks.clear()
+    
+    def acquire_job_lock(self, job: str) -> bool:
+        """Lock non bloccante per un job (bloccante sul DB: da chiamare in un thread)"""
+        name = f"job:{job}"
+        if name in self._job_locks:
+            return False  # Già in esecuzione in questo processo
+        if not self.backend.try_acquire(name):
+            self.stats['job_locks_denied'] += 1
+            return False
+        self._job_locks.add(name)
+        return True
+    
+    def release_job_lock(self, job: str):
+        name = f"job:{job}"
+        if name in self._job_locks:
+            self._job_locks.discard(name)
+            self.backend.release(name)
+    
+    @asynccontextmanager
+    async def job_lock(self, job: str):
+        """
+        async with leader_elector.job_lock('scrape') as acquired:
+            if not acquired: return  # in esecuzione su un altro worker
+        """
+        acquired = await asyncio.to_thread(self.acquire_job_lock, job)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await asyncio.to_thread(self.release_job_lock, job)
+    
+    def snapshot(self) -> Dict:
+        return {
+            'backend': type(self.backend).__name__,
+            'identity': self.identity,
+            'is_leader': self.is_leader,
+            'elected_at': self.elected_at.isoformat() if self.elected_at else None,
+            'job_locks': sorted(self._job_locks),
+            **self.stats,
+        }
+
+
+def leader_only(job: Callable) -> Callable:
+    """Job schedulato eseguito solo dal leader (gli altri worker lo saltano)"""
+    @functools.wraps(job)
+    async def wrapper(*args, **kwargs):
+        if not leader_elector.is_leader:
+            return None
+        return await job(*args, **kwargs)
+    return wrapper
+
+
+# Singleton (backend creato al primo utilizzo)
+leader_elector = LeaderElector()
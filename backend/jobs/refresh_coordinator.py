@@ -0,0 +1,193 @@
+"""
+Refresh Coordinator
+Debounce e coalescing delle richieste di refresh topic/metrics
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import settings
+from services.telemetry import PIPELINE_ERRORS, TOPIC_REFRESH_SECONDS
+
+
+class RefreshSkipped(Exception):
+    """Sollevata dal refresh per saltare il run (es. lock tenuto da un altro worker)"""
+
+
+class RefreshCoordinator:
+    """
+    Un solo refresh alla volta, avviato dopo una finestra di debounce
+    
+    Le richieste (ingest, job periodico, trigger manuale) arrivate nella
+    finestra diventano un solo run; il timer riparte a ogni richiesta ma
+    il run non slitta oltre max_delay_seconds dalla prima. Senza force il
+    run viene saltato se dall'ultimo refresh completato sono arrivati meno
+    di min_new_articles articoli.
+    
+    refresh(should_stop) gira in un thread e deve controllare should_stop()
+    prima di scrivere: una richiesta più nuova (force, o con abbastanza
+    articoli nuovi) cancella il run in corso, al massimo una volta di fila.
+    
+    request() va chiamato dal thread dell'event loop.
+    """
+    
+    def __init__(
+        self,
+        refresh: Callable[[Callable[[], bool]], Optional[Dict]],
+        count_new_articles: Callable[[Optional[datetime]], int],
+        debounce_seconds: Optional[float] = None,
+        max_delay_seconds: Optional[float] = None,
+        min_new_articles: Optional[int] = None,
+        history_size: Optional[int] = None,
+        run: Callable[..., Awaitable] = asyncio.to_thread
+    ):
+        self.refresh = refresh
+        self.count_new_articles = count_new_articles
+        self.run = run  # run(fn, *args): esecuzione fuori dall'event loop
+        self.debounce_seconds = debounce_seconds if debounce_seconds is not None else settings.REFRESH_DEBOUNCE_SECONDS
+        self.max_delay_seconds = max_delay_seconds if max_delay_seconds is not None else settings.REFRESH_MAX_DELAY_SECONDS
+        self.min_new_articles = min_new_articles if min_new_articles is not None else settings.REFRESH_MIN_NEW_ARTICLES
+        
+        self.last_refresh_at: Optional[datetime] = None  # Inizio dell'ultimo run completato
+        self.history: deque = deque(maxlen=history_size or settings.REFRESH_HISTORY_SIZE)
+        self._pending: Optional[Dict] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+        self._current: Optional[Dict] = None
+        self._cancel: Optional[threading.Event] = None
+    
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+    
+    def request(self, reason: str, new_articles: int = 0, force: bool = False):
+        """
+        Richiede un refresh
+        
+        reason: motivo registrato nello storico ('ingest', 'interval', 'manual', ...)
+        new_articles: articoli nuovi noti al chiamante (solo informativo)
+        force: ignora la soglia di articoli nuovi e sostituisce un run in corso
+        """
+        now = time.monotonic()
+        if self._pending is None:
+            self._pending = {'reasons': [], 'new_articles': 0, 'force': False, 'first_at': now}
+        pending = self._pending
+        if reason not in pending['reasons']:
+            pending['reasons'].append(reason)
+        pending['new_articles'] += new_articles
+        pending['force'] = pending['force'] or force
+        
+        if self.running and self._supersedes(pending):
+            print(f"🧠 Topic refresh superseded ({reason}), cancelling current run")
+            self._cancel.set()
+        
+        self._arm(now)
+    
+    def _supersedes(self, pending: Dict) -> bool:
+        if self._cancel.is_set():
+            return False
+        # Mai due cancellazioni di fila: un flusso continuo non deve bloccare ogni run
+        if self.history and self.history[-1]['status'] == 'cancelled':
+            return False
+        return pending['force'] or pending['new_articles'] >= self.min_new_articles
+    
+    def _arm(self, now: float):
+        """(Ri)avvia il timer di debounce, entro max_delay dalla prima richiesta"""
+        if self._timer is not None:
+            self._timer.cancel()
+        deadline = self._pending['first_at'] + self.max_delay_seconds
+        delay = max(0.0, min(self.debounce_seconds, deadline - now))
+        self._timer = asyncio.get_running_loop().call_later(delay, self._fire)
+    
+    def _fire(self):
+        self._timer = None
+        if self.running or self._pending is None:
+            return  # Ripartirà a fine run
+        pending, self._pending = self._pending, None
+        self._cancel = threading.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(pending, self._cancel))
+    
+    async def _run(self, pending: Dict, cancel: threading.Event):
+        started = datetime.utcnow()  # Confrontato con Article.scraped_at (UTC)
+        entry = {
+            'reasons': pending['reasons'],
+            'force': pending['force'],
+            'requested_new_articles': pending['new_articles'],
+            'waited_s': round(time.monotonic() - pending['first_at'], 3),
+            'started': started.isoformat(),
+            'new_articles': None,
+            'status': None,
+            'duration_s': None,
+            'result': None,
+        }
+        self._current = entry
+        
+        try:
+            entry['new_articles'] = await self.run(self.count_new_articles, self.last_refresh_at)
+            if not pending['force'] and entry['new_articles'] < self.min_new_articles:
+                entry['status'] = 'skipped'
+                print(
+                    f"🧠 Topic refresh skipped: {entry['new_articles']} new articles "
+                    f"(< {self.min_new_articles}), reasons: {', '.join(entry['reasons'])}"
+                )
+                return
+            
+            entry['result'] = await self.run(self.refresh, cancel.is_set)
+            if cancel.is_set():
+                entry['status'] = 'cancelled'
+            else:
+                entry['status'] = 'completed'
+                self.last_refresh_at = started
+        except RefreshSkipped as e:
+            entry['status'] = 'skipped'
+            entry['result'] = {'reason': str(e)}
+            print(f"🧠 Topic refresh skipped: {e}")
+        except Exception as e:
+            # Eccezione sollevata dal refresh dopo should_stop() -> run cancellato
+            entry['status'] = 'cancelled' if cancel.is_set() else 'failed'
+            entry['result'] = {'error': str(e)}
+            if not cancel.is_set():
+                PIPELINE_ERRORS.labels('refresh').inc()
+                print(f"\n❌ Topic refresh failed: {e}")
+        finally:
+            duration = (datetime.utcnow() - started).total_seconds()
+            entry['duration_s'] = round(duration, 3)
+            TOPIC_REFRESH_SECONDS.labels(entry['status'] or 'cancelled').observe(duration)
+            self.history.append(entry)
+            self._current = None
+            self._task = None
+            if self._pending is not None:
+                self._arm(time.monotonic())
+    
+    def shutdown(self):
+        """Annulla il timer e chiede lo stop del run in corso"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = None
+        if self._cancel is not None:
+            self._cancel.set()
+    
+    def snapshot(self) -> Dict:
+        pending = self._pending
+        return {
+            'running': self._current,
+            'pending': {
+                'reasons': list(pending['reasons']),
+                'new_articles': pending['new_articles'],
+                'force': pending['force'],
+                'waiting_s': round(time.monotonic() - pending['first_at'], 3),
+            } if pending else None,
+            'last_refresh': self.last_refresh_at.isoformat() if self.last_refresh_at else None,
+            'history': list(self.history)[-10:],
+            'counts': self._status_counts(),
+        }
+    
+    def _status_counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.history:
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return counts
@@ -3,6 +3,7 @@ APScheduler Setup - Automatic Jobs for Pulse
 Handles periodic scraping, topic clustering, and maintenance
 """
 import asyncio
+import functools
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -11,10 +12,17 @@ from models.database import SessionLocal
 from models.article import Article
 from models.topic import Topic
 from scrapers.registry import ScraperRegistry
-from services.storage_service import StorageService
-from services.topic_service import topic_service
+from scrapers.http_client import http_client
+from jobs.refresh_coordinator import RefreshCoordinator, RefreshSkipped
+from jobs.leader import leader_elector, leader_only
+from jobs.executors import cpu_executor, job_stats, loop_monitor, run_io, shutdown_executors
+from services.ingest_queue import ingest_queue
+from services.topic_service import topic_service, ClusteringCancelled
 from services.metrics_service import metrics_service
-from models import ArticleCreate
+from services.telemetry import PIPELINE_ERRORS
+from services.profiling import job_profiler
+from services.event_bus import event_bus
+from services.response_cache import invalidate_responses
 
 # Global scheduler instance
 scheduler = None
@@ -29,12 +37,72 @@ scraping_stats = {
     'last_error': None
 }
 
+# Un solo run di scraping alla volta (job schedulato o trigger manuale)
+_scraping_lock = asyncio.Lock()
+_scraping_task = None
+
+
+def _produce_records(scraper, start_date: datetime, end_date: datetime, profile) -> int:
+    """Download di una fonte (in un thread): ogni pagina va in coda appena pronta"""
+    produced = 0
+    with profile.thread():
+        for page in scraper.iter_pages(
+            query='technology',  # TODO: make configurable
+            max_pages=3,
+            start_date=start_date,
+            end_date=end_date
+        ):
+            # Blocca il thread se la coda è piena (backpressure sullo scraper)
+            ingest_queue.put_threadsafe(scraper.source_name, page)
+            produced += len(page)
+    return produced
+
+
+def _on_ingest_flush(info: dict):
+    """Articoli nuovi salvati dalla coda di ingest -> richiesta di refresh (con debounce)"""
+    if info['saved'] > 0:
+        refresh_coordinator.request('ingest', new_articles=info['saved'])
+
+
+def trigger_scraping() -> bool:
+    """
+    Avvia scrape_all_sources in background
+    False se un run è già in corso o la coda di ingest è piena
+    """
+    global _scraping_task
+    
+    if _scraping_task is not None and not _scraping_task.done():
+        return False
+    if _scraping_lock.locked() or ingest_queue.is_saturated():
+        return False
+    _scraping_task = asyncio.create_task(scrape_all_sources())
+    return True
+
 
 async def scrape_all_sources():
     """
     Scrape articles from all available sources
     Runs every 2 hours by default
+    
+    Le pagine vanno nella coda di ingest mentre gli scraper scaricano; il
+    salvataggio e il refresh dei topic non rallentano il run successivo.
     """
+    if _scraping_lock.locked():
+        print("⚠️  Scraping already running, skipped")
+        return
+    
+    async with _scraping_lock:
+        # Lock di cluster: un trigger manuale su un altro worker non si sovrappone
+        async with leader_elector.job_lock('scrape') as acquired:
+            if not acquired:
+                print("⚠️  Scraping running on another worker, skipped")
+                return
+            # Run campionato: profilo dei thread di download (il salvataggio è nella coda di ingest)
+            with job_profiler.session('scrape') as profile:
+                await _run_scraping(profile)
+
+
+async def _run_scraping(profile):
     global last_scraping_time, scraping_stats
     
     print("\n" + "="*70)
@@ -43,61 +111,67 @@ async def scrape_all_sources():
     
     try:
         registry = ScraperRegistry()
-        storage = StorageService()
         total_articles = 0
         
-        # Scrape from each source
-        sources = ['ansa', 'reddit', 'hackernews']
+        http_client.start_run()
+        ingest_queue.start()
         
+        # Scrape articles (query can be configured)
+        start_date = datetime.now() - timedelta(days=7)
+        end_date = datetime.now()
+        
+        sources = ['ansa', 'reddit', 'hackernews']
+        scrapers = {}
         for source in sources:
-            try:
-                print(f"\n📰 Scraping {source.upper()}...")
-                scraper = registry.get_scraper(source)
-                
-                if not scraper:
-                    print(f"⚠️  Scraper {source} not available")
-                    continue
-                
-                # Scrape articles (query can be configured)
-                start_date = datetime.now() - timedelta(days=7)
-                end_date = datetime.now()
-                
-                df = scraper.scrape(
-                    query='technology',  # TODO: make configurable
-                    max_pages=3,
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if df.empty:
-                    print(f"  No articles from {source}")
-                    continue
-                
-                # Convert to ArticleCreate objects
-                articles = [ArticleCreate(**row.to_dict()) for _, row in df.iterrows()]
-                
-                # Save to database
-                saved = storage.save_articles(articles)
-                total_articles += len(saved)
-                
-                print(f"  ✅ {len(saved)} new articles from {source}")
-                
-            except Exception as e:
-                print(f"  ❌ Error scraping {source}: {e}")
-                scraping_stats['last_error'] = str(e)
+            scraper = registry.get_scraper(source)
+            if not scraper:
+                print(f"⚠️  Scraper {source} not available")
+                continue
+            if not http_client.is_available(scraper.source_name):
+                print(f"⚠️  Skipping {source}: circuit breaker open")
+                continue
+            scrapers[source] = scraper
+        
+        # Download in parallelo su thread (al massimo JOB_CONCURRENCY['scrape']):
+        # il rate limit è per host, una fonte lenta non blocca le altre né l'event loop
+        produced = await asyncio.gather(
+            *(
+                run_io('scrape', _produce_records, scraper, start_date, end_date, profile)
+                for scraper in scrapers.values()
+            ),
+            return_exceptions=True
+        )
+        
+        for source, count in zip(scrapers, produced):
+            if isinstance(count, Exception):
+                PIPELINE_ERRORS.labels('fetch').inc()
+                print(f"  ❌ Error scraping {source}: {count}")
+                scraping_stats['last_error'] = str(count)
+                continue
+            print(f"  📰 {count} articles from {source} queued for ingest")
+            total_articles += count
         
         # Update tracking
         last_scraping_time = datetime.now()
         scraping_stats['total_runs'] += 1
         scraping_stats['last_articles_count'] = total_articles
+        scraping_stats['http'] = dict(http_client.stats)
+        scraping_stats['host_rates'] = http_client.limiter.snapshot()
+        scraping_stats['circuit_breakers'] = http_client.breaker.snapshot()
         
-        print(f"\n✅ Scraping complete: {total_articles} new articles")
+        queue_stats = ingest_queue.snapshot()
+        print(f"\n✅ Scraping complete: {total_articles} articles queued")
+        print(
+            f"📥 Ingest queue: {queue_stats['depth']}/{queue_stats['capacity']} batches, "
+            f"{queue_stats['pending_records']} records pending, {queue_stats['saved']} saved so far"
+        )
+        print(
+            f"🌐 HTTP totals: {http_client.stats['downloads']} downloads, "
+            f"{http_client.stats['not_modified']} not modified, "
+            f"{http_client.stats['cache_hits']} cache hits"
+        )
         print("="*70 + "\n")
-        
-        # Trigger topic refresh if we got new articles
-        if total_articles > 0:
-            await refresh_topics_and_metrics()
-        
+    
     except Exception as e:
         print(f"\n❌ Scraping job failed: {e}")
         scraping_stats['last_error'] = str(e)
@@ -105,35 +179,68 @@ async def scrape_all_sources():
 
 async def refresh_topics_and_metrics():
     """
-    Recalculate topics and metrics
-    Called automatically after scraping or can be triggered manually
+    Periodic topic refresh request (every 6 hours)
+    Skipped by the coordinator if too few articles arrived since the last refresh
     """
+    refresh_coordinator.request('interval')
+
+
+def _count_new_articles(since) -> int:
+    """Articoli salvati dopo l'inizio dell'ultimo refresh completato (tutti se mai eseguito)"""
+    db = SessionLocal()
+    try:
+        query = db.query(Article)
+        if since is not None:
+            query = query.filter(Article.scraped_at >= since)
+        return query.count()
+    finally:
+        db.close()
+
+
+def _refresh_topics_sync(should_stop) -> dict:
+    """
+    Recalculate topics and metrics (runs in a thread via refresh_coordinator)
+    should_stop() is checked until the new topics are written
+    
+    Sampled runs are profiled; their clustering runs in this thread instead
+    of the process pool so embeddings/K-Means/TF-IDF show up in the profile.
+    """
+    with job_profiler.profile('refresh') as profile:
+        return _refresh_topics(should_stop, in_process=profile.enabled)
+
+
+def _refresh_topics(should_stop, in_process: bool = False) -> dict:
     global last_clustering_time
     
+    if not leader_elector.acquire_job_lock('refresh'):
+        raise RefreshSkipped("refresh running on another worker")
+    
     print("\n" + "="*70)
     print(f"🧠 TOPIC REFRESH - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        
         # Check if we have enough articles
         article_count = db.query(Article).count()
         print(f"📊 Total articles in DB: {article_count}")
         
         if article_count < 3:
             print("⚠️  Not enough articles for clustering (minimum 3)")
-            db.close()
-            return
+            return {'articles': article_count, 'topics': 0, 'metrics_updated': 0}
         
         # Run clustering
         print("\n🔍 Running topic clustering...")
         topics = topic_service.cluster_and_save_topics(
             days_back=30,  # Consider articles from last 30 days
-            min_cluster_size=2
+            min_cluster_size=2,
+            should_stop=should_stop,
+            executor=None if in_process else cpu_executor()  # Embeddings + K-Means in un processo separato
         )
+        created = len(topics)
+        invalidate_responses('topics')  # Nuovi topic e topic_id degli articoli
         
-        print(f"✅ Created {len(topics)} topics")
+        print(f"✅ Created {created} topics")
         
         # Calculate metrics for all topics
         print("\n📈 Calculating Pulse metrics...")
@@ -151,65 +258,94 @@ async def refresh_topics_and_metrics():
         
         print("="*70 + "\n")
         
-        db.close()
-        
-    except Exception as e:
-        print(f"\n❌ Topic refresh failed: {e}")
+        result = {'articles': article_count, 'topics': created, 'metrics_updated': updated_count}
+        event_bus.publish('refresh', result)  # La dashboard ricarica la lista dei topic
+        return result
+    
+    except ClusteringCancelled:
+        print("🧠 Topic refresh cancelled (superseded by a newer request)")
+        raise
+    except Exception:
         import traceback
         traceback.print_exc()
+        raise
+    finally:
+        db.close()
+        leader_elector.release_job_lock('refresh')
+
+
+# Trigger di refresh (ingest, job periodico, manuale) accorpati con debounce
+refresh_coordinator = RefreshCoordinator(
+    refresh=_refresh_topics_sync,
+    count_new_articles=_count_new_articles,
+    run=functools.partial(run_io, 'refresh')
+)
+
+
+def trigger_refresh():
+    """Refresh manuale: ignora la soglia di articoli nuovi e sostituisce un run in corso"""
+    refresh_coordinator.request('manual', force=True)
 
 
 async def cleanup_old_data():
     """
     Clean up old articles and orphaned topics
-    Runs daily at 3 AM
+    Runs daily at 3 AM (in the job thread pool, the event loop stays free)
     """
+    await run_io('cleanup', _cleanup_old_data_sync)
+
+
+def _cleanup_old_data_sync():
+    with job_profiler.profile('cleanup'):
+        _cleanup_old_data()
+
+
+def _cleanup_old_data():
     global last_cleanup_time
     
     print("\n" + "="*70)
     print(f"🧹 CLEANUP JOB - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        
-        # Delete articles older than 30 days
+        # Delete articles older than 30 days (bulk DELETE, no ORM objects loaded)
         cutoff_date = datetime.utcnow() - timedelta(days=30)
-        old_articles = db.query(Article).filter(
+        deleted_articles = db.query(Article).filter(
             Article.published_at < cutoff_date
-        ).all()
+        ).delete(synchronize_session=False)
+        db.commit()
         
-        if old_articles:
-            for article in old_articles:
-                db.delete(article)
-            db.commit()
-            print(f"🗑️  Deleted {len(old_articles)} articles older than 30 days")
+        if deleted_articles:
+            print(f"🗑️  Deleted {deleted_articles} articles older than 30 days")
         else:
             print("✅ No old articles to delete")
         
         # Delete topics with no articles
-        orphaned_topics = db.query(Topic).filter(
+        deleted_topics = db.query(Topic).filter(
             ~Topic.topic_id.in_(
                 db.query(Article.topic_id).filter(Article.topic_id.isnot(None))
             )
-        ).all()
+        ).delete(synchronize_session=False)
+        db.commit()
         
-        if orphaned_topics:
-            for topic in orphaned_topics:
-                db.delete(topic)
-            db.commit()
-            print(f"🗑️  Deleted {len(orphaned_topics)} orphaned topics")
+        if deleted_topics:
+            print(f"🗑️  Deleted {deleted_topics} orphaned topics")
         else:
             print("✅ No orphaned topics to delete")
         
+        if deleted_articles or deleted_topics:
+            invalidate_responses('articles', 'topics')
+        
         last_cleanup_time = datetime.now()
         
         print("="*70 + "\n")
-        
-        db.close()
-        
+    
     except Exception as e:
+        db.rollback()
         print(f"\n❌ Cleanup job failed: {e}")
+    finally:
+        db.close()
 
 
 def init_scheduler():
@@ -223,11 +359,16 @@ def init_scheduler():
         print("⚠️  Scheduler already initialized")
         return scheduler
     
+    # Ogni worker/replica ha lo scheduler, ma i job girano solo sul leader
+    # (leader_only): failover automatico quando il leader scompare
     scheduler = AsyncIOScheduler()
     
+    # Il consumer della coda di ingest richiede un refresh dopo articoli nuovi
+    ingest_queue.on_flush(_on_ingest_flush)
+    
     # Job 1: Scrape all sources every 2 hours
     scheduler.add_job(
-        scrape_all_sources,
+        leader_only(scrape_all_sources),
         trigger=IntervalTrigger(hours=2),
         id='scrape_all_sources',
         name='Scrape all sources',
@@ -237,7 +378,7 @@ def init_scheduler():
     
     # Job 2: Manual topic refresh every 6 hours (backup if scraping found nothing)
     scheduler.add_job(
-        refresh_topics_and_metrics,
+        leader_only(refresh_topics_and_metrics),
         trigger=IntervalTrigger(hours=6),
         id='refresh_topics',
         name='Refresh topics and metrics',
@@ -247,7 +388,7 @@ def init_scheduler():
     
     # Job 3: Cleanup old data daily at 3 AM
     scheduler.add_job(
-        cleanup_old_data,
+        leader_only(cleanup_old_data),
         trigger=CronTrigger(hour=3, minute=0),
         id='cleanup_old_data',
         name='Cleanup old articles',
@@ -261,7 +402,7 @@ def init_scheduler():
     print("="*70)
     print("📋 Scheduled jobs:")
     print("  1. Scrape all sources - every 2 hours")
-    print("  2. Refresh topics - every 6 hours")
+    print("  2. Refresh topics - every 6 hours (skipped without new articles)")
     print("  3. Cleanup old data - daily at 3 AM")
     print("="*70 + "\n")
     
@@ -277,6 +418,8 @@ def shutdown_scheduler():
     
     if scheduler and scheduler.running:
         scheduler.shutdown()
+        refresh_coordinator.shutdown()
+        shutdown_executors()
         print("⏰ Scheduler shutdown complete")
 
 
@@ -305,5 +448,11 @@ def get_scheduler_status():
         'last_scraping': last_scraping_time.isoformat() if last_scraping_time else None,
         'last_clustering': last_clustering_time.isoformat() if last_clustering_time else None,
         'last_cleanup': last_cleanup_time.isoformat() if last_cleanup_time else None,
-        'scraping_stats': scraping_stats
+        'scraping_stats': scraping_stats,
+        'scraping_running': _scraping_lock.locked(),
+        'ingest_queue': ingest_queue.snapshot(),
+        'topic_refresh': refresh_coordinator.snapshot(),
+        'job_slots': job_stats(),
+        'event_loop': loop_monitor.snapshot(),
+        'leader': leader_elector.snapshot()
     }
@@ -1,10 +1,12 @@
 """
 FastAPI main application
 """
-from fastapi import FastAPI, Depends
+from fastapi import FastAPI, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 from config import settings
-from models.database import init_db
+from models.database import async_read_engine, engine, init_db, read_engine
+from services.response_cache import ResponseCacheMiddleware, response_cache_enabled
+from services.telemetry import PROMETHEUS_AVAILABLE, MetricsMiddleware, instrument_engine, render_metrics
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -12,6 +14,12 @@ app = FastAPI(
     debug=settings.DEBUG
 )
 
+# Cache risposte topic/stats (ETag/304), invalidata da refresh, save e cleanup
+if response_cache_enabled():
+    app.add_middleware(ResponseCacheMiddleware, router=app.router)
+elif settings.RESPONSE_CACHE_ENABLED:
+    print("⚠️  Response cache disabled: API reads go to DATABASE_READ_URL (replication lag)")
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -21,6 +29,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus: latenza per route (template) e per query SQL
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    if async_read_engine is not None:
+        instrument_engine(async_read_engine.sync_engine)
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -29,6 +45,19 @@ async def startup_event():
     init_db()
     print("✅ Database initialized")
     
+    # Consumer della coda di ingest (scraper -> storage a micro-batch)
+    from services.ingest_queue import ingest_queue
+    ingest_queue.start()
+    print("✅ Ingest queue started")
+    
+    # Watchdog: misura quanto l'event loop resta bloccato da codice sincrono
+    from jobs.executors import loop_monitor
+    loop_monitor.start()
+    
+    # Leader election: con più worker/repliche i job girano su uno solo
+    from jobs.leader import leader_elector
+    await leader_elector.start()
+    
     # Initialize scheduler for automated jobs
     from jobs.scheduler import init_scheduler
     init_scheduler()
@@ -39,7 +68,13 @@ async def startup_event():
 async def shutdown_event():
     """Graceful shutdown"""
     from jobs.scheduler import shutdown_scheduler
+    from services.ingest_queue import ingest_queue
+    from jobs.executors import loop_monitor
+    from jobs.leader import leader_elector
+    await ingest_queue.stop(timeout=30)
     shutdown_scheduler()
+    await leader_elector.stop()  # Failover immediato invece che a scadenza del lease
+    await loop_monitor.stop()
     print("👋 Scheduler shutdown complete")
 
 
@@ -62,11 +97,23 @@ async def health():
     }
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metriche Prometheus (fetch, stage di ingest, embedding, K-Means, DB, HTTP)"""
+    if not settings.METRICS_ENABLED or not PROMETHEUS_AVAILABLE:
+        return Response("prometheus-client not installed or metrics disabled\n", status_code=503)
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+
 # Import API routers
-from api import articles, scraping, stats, topics, health
+from api import articles, scraping, stats, topics, health, profiles, stream, export
 
 app.include_router(articles.router, prefix="/api/articles", tags=["articles"])
 app.include_router(scraping.router, prefix="/api/scraping", tags=["scraping"])
 app.include_router(stats.router, prefix="/api/stats", tags=["stats"])
 app.include_router(topics.router, tags=["topics"])  # Already has /api/topics prefix
 app.include_router(health.router, prefix="/api")  # /api/health
+app.include_router(profiles.router)  # /api/profiles
+app.include_router(stream.router)  # /api/stream (SSE)
+app.include_router(export.router)  # /api/export/articles
@@ -1,5 +1,6 @@
 from .article import Article, ArticleSchema, ArticleCreate
 from .topic import Topic, TopicSchema, TopicWithSources
+from .record import ArticleRecord
 
 __all__ = [
     "Article",
@@ -7,5 +8,6 @@ __all__ = [
     "ArticleCreate",
     "Topic",
     "TopicSchema",
-    "TopicWithSources"
+    "TopicWithSources",
+    "ArticleRecord"
 ]
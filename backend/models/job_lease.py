@@ -0,0 +1,17 @@
+"""
+Lease dei job schedulati (leader election su database senza advisory lock)
+"""
+from sqlalchemy import Column, String, DateTime
+
+# Import Base from database to use same declarative base
+from models.database import Base
+
+
+class JobLease(Base):
+    """Lock con scadenza: lo detiene `holder` finché rinnova prima di expires_at"""
+    __tablename__ = "job_leases"
+    
+    name = Column(String(100), primary_key=True)   # "scheduler", "job:scrape", ...
+    holder = Column(String(255), nullable=False)   # host:pid:uuid del processo
+    acquired_at = Column(DateTime)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,30 @@
+"""
+Record leggero per gli articoli in transito (scraper -> parser -> storage)
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """
+    Articolo in-flight: niente DataFrame né validazione Pydantic
+
+    raw_metadata contiene i metadata grezzi dello scraper finché il parser
+    non li sostituisce con quelli strutturati per fonte.
+    """
+    source: str
+    source_id: str
+    title: str
+    content: Optional[str] = None
+    url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    language: Optional[str] = None
+    country: Optional[str] = None
+    entities: Optional[dict] = None
+    raw_metadata: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        """Dict con i campi di ArticleCreate (copia superficiale)"""
+        return {name: getattr(self, name) for name in self.__slots__}
@@ -0,0 +1,152 @@
+"""
+Profilo SQLite (dev e deploy piccoli)
+
+- Pragma a ogni connessione: WAL (i lettori non bloccano lo scrittore e
+  viceversa), synchronous=NORMAL, mmap, cache per connessione, busy_timeout
+- Scritture in coda: un solo writer alla volta nel processo. Una
+  connessione entra in coda al primo statement di scrittura e ne esce a
+  commit/rollback (gli stessi confini del lock RESERVED di SQLite), così
+  scheduler, ingest e POST si mettono in fila in ordine d'arrivo invece
+  di ritentare sul lock del file fino a "database is locked".
+- Letture su connessioni proprie (pool di lettura) con query_only.
+"""
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from config import settings
+
+# Statement che non scrivono: non passano dalla coda
+READ_PREFIXES = ('SELECT', 'PRAGMA', 'EXPLAIN')
+WRITER_FLAG = 'sqlite_writer'
+
+
+def sqlite_pragmas(query_only: bool = False) -> dict:
+    pragmas = {
+        'journal_mode': settings.SQLITE_JOURNAL_MODE,
+        'synchronous': settings.SQLITE_SYNCHRONOUS,
+        'mmap_size': settings.SQLITE_MMAP_SIZE,
+        'cache_size': -settings.SQLITE_CACHE_SIZE_KB,  # Negativo = KiB
+        'busy_timeout': settings.SQLITE_BUSY_TIMEOUT_MS,
+        'temp_store': 'MEMORY',
+    }
+    if query_only:
+        pragmas['query_only'] = 'ON'
+    return pragmas
+
+
+class WriteQueue:
+    """Lock FIFO tra thread: un solo writer, gli altri in attesa in ordine d'arrivo"""
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._waiting = deque()
+        self._held = False
+        self.writes = 0
+        self.max_wait = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self._waiting)
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        ticket = object()
+        started = time.perf_counter()
+        with self._condition:
+            self._waiting.append(ticket)
+            try:
+                ready = self._condition.wait_for(
+                    lambda: not self._held and self._waiting[0] is ticket, timeout
+                )
+                if not ready:
+                    return False
+                self._held = True
+            finally:
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+        waited = time.perf_counter() - started
+        self.writes += 1
+        self.max_wait = max(self.max_wait, waited)
+        from services.telemetry import SQLITE_WRITE_WAIT_SECONDS  # services importa models
+        SQLITE_WRITE_WAIT_SECONDS.observe(waited)
+        return True
+
+    def release(self):
+        with self._condition:
+            self._held = False
+            self._condition.notify_all()
+
+    def snapshot(self) -> dict:
+        return {'writes': self.writes, 'waiting': self.depth, 'max_wait_s': round(self.max_wait, 4)}
+
+
+def tune_sqlite(engine, query_only: bool = False, queue: Optional['WriteQueue'] = None):
+    """
+    Pragma su ogni nuova connessione dell'engine e, con `queue`, scritture
+    serializzate. Idempotente; per engine async passare engine.sync_engine.
+    """
+    if getattr(engine, '_pulse_sqlite_tuned', False):
+        return
+    pragmas = sqlite_pragmas(query_only)
+
+    @event.listens_for(engine, 'connect')
+    def _connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    if queue is not None:
+        _serialize_writes(engine, queue)
+    engine._pulse_sqlite_tuned = True
+
+
+def _serialize_writes(engine, queue: WriteQueue):
+    timeout = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get(WRITER_FLAG) or statement.lstrip()[:7].upper().startswith(READ_PREFIXES):
+            return
+        if not queue.acquire(timeout):
+            raise OperationalError(statement, parameters, Exception(
+                f"database is locked (write queue wait > {timeout:.1f}s, {queue.depth} waiting)"
+            ))
+        conn.info[WRITER_FLAG] = True
+
+    # L'evento precede il commit/rollback DBAPI: lo si esegue qui, poi si libera
+    # la coda (quello di SQLAlchemy subito dopo non ha più nulla da chiudere)
+    @event.listens_for(engine, 'commit')
+    def _commit(conn):
+        if conn.info.pop(WRITER_FLAG, False):
+            try:
+                conn.connection.dbapi_connection.commit()
+            finally:
+                queue.release()
+
+    @event.listens_for(engine, 'rollback')
+    def _rollback(conn):
+        if conn.info.pop(WRITER_FLAG, False):
+            try:
+                conn.connection.dbapi_connection.rollback()
+            finally:
+                queue.release()
+
+    # Connessione restituita al pool o invalidata con una scrittura aperta
+    @event.listens_for(engine, 'reset')
+    def _reset(dbapi_connection, connection_record, reset_state):
+        if connection_record.info.pop(WRITER_FLAG, False):
+            queue.release()
+
+    @event.listens_for(engine, 'invalidate')
+    def _invalidate(dbapi_connection, connection_record, exception):
+        if connection_record.info.pop(WRITER_FLAG, False):
+            queue.release()
+
+
+# Singleton: una coda per processo (le connessioni di scrittura sono tutte sullo stesso file)
+write_queue = WriteQueue()
@@ -32,6 +32,11 @@ class Topic(Base):
     
     sentiment_avg = Column(Float, default=0.0)
     
+    # Forecast prossime FORECAST_HORIZON_HOURS ore
+    forecast_volume = Column(Float, default=0.0)    # Articoli attesi
+    forecast_velocity = Column(Float, default=0.0)  # Crescita attesa vs volume attuale
+    forecast_model = Column(String(20))             # ses, holt, damped
+    
     # Metadata
     country = Column(String(10), index=True)
     sector = Column(String(50), index=True)
@@ -60,6 +65,10 @@ class TopicSchema(BaseModel):
     novelty: float = 0.0
     sentiment_avg: Optional[float] = None
     
+    forecast_volume: Optional[float] = None
+    forecast_velocity: Optional[float] = None
+    forecast_model: Optional[str] = None
+    
     country: Optional[str] = None
     sector: Optional[str] = None
     
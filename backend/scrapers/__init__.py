@@ -3,6 +3,7 @@ from .ansa_scraper import AnsaScraper
 from .reddit_scraper import RedditScraper
 from .hackernews_scraper import HackerNewsScraper
 from .registry import scraper_registry, ScraperRegistry
+from .http_client import http_client, HttpClient
 
 __all__ = [
     "BaseScraper",
@@ -10,5 +11,7 @@ __all__ = [
     "RedditScraper",
     "HackerNewsScraper",
     "scraper_registry",
-    "ScraperRegistry"
+    "ScraperRegistry",
+    "http_client",
+    "HttpClient"
 ]
@@ -2,12 +2,14 @@
 ANSA Scraper - adattato dal codice esistente
 """
 import re
-import requests
+import hashlib
 from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional
+from models.record import ArticleRecord
 from .base_scraper import BaseScraper
+from .http_client import http_client
 
 
 def convert_ansa_date(raw_date_str: str) -> Optional[datetime]:
@@ -41,15 +43,22 @@ class AnsaScraper(BaseScraper):
         end_date: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Scraping ANSA con gestione periodo"""
+        return self.records_to_dataframe(
+            self.iter_records(query, max_pages, start_date, end_date)
+        )
+    
+    def iter_pages(
+        self,
+        query: str,
+        max_pages: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[List[ArticleRecord]]:
+        """Una lista di record per ogni pagina di risultati ANSA"""
         
         # Determina periodo param
         period_param = self._get_period_param(start_date, end_date)
         
-        titles = []
-        texts = []
-        dates = []
-        urls = []
-        
         page_number = 0
         
         try:
@@ -62,7 +71,7 @@ class AnsaScraper(BaseScraper):
                     f"&periodo={period_param}"
                 )
                 
-                response = requests.get(url, timeout=30)
+                response = http_client.get(url, source=self.source_name)
                 if response.status_code != 200:
                     break
                 
@@ -75,54 +84,41 @@ class AnsaScraper(BaseScraper):
                 if not title_elems:
                     break
                 
-                for title in title_elems:
-                    titles.append(title.get_text(strip=True))
-                    # Estrai URL se presente
-                    link = title.find_parent('a')
-                    if link and link.get('href'):
-                        urls.append(f"https://www.ansa.it{link['href']}")
-                    else:
-                        urls.append("")
-                
-                for text in text_elems:
-                    texts.append(text.get_text(strip=True))
-                
-                for date_elem in date_elems:
-                    dates.append(date_elem.get_text(strip=True))
+                yield self._parse_page(title_elems, text_elems, date_elems)
                 
                 page_number += 12
             
-            # Allinea lunghezze
-            min_len = min(len(titles), len(texts), len(dates))
-            
-            df = pd.DataFrame({
-                'Title': titles[:min_len],
-                'Text': texts[:min_len],
-                'Date': dates[:min_len],
-                'url': urls[:min_len] if urls else [""] * min_len
-            })
-            
-            # Converti date
-            if not df.empty:
-                df['Date'] = df['Date'].apply(convert_ansa_date)
-                # Genera source_id: prima da URL, poi hash del titolo
-                df['source_id'] = df.apply(
-                    lambda row: (
-                        row['url'].split('/')[-1] if row['url'] 
-                        else f"ansa_{hash(row['Title'])}"
-                    ),
-                    axis=1
-                )
+        except Exception as e:
+            print(f"ANSA scraper error: {e}")
+    
+    def _parse_page(self, title_elems, text_elems, date_elems) -> List[ArticleRecord]:
+        """Record di una pagina (liste titoli/testi/date allineate per pagina)"""
+        records = []
+        
+        for title_elem, text_elem, date_elem in zip(title_elems, text_elems, date_elems):
+            title = title_elem.get_text(strip=True)
             
-            # Normalizza output
-            df = self.normalize_output(df)
-            df = self.validate_dates(df, start_date, end_date)
+            # Estrai URL se presente
+            link = title_elem.find_parent('a')
+            url = f"https://www.ansa.it{link['href']}" if link and link.get('href') else ""
             
-            return df
+            # source_id: prima da URL, poi hash stabile del titolo
+            # (hash() builtin cambia ad ogni processo e creerebbe duplicati)
+            if url:
+                source_id = url.split('/')[-1]
+            else:
+                digest = hashlib.blake2b(title.encode('utf-8'), digest_size=8).hexdigest()
+                source_id = f"ansa_{digest}"
             
-        except Exception as e:
-            print(f"ANSA scraper error: {e}")
-            return pd.DataFrame()
+            records.append(self.make_record(
+                source_id=source_id,
+                title=title,
+                content=text_elem.get_text(strip=True),
+                url=url,
+                published_at=convert_ansa_date(date_elem.get_text(strip=True))
+            ))
+        
+        return records
     
     def _get_period_param(
         self,
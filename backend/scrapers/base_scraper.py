@@ -2,9 +2,16 @@
 Base scraper interface - tutti gli scraper devono implementare questa interfaccia
 """
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import Iterable, Iterator, List, Optional, Dict
 from datetime import datetime
 import pandas as pd
+from models.record import ArticleRecord
+
+# Colonne del DataFrame prodotto da records_to_dataframe
+RECORD_COLUMNS = [
+    'source', 'source_id', 'title', 'content',
+    'url', 'published_at', 'metadata'
+]
 
 
 class BaseScraper(ABC):
@@ -77,3 +84,76 @@ class BaseScraper(ABC):
             df = df[df['published_at'] <= end_date]
         
         return df
+    
+    def iter_pages(
+        self,
+        query: str,
+        max_pages: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[List[ArticleRecord]]:
+        """
+        Scraping in streaming: una lista di record per pagina scaricata
+        
+        Gli scraper la sovrascrivono per produrre pagine man mano che le
+        scaricano. Il default adatta uno scraper solo-DataFrame (una pagina).
+        """
+        df = self.scrape(query, max_pages, start_date, end_date)
+        if df.empty:
+            return
+        
+        page = []
+        for row in df.to_dict('records'):
+            published_at = row.get('published_at')
+            page.append(self.make_record(
+                source_id=str(row.get('source_id') or ''),
+                title=row.get('title') or '',
+                content=row.get('content'),
+                url=row.get('url'),
+                published_at=None if published_at is pd.NaT else published_at,
+                metadata=row.get('metadata') if isinstance(row.get('metadata'), dict) else {}
+            ))
+        yield page
+    
+    def iter_records(
+        self,
+        query: str,
+        max_pages: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[ArticleRecord]:
+        """Record uno alla volta, già filtrati per range date"""
+        for page in self.iter_pages(query, max_pages, start_date, end_date):
+            for record in page:
+                if self.in_date_range(record, start_date, end_date):
+                    yield record
+    
+    def make_record(self, metadata: Optional[Dict] = None, **fields) -> ArticleRecord:
+        """Crea un ArticleRecord per questa fonte (metadata grezzi in raw_metadata)"""
+        return ArticleRecord(source=self.source_name, raw_metadata=metadata or {}, **fields)
+    
+    @staticmethod
+    def in_date_range(
+        record: ArticleRecord,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> bool:
+        """Stesso criterio di validate_dates: senza data il record è escluso se c'è un range"""
+        if start_date is None and end_date is None:
+            return True
+        if record.published_at is None:
+            return False
+        if start_date and record.published_at < start_date:
+            return False
+        if end_date and record.published_at > end_date:
+            return False
+        return True
+    
+    @staticmethod
+    def records_to_dataframe(records: Iterable[ArticleRecord]) -> pd.DataFrame:
+        """DataFrame normalizzato (colonne RECORD_COLUMNS) per l'API scrape()"""
+        rows = [
+            (r.source, r.source_id, r.title, r.content, r.url, r.published_at, r.raw_metadata)
+            for r in records
+        ]
+        return pd.DataFrame(rows, columns=RECORD_COLUMNS)
@@ -1,12 +1,12 @@
 """
 Hacker News Scraper
 """
-import time
-import requests
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional
 import pandas as pd
+from models.record import ArticleRecord
 from .base_scraper import BaseScraper
+from .http_client import http_client
 
 
 class HackerNewsScraper(BaseScraper):
@@ -24,12 +24,22 @@ class HackerNewsScraper(BaseScraper):
         end_date: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Scraping Hacker News"""
+        return self.records_to_dataframe(
+            self.iter_records(query, max_pages, start_date, end_date)
+        )
+    
+    def iter_pages(
+        self,
+        query: str,
+        max_pages: int = 5,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[List[ArticleRecord]]:
+        """Una lista di record per ogni pagina di hit Algolia"""
         
         keywords = query.split('+')
         combined_query = " ".join(keywords)
         
-        all_items = []
-        
         try:
             for page in range(max_pages):
                 params = {
@@ -38,7 +48,7 @@ class HackerNewsScraper(BaseScraper):
                     'page': page
                 }
                 
-                response = requests.get(self.api_url, params=params, timeout=30)
+                response = http_client.get(self.api_url, params=params, source=self.source_name)
                 
                 if response.status_code != 200:
                     break
@@ -49,24 +59,16 @@ class HackerNewsScraper(BaseScraper):
                 if not hits:
                     break
                 
+                records = []
                 for hit in hits:
                     item = self._process_hit(hit)
                     if item:
-                        all_items.append(item)
+                        records.append(self.make_record(**item))
                 
-                time.sleep(1)  # Rate limiting
-            
-            df = pd.DataFrame(all_items)
-            
-            if not df.empty:
-                df = self.normalize_output(df)
-                df = self.validate_dates(df, start_date, end_date)
-            
-            return df
+                yield records
             
         except Exception as e:
             print(f"HackerNews scraper error: {e}")
-            return pd.DataFrame()
     
     def _process_hit(self, hit: dict) -> Optional[dict]:
         """Processa un hit da HN"""
@@ -88,7 +90,7 @@ class HackerNewsScraper(BaseScraper):
                 pass
         
         return {
-            'title': title,
+            'title': title or '',
             'content': story_text,
             'published_at': published_at,
             'source_id': object_id,
@@ -0,0 +1,397 @@
+"""
+HTTP client condiviso dagli scraper
+Session con keep-alive, gzip/brotli, richieste condizionali (ETag/Last-Modified),
+cache su disco con TTL ed eviction per dimensione, rate limit e retry
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.models import PreparedRequest
+
+from config import settings
+from services.telemetry import FETCH_SECONDS, PIPELINE_ERRORS
+from .rate_limiter import (
+    RETRY_STATUSES,
+    THROTTLE_STATUSES,
+    CircuitBreaker,
+    HostRateLimiter,
+    RetryBudget,
+    backoff_delay,
+    parse_retry_after,
+)
+
+# urllib3 decodifica Content-Encoding: br solo se brotli è installato
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "gzip, deflate, br"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+
+class HttpResponse:
+    """Risposta HTTP (dalla rete o dalla cache) con l'interfaccia usata dagli scraper"""
+    
+    __slots__ = ('url', 'status_code', 'content', 'headers', 'from_cache', 'not_modified')
+    
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        content: bytes,
+        headers: Dict[str, str],
+        from_cache: bool = False,
+        not_modified: bool = False
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.from_cache = from_cache
+        self.not_modified = not_modified
+    
+    @property
+    def unchanged(self) -> bool:
+        """Stesso body già consegnato in un ciclo precedente (cache fresca o 304)"""
+        return self.from_cache or self.not_modified
+    
+    @property
+    def text(self) -> str:
+        content_type = self.headers.get('content-type', '')
+        encoding = 'utf-8'
+        if 'charset=' in content_type:
+            encoding = content_type.split('charset=')[-1].split(';')[0].strip() or encoding
+        return self.content.decode(encoding, errors='replace')
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache:
+    """
+    Cache su disco delle risposte 200
+    
+    Un file per URL: riga JSON con i metadata (ETag, Last-Modified,
+    stored_at) seguita dal body compresso con zlib. Oltre max_bytes
+    vengono eliminate le voci usate meno di recente.
+    """
+    
+    # Header conservati per le richieste condizionali e il decoding del body
+    KEPT_HEADERS = ('etag', 'last-modified', 'content-type')
+    
+    def __init__(self, directory: str, max_bytes: int, max_age_seconds: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._index: Optional[Dict[str, list]] = None  # key -> [size, last_access]
+        self._total_bytes = 0
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+    
+    def _load_index(self):
+        """Scansione della directory alla prima richiesta"""
+        self._index = {}
+        self._total_bytes = 0
+        if not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                self._index[name] = [stat.st_size, stat.st_mtime]
+                self._total_bytes += stat.st_size
+    
+    def get(self, key: str) -> Optional[dict]:
+        """Entry con meta e body, None se assente, illeggibile o troppo vecchia"""
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            if key not in self._index:
+                return None
+            
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    meta_line, compressed = f.read().split(b'\n', 1)
+                meta = json.loads(meta_line)
+                if time.time() - meta['stored_at'] > self.max_age_seconds:
+                    self._remove(key)
+                    return None
+                meta['content'] = zlib.decompress(compressed)
+            except (OSError, ValueError, KeyError, zlib.error):
+                self._remove(key)
+                return None
+            
+            # mtime = ultimo accesso (per l'eviction LRU anche tra riavvii)
+            now = time.time()
+            os.utime(path, (now, now))
+            self._index[key][1] = now
+            return meta
+    
+    def put(self, key: str, url: str, headers: Dict[str, str], content: bytes):
+        meta = {
+            'url': url,
+            'stored_at': time.time(),
+            'headers': {name: headers[name] for name in self.KEPT_HEADERS if name in headers},
+        }
+        payload = json.dumps(meta).encode('utf-8') + b'\n' + zlib.compress(content)
+        
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+            
+            if key in self._index:
+                self._total_bytes -= self._index[key][0]
+            self._index[key] = [len(payload), time.time()]
+            self._total_bytes += len(payload)
+            self._evict()
+    
+    def touch(self, key: str):
+        """Rinnova stored_at dopo un 304 (il body resta valido)"""
+        with self._lock:
+            path = self._path(key)
+            try:
+                with open(path, 'rb') as f:
+                    meta_line, compressed = f.read().split(b'\n', 1)
+                meta = json.loads(meta_line)
+                meta['stored_at'] = time.time()
+                with open(path, 'wb') as f:
+                    f.write(json.dumps(meta).encode('utf-8') + b'\n' + compressed)
+            except (OSError, ValueError):
+                self._remove(key)
+    
+    def clear(self):
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            for key in list(self._index):
+                self._remove(key)
+    
+    def _remove(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry:
+            self._total_bytes -= entry[0]
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+    
+    def _evict(self):
+        """Elimina le voci meno recenti fino al 90% di max_bytes"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * 0.9
+        for key, _ in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= target:
+                break
+            self._remove(key)
+    
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+    
+    def __len__(self) -> int:
+        return len(self._index or {})
+
+
+class HttpClient:
+    """Client HTTP condiviso: una Session con pool di connessioni per host"""
+    
+    def __init__(self, cache: Optional[ResponseCache] = None):
+        self.session = self.create_session()
+        
+        if cache is None and settings.HTTP_CACHE_ENABLED:
+            cache = ResponseCache(
+                settings.HTTP_CACHE_DIR or os.path.join(settings.DATA_DIR, 'http_cache'),
+                max_bytes=settings.HTTP_CACHE_MAX_BYTES,
+                max_age_seconds=settings.HTTP_CACHE_MAX_AGE_SECONDS
+            )
+        self.cache = cache
+        self.limiter = HostRateLimiter()
+        self.retry_budget = RetryBudget(settings.HTTP_RETRY_BUDGET_PER_RUN)
+        self.breaker = CircuitBreaker(
+            settings.CIRCUIT_BREAKER_FAILURES,
+            settings.CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
+        self.stats = {
+            'requests': 0,
+            'downloads': 0,
+            'not_modified': 0,
+            'cache_hits': 0,
+            'bytes_downloaded': 0,
+            'retries': 0,
+            'throttled': 0,
+        }
+    
+    @staticmethod
+    def create_session() -> requests.Session:
+        """Session con keep-alive e pool per host (anche per client esterni, es. PRAW)"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=settings.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=settings.HTTP_POOL_MAXSIZE
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+        if settings.HTTP_USER_AGENT:
+            session.headers['User-Agent'] = settings.HTTP_USER_AGENT
+        return session
+    
+    @staticmethod
+    def cache_key(url: str) -> str:
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def get(
+        self,
+        url: str,
+        params: Optional[Dict] = None,
+        timeout: Optional[float] = None,
+        ttl: Optional[int] = None,
+        source: Optional[str] = None
+    ) -> HttpResponse:
+        """
+        GET con cache, rate limit per host e retry
+        
+        - entry più giovane di ttl: servita dal disco, nessuna richiesta
+        - entry più vecchia: richiesta condizionale, su 304 si riusa il body
+        - altrimenti download completo (salvato se 200 e non no-store)
+        
+        Con `source` i fallimenti contano per il circuit breaker della fonte
+        (CircuitOpenError se la fonte è sospesa).
+        """
+        prepared = PreparedRequest()
+        prepared.prepare_url(url, params)
+        full_url = prepared.url
+        timeout = timeout or settings.REQUEST_TIMEOUT_SECONDS
+        ttl = settings.HTTP_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.stats['requests'] += 1
+        
+        key = self.cache_key(full_url)
+        entry = self.cache.get(key) if self.cache is not None else None
+        
+        if entry is not None and time.time() - entry['stored_at'] < ttl:
+            self.stats['cache_hits'] += 1
+            return HttpResponse(full_url, 200, entry['content'], entry['headers'], from_cache=True)
+        
+        headers = {}
+        if entry is not None:
+            if 'etag' in entry['headers']:
+                headers['If-None-Match'] = entry['headers']['etag']
+            if 'last-modified' in entry['headers']:
+                headers['If-Modified-Since'] = entry['headers']['last-modified']
+        
+        response = self._send(full_url, headers, timeout, source)
+        
+        if response.status_code == 304 and entry is not None:
+            self.stats['not_modified'] += 1
+            self.cache.touch(key)
+            return HttpResponse(full_url, 200, entry['content'], entry['headers'], not_modified=True)
+        
+        self.stats['downloads'] += 1
+        self.stats['bytes_downloaded'] += len(response.content)
+        response_headers = {name.lower(): value for name, value in response.headers.items()}
+        
+        cache_control = response_headers.get('cache-control', '')
+        if self.cache is not None and response.status_code == 200 and 'no-store' not in cache_control:
+            self.cache.put(key, full_url, response_headers, response.content)
+        
+        return HttpResponse(full_url, response.status_code, response.content, response_headers)
+    
+    def _send(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float,
+        source: Optional[str]
+    ) -> requests.Response:
+        """
+        Richiesta di rete con token bucket dell'host e retry su 429/5xx/errori di rete
+        
+        I retry usano backoff con jitter (almeno il Retry-After del server) e
+        consumano il budget del run; a budget esaurito si restituisce subito
+        l'ultima risposta (o si rilancia l'ultimo errore).
+        """
+        if source:
+            self.breaker.before_request(source)
+        
+        host = urlsplit(url).hostname or ''
+        attempt = 0
+        try:
+            while True:
+                self.limiter.acquire(host)
+                error = None
+                retry_after = None
+                started = time.perf_counter()
+                try:
+                    response = self.session.get(url, headers=headers, timeout=timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    response, error = None, e
+                except requests.RequestException:
+                    # Non ritentabile (redirect, URL, stream interrotto): conta per il breaker
+                    PIPELINE_ERRORS.labels('fetch').inc()
+                    if source:
+                        self.breaker.record_failure(source)
+                    raise
+                FETCH_SECONDS.labels(source or host).observe(time.perf_counter() - started)
+                
+                if response is not None and response.status_code not in RETRY_STATUSES:
+                    self.limiter.bucket(host).on_success()
+                    if source:
+                        self.breaker.record_success(source)
+                    return response
+                
+                if response is not None:
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if response.status_code in THROTTLE_STATUSES:
+                        self.stats['throttled'] += 1
+                        self.limiter.bucket(host).on_throttle(retry_after)
+                
+                if attempt >= settings.HTTP_MAX_RETRIES or not self.retry_budget.consume():
+                    PIPELINE_ERRORS.labels('fetch').inc()
+                    if source:
+                        self.breaker.record_failure(source)
+                    if error is not None:
+                        raise error
+                    return response
+                
+                self.stats['retries'] += 1
+                time.sleep(backoff_delay(attempt, retry_after))
+                attempt += 1
+        except BaseException:
+            # Qualunque errore non già registrato chiude la prova half-open
+            if source:
+                self.breaker.end_probe(source)
+            raise
+    
+    def start_run(self):
+        """Nuovo run di scraping: retry budget pieno (breaker e rate restano)"""
+        self.retry_budget.reset(settings.HTTP_RETRY_BUDGET_PER_RUN)
+    
+    def is_available(self, source: str) -> bool:
+        """False se il circuit breaker della fonte è aperto"""
+        return not self.breaker.is_open(source)
+
+
+# Singleton instance
+http_client = HttpClient()
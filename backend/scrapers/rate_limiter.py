@@ -0,0 +1,203 @@
+"""
+Rate limiting e resilienza per l'HTTP client degli scraper
+Token bucket adattivo per host, backoff con jitter, retry budget per run
+e circuit breaker per fonte
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from config import settings
+
+# Risposte che vale la pena ritentare
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Risposte che indicano di rallentare (oltre al retry)
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class CircuitOpenError(Exception):
+    """La fonte ha fallito troppe volte di fila: richieste sospese fino al cooldown"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After in secondi (intero o HTTP-date), None se assente o non valido"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Exponential backoff con full jitter; Retry-After del server come minimo"""
+    cap = min(settings.HTTP_BACKOFF_MAX_SECONDS, settings.HTTP_BACKOFF_BASE_SECONDS * 2 ** attempt)
+    delay = random.uniform(0, cap)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, settings.HTTP_BACKOFF_MAX_SECONDS))
+    return delay
+
+
+class TokenBucket:
+    """
+    Token bucket con rate adattivo (AIMD)
+    
+    Ogni successo riporta gradualmente il rate verso max_rate, ogni 429/503
+    lo dimezza e blocca l'host per il Retry-After indicato.
+    """
+    
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.min_rate = rate / 16
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Prenota un token; ritorna i secondi da attendere prima di usarlo"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+    
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+    
+    def on_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+
+class HostRateLimiter:
+    """Un token bucket per host (limiti da HTTP_RATE_LIMITS, default per gli altri)"""
+    
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+    
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = settings.HTTP_RATE_LIMITS.get(host, settings.HTTP_DEFAULT_RATE_PER_SECOND)
+                bucket = TokenBucket(rate, settings.HTTP_RATE_BURST)
+                self._buckets[host] = bucket
+            return bucket
+    
+    def acquire(self, host: str):
+        """Blocca il thread chiamante solo quanto serve per rispettare il rate dell'host"""
+        wait = self.bucket(host).reserve()
+        if wait > 0:
+            self.waited_seconds += wait
+            time.sleep(wait)
+    
+    def snapshot(self) -> Dict[str, float]:
+        """Rate corrente per host (req/s)"""
+        with self._lock:
+            return {host: round(bucket.rate, 3) for host, bucket in self._buckets.items()}
+
+
+class RetryBudget:
+    """Retry massimi per run di scraping, condivisi tra tutte le fonti"""
+    
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+    
+    def consume(self) -> bool:
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+    
+    def reset(self, limit: Optional[int] = None):
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            self.used = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker per fonte
+    
+    Dopo `threshold` fallimenti consecutivi la fonte resta aperta per
+    `cooldown` secondi; poi una sola richiesta di prova (half-open)
+    decide se richiuderla.
+    """
+    
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: set = set()
+        self._lock = threading.Lock()
+    
+    def is_open(self, source: str) -> bool:
+        with self._lock:
+            opened_at = self._opened_at.get(source)
+            return opened_at is not None and time.monotonic() - opened_at < self.cooldown
+    
+    def before_request(self, source: str):
+        """Solleva CircuitOpenError se la fonte è sospesa (o una prova è già in corso)"""
+        with self._lock:
+            opened_at = self._opened_at.get(source)
+            if opened_at is None:
+                return
+            if time.monotonic() - opened_at < self.cooldown or source in self._probing:
+                raise CircuitOpenError(f"circuit open for source '{source}'")
+            self._probing.add(source)
+    
+    def record_success(self, source: str):
+        with self._lock:
+            self._failures.pop(source, None)
+            self._opened_at.pop(source, None)
+            self._probing.discard(source)
+    
+    def record_failure(self, source: str):
+        with self._lock:
+            failures = self._failures.get(source, 0) + 1
+            self._failures[source] = failures
+            if failures >= self.threshold or source in self._probing:
+                self._opened_at[source] = time.monotonic()
+            self._probing.discard(source)
+    
+    def end_probe(self, source: str):
+        """Prova half-open interrotta senza esito: si riapre il circuito (no-op se già registrata)"""
+        with self._lock:
+            if source in self._probing:
+                self._probing.discard(source)
+                self._opened_at[source] = time.monotonic()
+    
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                source: {
+                    'failures': self._failures.get(source, 0),
+                    'open': source in self._opened_at and now - self._opened_at[source] < self.cooldown,
+                }
+                for source in set(self._failures) | set(self._opened_at)
+            }
@@ -1,30 +1,75 @@
 """
 Reddit Scraper - adattato dal codice esistente
 """
+import queue
+import threading
+import time
 import praw
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Iterator, List, Optional
 import pandas as pd
+from models.record import ArticleRecord
 from .base_scraper import BaseScraper
+from .http_client import HttpClient
 from config import settings
+from services.telemetry import ARTICLES_DUPLICATES, FETCH_SECONDS, PIPELINE_ERRORS
 
 
 class RedditScraper(BaseScraper):
     """Scraper per Reddit"""
     
+    # Submission per richiesta di listing (massimo consentito da Reddit)
+    PAGE_SIZE = 100
+    
     def __init__(self):
         super().__init__("reddit")
         
         # Inizializza PRAW
-        self.reddit = praw.Reddit(
-            client_id=settings.REDDIT_CLIENT_ID or "dummy",
-            client_secret=settings.REDDIT_CLIENT_SECRET or "dummy",
-            user_agent=settings.REDDIT_USER_AGENT
-        )
+        self.reddit = self._create_client()
         
-        self.subreddit_name = "italy"
+        self.subreddits = list(settings.REDDIT_SUBREDDITS)
         self.min_upvotes = 25
         self.max_words = 500
+        
+        # PRAW non è thread-safe: un client per subreddit scaricato in parallelo
+        self._clients: queue.Queue = queue.Queue()
+        self._clients.put(self.reddit)
+        self._client_count = 1
+        self._clients_lock = threading.Lock()
+        self.last_run_stats: dict = {}
+    
+    @staticmethod
+    def _create_client() -> praw.Reddit:
+        return praw.Reddit(
+            client_id=settings.REDDIT_CLIENT_ID or "dummy",
+            client_secret=settings.REDDIT_CLIENT_SECRET or "dummy",
+            user_agent=settings.REDDIT_USER_AGENT,
+            # Session propria (PRAW ne modifica lo User-Agent) ma con keep-alive e gzip
+            requestor_kwargs={'session': HttpClient.create_session()}
+        )
+    
+    def _acquire_client(self) -> praw.Reddit:
+        try:
+            return self._clients.get_nowait()
+        except queue.Empty:
+            pass
+        with self._clients_lock:
+            if self._client_count < settings.REDDIT_FETCH_WORKERS:
+                self._client_count += 1
+                return self._create_client()
+        return self._clients.get()
+    
+    def _release_client(self, client: praw.Reddit):
+        self._clients.put(client)
+    
+    def sessions(self) -> list:
+        """Session HTTP di tutti i client del pool (creati subito, es. per il replay)"""
+        with self._clients_lock:
+            while self._client_count < settings.REDDIT_FETCH_WORKERS:
+                self._client_count += 1
+                self._clients.put(self._create_client())
+        return [client._core._requestor._http for client in list(self._clients.queue)]
     
     def scrape(
         self,
@@ -34,86 +79,143 @@ class RedditScraper(BaseScraper):
         end_date: Optional[datetime] = None
     ) -> pd.DataFrame:
         """Scraping Reddit"""
+        return self.records_to_dataframe(
+            self.iter_records(query, max_pages, start_date, end_date)
+        )
+    
+    @staticmethod
+    def build_query(query: str) -> str:
+        """
+        Una sola ricerca al posto di combinata + prime 2 keyword singole
         
-        time_filter = self._get_time_filter(start_date, end_date)
-        keywords = query.split('+')
+        I risultati della ricerca combinata (AND) sono già inclusi in quelli
+        della prima keyword: l'unione coincide con "kw1 OR kw2".
+        """
+        keywords = [k.strip() for k in query.split('+') if k.strip()]
+        if len(keywords) < 2:
+            return " ".join(keywords)
+        return " OR ".join(f"({k})" if ' ' in k else k for k in keywords[:2])
+    
+    def iter_pages(
+        self,
+        query: str,
+        max_pages: int = 5,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[List[ArticleRecord]]:
+        """
+        Una pagina di record per listing JSON, subreddit scaricati in parallelo
         
-        all_rows = []
+        Filtri upvote/parole applicati ai campi del listing prima di creare i
+        record (nessun oggetto Submission, nessun fetch lazy), duplicati per
+        id rimossi man mano che le pagine arrivano.
+        """
+        search_query = self.build_query(query)
+        params = {
+            'q': search_query,
+            'sort': 'top',
+            't': self._get_time_filter(start_date, end_date),
+            'restrict_sr': 'on',
+            'limit': self.PAGE_SIZE,
+            'raw_json': 1,
+        }
+        stats = {'api_calls': 0, 'listed': 0, 'filtered': 0, 'duplicates': 0, 'records': 0}
+        self.last_run_stats = stats
         
-        try:
-            # 1) Ricerca combinata
-            combined_query = " ".join(keywords)
-            results = self.reddit.subreddit(self.subreddit_name).search(
-                query=combined_query,
-                sort="top",
-                time_filter=time_filter,
-                limit=max_pages * 100
-            )
-            
-            for submission in results:
-                row = self._process_submission(submission, combined_query)
-                if row:
-                    all_rows.append(row)
-            
-            # 2) Ricerche singole per prime 2 keyword
-            if len(keywords) >= 2:
-                for kw in keywords[:2]:
-                    results = self.reddit.subreddit(self.subreddit_name).search(
-                        query=kw,
-                        sort="top",
-                        time_filter=time_filter,
-                        limit=max_pages * 100
+        listings: queue.Queue = queue.Queue()
+        
+        def fetch(subreddit: str):
+            client = self._acquire_client()
+            try:
+                after = None
+                for _ in range(max_pages):
+                    started = time.perf_counter()
+                    listing = client.request(
+                        method="GET",
+                        path=f"r/{subreddit}/search",
+                        params=dict(params, after=after) if after else params
                     )
-                    
-                    for submission in results:
-                        row = self._process_submission(submission, kw)
-                        if row:
-                            all_rows.append(row)
-            
-            df = pd.DataFrame(all_rows)
+                    FETCH_SECONDS.labels(self.source_name).observe(time.perf_counter() - started)
+                    data = listing.get('data', {}) if isinstance(listing, dict) else {}
+                    listings.put((subreddit, data.get('children', [])))
+                    after = data.get('after')
+                    if not after:
+                        break
+            except Exception as e:
+                PIPELINE_ERRORS.labels('fetch').inc()
+                print(f"Reddit scraper error (r/{subreddit}): {e}")
+            finally:
+                self._release_client(client)
+                listings.put(None)
+        
+        workers = max(1, min(len(self.subreddits), settings.REDDIT_FETCH_WORKERS))
+        seen_ids = set()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for subreddit in self.subreddits:
+                executor.submit(fetch, subreddit)
             
-            if not df.empty:
-                # Rimuovi duplicati
-                df.drop_duplicates(subset=['source_id'], inplace=True)
+            pending = len(self.subreddits)
+            while pending:
+                item = listings.get()
+                if item is None:
+                    pending -= 1
+                    continue
                 
-                # Normalizza
-                df = self.normalize_output(df)
-                df = self.validate_dates(df, start_date, end_date)
-            
-            return df
-            
-        except Exception as e:
-            print(f"Reddit scraper error: {e}")
-            return pd.DataFrame()
+                subreddit, children = item
+                stats['api_calls'] += 1
+                page = []
+                for child in children:
+                    data = child.get('data') or {}
+                    stats['listed'] += 1
+                    if data.get('id') in seen_ids:
+                        stats['duplicates'] += 1
+                        ARTICLES_DUPLICATES.labels('scraper').inc()
+                        continue
+                    record = self._listing_to_record(data, subreddit, search_query)
+                    if record is None:
+                        stats['filtered'] += 1
+                        continue
+                    seen_ids.add(record.source_id)
+                    page.append(record)
+                
+                if page:
+                    stats['records'] += len(page)
+                    yield page
     
-    def _process_submission(self, submission, searched_keyword: str) -> Optional[dict]:
-        """Processa una submission Reddit"""
+    def _listing_to_record(
+        self,
+        data: dict,
+        subreddit: str,
+        searched_keyword: str
+    ) -> Optional[ArticleRecord]:
+        """Record dai campi di un figlio t3 del listing (None se filtrato)"""
         
-        if submission.ups < self.min_upvotes:
+        if (data.get('ups') or 0) < self.min_upvotes:
             return None
         
-        title = submission.title or ""
-        text = submission.selftext or ""
-        combined_text = f"{title} {text}"
-        word_count = len(combined_text.split())
+        title = data.get('title') or ""
+        text = data.get('selftext') or ""
+        word_count = len(title.split()) + len(text.split())
         
         if word_count > self.max_words:
             return None
         
-        return {
-            'searched_keyword': searched_keyword,
-            'title': title,
-            'content': text,
-            'published_at': datetime.fromtimestamp(submission.created_utc),
-            'source_id': submission.id,
-            'url': f"https://reddit.com{submission.permalink}",
-            'metadata': {
-                'author': submission.author.name if submission.author else "deleted",
-                'score': submission.score,
-                'upvotes': submission.ups,
-                'word_count': word_count
+        return self.make_record(
+            source_id=data['id'],
+            title=title,
+            content=text,
+            url=f"https://reddit.com{data.get('permalink', '')}",
+            published_at=datetime.fromtimestamp(data['created_utc']),
+            metadata={
+                'author': data.get('author') or "deleted",
+                'score': data.get('score', 0),
+                'upvotes': data.get('ups', 0),
+                'word_count': word_count,
+                'subreddit': data.get('subreddit') or subreddit,
+                'searched_keyword': searched_keyword,
             }
-        }
+        )
     
     def _get_time_filter(
         self,
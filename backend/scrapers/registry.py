@@ -1,13 +1,16 @@
 """
 Scraper Registry - gestisce tutti gli scraper disponibili
 """
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
 import pandas as pd
+from models.record import ArticleRecord
+from services.telemetry import ARTICLES_DUPLICATES, PIPELINE_ERRORS
 from .base_scraper import BaseScraper
 from .ansa_scraper import AnsaScraper
 from .reddit_scraper import RedditScraper
 from .hackernews_scraper import HackerNewsScraper
+from .http_client import http_client
 
 
 class ScraperRegistry:
@@ -59,6 +62,9 @@ class ScraperRegistry:
             if not scraper:
                 print(f"Warning: scraper '{source}' non trovato")
                 continue
+            if not http_client.is_available(scraper.source_name):
+                print(f"Skipping {source}: circuit breaker aperto")
+                continue
             
             print(f"Scraping {source}...")
             
@@ -75,7 +81,7 @@ class ScraperRegistry:
                     print(f"  -> {len(df)} articoli da {source}")
                 else:
                     print(f"  -> Nessun risultato da {source}")
-                    
+            
             except Exception as e:
                 print(f"Errore scraping {source}: {e}")
         
@@ -95,6 +101,47 @@ class ScraperRegistry:
         print(f"\nTotale: {len(combined_df)} articoli unici")
         
         return combined_df
+    
+    
+    def iter_all(
+        self,
+        query: str,
+        sources: Optional[List[str]] = None,
+        max_pages: int = 10,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[ArticleRecord]:
+        """
+        Versione streaming di scrape_all: record man mano che arrivano,
+        senza DataFrame intermedi; duplicati (source, source_id) saltati
+        """
+        if sources is None:
+            sources = self.list_sources()
+        
+        seen = set()
+        
+        for source in sources:
+            scraper = self.get_scraper(source)
+            if not scraper:
+                print(f"Warning: scraper '{source}' non trovato")
+                continue
+            if not http_client.is_available(scraper.source_name):
+                print(f"Skipping {source}: circuit breaker aperto")
+                continue
+            
+            print(f"Scraping {source} (streaming)...")
+            
+            try:
+                for record in scraper.iter_records(query, max_pages, start_date, end_date):
+                    key = (record.source, record.source_id)
+                    if key in seen:
+                        ARTICLES_DUPLICATES.labels('scraper').inc()
+                        continue
+                    seen.add(key)
+                    yield record
+            except Exception as e:
+                PIPELINE_ERRORS.labels('fetch').inc()
+                print(f"Errore scraping {source}: {e}")
 
 
 # Singleton instance
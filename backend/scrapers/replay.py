@@ -0,0 +1,275 @@
+"""
+Record/replay delle risposte HTTP degli scraper
+Transport adapter per requests: registrazione in una cassetta (JSONL gzip)
+e riproduzione offline con latenza e banda simulate
+"""
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .http_client import http_client
+
+# Header non significativi una volta decodificato il body
+DROPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie')
+
+# Il token OAuth di Reddit non deve finire nelle cassette
+REDACTED_BODIES = {
+    '/api/v1/access_token': b'{"access_token": "replay", "token_type": "bearer", "expires_in": 86400, "scope": "*"}',
+}
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Nessuna risposta registrata per la richiesta (replay strict)"""
+
+
+def canonical_url(url: str) -> str:
+    """URL con query string ordinata: stessa chiave a prescindere dall'ordine dei parametri"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ''))
+
+
+class Cassette:
+    """
+    Interazioni registrate, indicizzate per (metodo, URL canonico)
+    
+    Più risposte per la stessa richiesta vengono riprodotte in ordine;
+    l'ultima resta valida per le richieste successive.
+    """
+    
+    def __init__(self, interactions: Optional[Iterable[dict]] = None):
+        self.interactions: List[dict] = []
+        self._index: Dict[tuple, List[dict]] = {}
+        self._served: Dict[tuple, int] = {}
+        self._lock = threading.Lock()
+        for interaction in interactions or ():
+            self.add(**interaction)
+    
+    def add(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes
+    ):
+        if isinstance(body, str):
+            body = base64.b64decode(body)
+        interaction = {
+            'method': method.upper(),
+            'url': canonical_url(url),
+            'status': status,
+            'headers': {k.lower(): v for k, v in headers.items() if k.lower() not in DROPPED_HEADERS},
+            'body': body,
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self._index.setdefault((interaction['method'], interaction['url']), []).append(interaction)
+    
+    def lookup(self, method: str, url: str) -> Optional[dict]:
+        key = (method.upper(), canonical_url(url))
+        with self._lock:
+            responses = self._index.get(key)
+            if not responses:
+                return None
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            return responses[min(served, len(responses) - 1)]
+    
+    def rewind(self):
+        with self._lock:
+            self._served.clear()
+    
+    def save(self, path: str):
+        """Una riga JSON per interazione, body in base64, file gzip"""
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(dict(
+                    interaction,
+                    body=base64.b64encode(interaction['body']).decode('ascii')
+                )) + '\n')
+    
+    @classmethod
+    def load(cls, path: str) -> 'Cassette':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls(json.loads(line) for line in f if line.strip())
+    
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+def _build_response(
+    request: requests.PreparedRequest,
+    status: int,
+    headers: Dict[str, str],
+    body: bytes
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    response.reason = 'OK' if status < 400 else 'Replay'
+    return response
+
+
+class RecordingAdapter(HTTPAdapter):
+    """HTTPAdapter reale che salva ogni risposta (body già decodificato) nella cassetta"""
+    
+    def __init__(self, cassette: Cassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+    
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        body = response.content
+        path = urlsplit(request.url).path
+        self.cassette.add(
+            request.method,
+            request.url,
+            response.status_code,
+            dict(response.headers),
+            REDACTED_BODIES.get(path, body)
+        )
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Serve le risposte dalla cassetta senza rete
+    
+    latency: secondi per richiesta (più jitter uniforme)
+    throughput: byte/s per il body (None = illimitato)
+    generator: funzione (request) -> (status, headers, body) per le richieste
+               non registrate (es. sorgenti sintetiche), None = miss
+    strict: su miss solleva CassetteMiss invece di rispondere 404
+    """
+    
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throughput: Optional[float] = None,
+        generator: Optional[Callable] = None,
+        strict: bool = True,
+        seed: int = 0
+    ):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.throughput = throughput
+        self.generator = generator
+        self.strict = strict
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'served': 0, 'generated': 0, 'misses': 0, 'bytes': 0}
+    
+    def send(self, request, **kwargs):
+        interaction = self.cassette.lookup(request.method, request.url)
+        if interaction is not None:
+            status, headers, body = interaction['status'], interaction['headers'], interaction['body']
+            self.stats['served'] += 1
+        elif self.generator is not None:
+            status, headers, body = self.generator(request)
+            self.stats['generated'] += 1
+        else:
+            self.stats['misses'] += 1
+            if self.strict:
+                raise CassetteMiss(f"no recorded response for {request.method} {request.url}", request=request)
+            status, headers, body = 404, {}, b''
+        
+        self.stats['bytes'] += len(body)
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.throughput:
+            delay += len(body) / self.throughput
+        if delay > 0:
+            time.sleep(delay)
+        
+        return _build_response(request, status, headers, body)
+    
+    def close(self):
+        pass
+
+
+@contextmanager
+def mount_adapter(sessions: Iterable[requests.Session], adapter: BaseAdapter):
+    """Monta l'adapter su http(s):// delle session, ripristinando quelli originali"""
+    sessions = list(sessions)
+    saved = [dict(session.adapters) for session in sessions]
+    try:
+        for session in sessions:
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        yield adapter
+    finally:
+        for session, adapters in zip(sessions, saved):
+            session.adapters.clear()
+            session.adapters.update(adapters)
+
+
+def scraper_sessions(registry=None) -> List[requests.Session]:
+    """Session usate dagli scraper: http_client condiviso + quelle dei client PRAW"""
+    sessions = [http_client.session]
+    if registry is not None:
+        reddit = registry.get_scraper('reddit')
+        if reddit is not None:
+            sessions.extend(reddit.sessions())
+    return sessions
+
+
+@contextmanager
+def use_cassette(
+    path: Optional[str] = None,
+    mode: str = 'replay',
+    registry=None,
+    bypass_cache: bool = True,
+    **replay_options
+):
+    """
+    Record o replay per tutti gli scraper
+        
+        with use_cassette('ansa_hn.jsonl.gz', mode='record', registry=scraper_registry):
+            list(scraper_registry.iter_all('ai'))
+        
+        with use_cassette('ansa_hn.jsonl.gz', latency=0.08, throughput=2e6) as adapter:
+            run_streaming_ingest('ai')
+    
+    In replay `path` può mancare se si passa `generator` (solo sintetico).
+    bypass_cache disattiva la cache su disco dell'http_client: ogni
+    richiesta arriva all'adapter (numeri ripetibili tra un run e l'altro).
+    """
+    if mode == 'record':
+        cassette = Cassette()
+        adapter = RecordingAdapter(cassette)
+    elif mode == 'replay':
+        cassette = Cassette.load(path) if path else Cassette()
+        adapter = ReplayAdapter(cassette, **replay_options)
+    else:
+        raise ValueError(f"unknown cassette mode '{mode}'")
+    
+    saved_cache = http_client.cache
+    if bypass_cache:
+        http_client.cache = None
+    try:
+        with mount_adapter(scraper_sessions(registry), adapter):
+            yield adapter
+    finally:
+        http_client.cache = saved_cache
+        if mode == 'record' and path:
+            cassette.save(path)
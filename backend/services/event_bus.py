@@ -0,0 +1,197 @@
+"""
+Event Bus
+Pub/sub in-process per gli aggiornamenti live della dashboard (/api/stream)
+
+I job pubblicano eventi compatti (articoli nuovi per fonte, metriche dei
+topic cambiate, refresh completato) da qualsiasi thread; ogni client SSE
+ha una coda limitata sul proprio event loop. Un client che resta indietro
+non fa crescere la memoria: la sua coda viene svuotata e riceve un solo
+evento 'resync' (ricaricare lo stato via REST). Gli ultimi eventi restano
+in uno storico per riprendere dopo una riconnessione (Last-Event-ID).
+Con Redis l'id è assegnato una volta alla pubblicazione (INCR condiviso):
+un client che si riconnette a un altro worker riprende dalla stessa sequenza.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from config import settings
+from services.telemetry import STREAM_CLIENTS, STREAM_EVENTS, STREAM_OVERFLOWS
+
+# redis opzionale: con STREAM_BACKEND=redis i job del worker leader
+# raggiungono i client connessi agli altri worker
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+REDIS_CHANNEL = 'pulse:events'
+REDIS_ID_KEY = 'pulse:events:last_id'
+
+
+class Event:
+    __slots__ = ('id', 'type', 'data')
+    
+    def __init__(self, event_id: int, event_type: str, data: Dict):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+    
+    def encode(self) -> bytes:
+        """Frame SSE (id, event, data su una riga)"""
+        data = json.dumps(self.data, separators=(',', ':'), default=str)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {data}\n\n".encode('utf-8')
+
+
+class Subscription:
+    """Coda limitata di un client, letta dal suo event loop"""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, types: Optional[Iterable[str]] = None):
+        self.loop = loop
+        self.types = set(types) if types else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.overflows = 0
+    
+    def offer(self, event: Event):
+        """Sul loop del client: accoda o, a coda piena, sostituisce tutto con 'resync'"""
+        if self.types is not None and event.type not in self.types and event.type != 'resync':
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(Event(event.id, 'resync', {'reason': 'client too slow'}))
+            self.overflows += 1
+            STREAM_OVERFLOWS.inc()
+    
+    async def get(self, timeout: float) -> Optional[Event]:
+        """Prossimo evento, None se non ne arrivano entro timeout (keep-alive)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBus:
+    """
+    Pubblicazione thread-safe, consegna sul loop di ogni client
+    
+    Il costo di un evento è una call_soon_threadsafe per client connesso:
+    senza eventi i client connessi non generano query né serializzazioni.
+    """
+    
+    def __init__(self, history_size: Optional[int] = None, buffer_size: Optional[int] = None, backend: Optional[str] = None):
+        self.buffer_size = buffer_size or settings.STREAM_CLIENT_BUFFER
+        self.backend = backend or settings.STREAM_BACKEND
+        self._history = deque(maxlen=history_size or settings.STREAM_HISTORY_SIZE)
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+        if self.backend == 'redis':
+            if redis is None:
+                print("⚠️  Event stream: redis not installed, events stay in this worker")
+                self.backend = 'memory'
+            else:
+                self._redis = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.5)
+    
+    @property
+    def clients(self) -> int:
+        return len(self._subscriptions)
+    
+    def publish(self, event_type: str, data: Dict):
+        """Da qualsiasi thread (job, pipeline di ingest, event loop)"""
+        if self._redis is not None:
+            try:
+                event_id = self._redis.incr(REDIS_ID_KEY)
+                payload = {'id': event_id, 'type': event_type, 'data': data}
+                self._redis.publish(REDIS_CHANNEL, json.dumps(payload, default=str))
+                return
+            except redis.RedisError as e:
+                print(f"⚠️  Event stream: redis publish failed ({e}), delivering locally")
+        self._dispatch(event_type, data)
+    
+    def _dispatch(self, event_type: str, data: Dict, event_id: Optional[int] = None):
+        """event_id dal publisher (Redis) o dal contatore locale"""
+        with self._lock:
+            if event_id is None:
+                event_id = self._last_id + 1
+            elif event_id != self._last_id + 1:
+                # Eventi persi (listener avviato tardi o riconnesso): lo storico non è più contiguo
+                self._history.clear()
+            self._last_id = event_id
+            event = Event(event_id, event_type, data)
+            self._history.append(event)
+            subscriptions = list(self._subscriptions)
+        STREAM_EVENTS.labels(event_type).inc()
+        
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:  # Loop chiuso: client non più servibile
+                self.unsubscribe(subscription)
+    
+    def subscribe(self, types: Optional[Iterable[str]] = None, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Nuovo client sul loop corrente
+        
+        Con last_event_id riceve prima gli eventi persi ancora nello storico,
+        oppure 'resync' se lo storico non arriva più così indietro o se l'id
+        è oltre l'ultimo visto qui (worker appena avviato, contatore diverso).
+        """
+        subscription = Subscription(asyncio.get_running_loop(), self.buffer_size, types)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            missed = []
+            if last_event_id is not None and last_event_id != self._last_id:
+                oldest = self._history[0].id if self._history else self._last_id + 1
+                if last_event_id > self._last_id or last_event_id + 1 < oldest:
+                    missed = [Event(self._last_id, 'resync', {'reason': 'history expired'})]
+                else:
+                    missed = [event for event in self._history if event.id > last_event_id]
+        STREAM_CLIENTS.inc()
+        
+        # Prima degli eventi pubblicati dopo la registrazione (call_soon_threadsafe)
+        for event in missed:
+            subscription.offer(event)
+        
+        if self._redis is not None:
+            self._start_listener()
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription not in self._subscriptions:
+                return
+            self._subscriptions.remove(subscription)
+        STREAM_CLIENTS.dec()
+    
+    def _start_listener(self):
+        """Thread che riceve gli eventi dal canale Redis (avviato col primo client del worker)"""
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(target=self._listen, name='event-bus-redis', daemon=True)
+        self._listener.start()
+    
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(REDIS_CHANNEL)
+                for message in pubsub.listen():
+                    payload = json.loads(message['data'])
+                    self._dispatch(payload['type'], payload['data'], payload.get('id'))
+            except redis.RedisError as e:
+                print(f"⚠️  Event stream: redis listener error ({e}), retrying")
+                time.sleep(1.0)
+
+
+# Singleton
+event_bus = EventBus()
@@ -0,0 +1,174 @@
+"""
+Export Service
+Export in streaming degli articoli (NDJSON, Arrow IPC, Parquet)
+
+Una sola query ordinata per id letta a blocchi con yield_per (cursore
+server-side su PostgreSQL): ogni blocco diventa un chunk NDJSON o un
+record batch Arrow/Parquet e viene liberato prima del successivo, quindi
+la memoria non dipende dalla dimensione dell'export.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence
+
+from config import settings
+from models.article import Article
+from models.database import ReadSessionLocal
+from services.serialization import dumps
+
+# pyarrow opzionale: senza, solo NDJSON
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    ARROW_AVAILABLE = False
+
+
+# Colonne esportabili (embedding_vector escluso: pesante e interno al clustering)
+EXPORT_FIELDS = (
+    'id', 'source', 'source_id', 'title', 'content', 'url', 'published_at', 'scraped_at',
+    'country', 'language', 'sector', 'topic_id', 'engagement_score', 'authority_score',
+    'sentiment_score', 'raw_metadata',
+)
+FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def _arrow_type(field: str):
+    if field == 'id':
+        return pa.int64()
+    if field in ('published_at', 'scraped_at'):
+        return pa.timestamp('us')
+    if field in ('engagement_score', 'authority_score', 'sentiment_score'):
+        return pa.float64()
+    return pa.string()  # raw_metadata come testo JSON
+
+
+class _ChunkSink:
+    """File-like per i writer pyarrow: accumula i byte scritti fino al prossimo drain()"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """Righe filtrate -> chunk di byte nel formato richiesto"""
+    
+    def iter_batches(
+        self,
+        fields: Sequence[str] = EXPORT_FIELDS,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        source: Optional[str] = None,
+        topic_id: Optional[str] = None,
+        language: Optional[str] = None,
+        country: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List[tuple]]:
+        """
+        Blocchi di tuple (una per articolo, colonne in ordine `fields`)
+        
+        Query per colonne (niente oggetti ORM) ordinata per chiave primaria:
+        nessun sort su published_at e nessun OFFSET tra un blocco e l'altro.
+        """
+        batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+        db = ReadSessionLocal()  # Engine di lettura (replica se configurata)
+        try:
+            query = db.query(*[getattr(Article, field) for field in fields])
+            if start_date:
+                query = query.filter(Article.published_at >= start_date)
+            if end_date:
+                query = query.filter(Article.published_at <= end_date)
+            if source:
+                query = query.filter(Article.source == source)
+            if topic_id:
+                query = query.filter(Article.topic_id == topic_id)
+            if language:
+                query = query.filter(Article.language == language)
+            if country:
+                query = query.filter(Article.country == country)
+            
+            result = db.execute(query.order_by(Article.id).statement.execution_options(yield_per=batch_size))
+            for partition in result.partitions():
+                yield [tuple(row) for row in partition]
+        finally:
+            db.close()
+    
+    def ndjson(self, batches: Iterator[List[tuple]], fields: Sequence[str]) -> Iterator[bytes]:
+        """Un oggetto JSON per riga, un chunk per blocco"""
+        for rows in batches:
+            yield b''.join(dumps(dict(zip(fields, row))) + b'\n' for row in rows)
+    
+    def arrow(self, batches: Iterator[List[tuple]], fields: Sequence[str], parquet: bool = False) -> Iterator[bytes]:
+        """Record batch Arrow IPC (stream) o row group Parquet, uno per blocco"""
+        schema = pa.schema([(field, _arrow_type(field)) for field in fields])
+        sink = _ChunkSink()
+        if parquet:
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+        
+        raw_metadata = fields.index('raw_metadata') if 'raw_metadata' in fields else None
+        try:
+            for rows in batches:
+                columns = [list(column) for column in zip(*rows)]
+                if raw_metadata is not None:
+                    columns[raw_metadata] = [
+                        json.dumps(value, ensure_ascii=False) if value is not None else None
+                        for value in columns[raw_metadata]
+                    ]
+                writer.write_batch(pa.record_batch(columns, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()  # Footer Parquet / fine stream Arrow
+    
+    def export(self, format: str, fields: Sequence[str], gzip: bool = False, **filters) -> Iterator[bytes]:
+        """Chunk di byte pronti per una StreamingResponse"""
+        batches = self.iter_batches(fields, **filters)
+        if format == 'ndjson':
+            chunks = self.ndjson(batches, fields)
+        else:
+            chunks = self.arrow(batches, fields, parquet=(format == 'parquet'))
+        return _gzip(chunks) if gzip else chunks
+
+
+def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """File gzip scritto un chunk alla volta (wbits=31: header e trailer gzip)"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_filename(format: str, gzip: bool = False) -> str:
+    name = f"articles-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{FORMATS[format][1]}"
+    return name + '.gz' if gzip else name
+
+
+# Singleton
+export_service = ExportService()
@@ -0,0 +1,196 @@
+"""
+Forecast Service
+Previsione 24-48h delle traiettorie dei topic con exponential smoothing vettorizzato
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import settings
+
+
+# Griglia parametri: SES (beta=0), Holt (phi=1), damped trend (phi<1)
+ALPHA_GRID = (0.2, 0.5, 0.8)
+BETA_GRID = (0.1, 0.3)
+PHI_DAMPED = 0.9
+
+MODEL_NAMES = ('ses', 'holt', 'damped')
+MODEL_PARAMS = {'ses': 1, 'holt': 2, 'damped': 3}
+
+
+def _build_param_grid() -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Espande la griglia in vettori (alpha, beta, phi, model_index) di lunghezza P"""
+    rows = []
+    for alpha in ALPHA_GRID:
+        rows.append((alpha, 0.0, 1.0, 0))
+        for beta in BETA_GRID:
+            rows.append((alpha, beta, 1.0, 1))
+            rows.append((alpha, beta, PHI_DAMPED, 2))
+    grid = np.array(rows, dtype=np.float64)
+    return grid[:, 0], grid[:, 1], grid[:, 2], grid[:, 3].astype(np.int64)
+
+
+class ForecastService:
+    """Forecasting batch di tutti i topic su una matrice (topics x ore)"""
+
+    def __init__(self):
+        self.alpha, self.beta, self.phi, self.model_index = _build_param_grid()
+        self.last_run_stats: Dict[str, float] = {}
+
+    def build_hourly_matrix(
+        self,
+        timestamps_by_topic: Sequence[Sequence[Optional[datetime]]],
+        history_hours: int,
+        now: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Costruisce la matrice dei conteggi orari (topics x history_hours)
+
+        L'ultima colonna è l'ora che termina in `now`.
+        """
+        now = now or datetime.utcnow()
+        start = now - timedelta(hours=history_hours)
+
+        topic_idx = []
+        offsets = []
+        for i, timestamps in enumerate(timestamps_by_topic):
+            for ts in timestamps:
+                if ts is None or ts < start or ts >= now:
+                    continue
+                topic_idx.append(i)
+                offsets.append((ts - start).total_seconds())
+
+        n_topics = len(timestamps_by_topic)
+        if not topic_idx:
+            return np.zeros((n_topics, history_hours), dtype=np.float64)
+
+        hour_idx = (np.asarray(offsets) // 3600).astype(np.int64)
+        flat = np.asarray(topic_idx, dtype=np.int64) * history_hours + hour_idx
+        counts = np.bincount(flat, minlength=n_topics * history_hours)
+        return counts.reshape(n_topics, history_hours).astype(np.float64)
+
+    def fit(self, Y: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Fit di SES/Holt/damped per tutte le righe di Y in parallelo
+
+        La ricorsione scorre sulle ore; ogni passo aggiorna un array
+        (parametri x topics), quindi il costo Python è O(ore) e non O(topics).
+
+        Returns:
+            dict con level, trend, phi e indice modello scelto per ogni topic
+        """
+        n_topics, n_hours = Y.shape
+        alpha = self.alpha[:, None]
+        beta = self.beta[:, None]
+        phi = self.phi[:, None]
+
+        level = np.broadcast_to(Y[:, 0], (len(self.alpha), n_topics)).copy()
+        if n_hours > 1:
+            trend = np.where(beta > 0, Y[:, 1] - Y[:, 0], 0.0)
+        else:
+            trend = np.zeros_like(level)
+        sse = np.zeros_like(level)
+
+        for t in range(1, n_hours):
+            y_t = Y[:, t]
+            damped = phi * trend
+            err = y_t - (level + damped)
+            sse += err * err
+            new_level = level + damped + alpha * err
+            trend = beta * (new_level - level) + (1.0 - beta) * damped
+            level = new_level
+
+        # Selezione modello per topic via AIC (penalizza i parametri extra)
+        k = np.array([MODEL_PARAMS[name] for name in MODEL_NAMES])[self.model_index]
+        n_obs = max(n_hours - 1, 1)
+        aic = n_obs * np.log(sse / n_obs + 1e-9) + 2 * k[:, None]
+        best = np.argmin(aic, axis=0)
+        cols = np.arange(n_topics)
+
+        return {
+            'level': level[best, cols],
+            'trend': trend[best, cols],
+            'phi': self.phi[best],
+            'model_index': self.model_index[best],
+        }
+
+    def forecast(self, Y: np.ndarray, horizon: int) -> Dict[str, np.ndarray]:
+        """
+        Previsione oraria per le prossime `horizon` ore
+
+        Returns:
+            dict con 'forecast' (topics x horizon, >= 0) e 'model' (nome per topic)
+        """
+        if Y.size == 0:
+            return {
+                'forecast': np.zeros((Y.shape[0], horizon)),
+                'model': np.array([], dtype=object)
+            }
+
+        fitted = self.fit(Y)
+        steps = np.arange(1, horizon + 1)
+        # Somma cumulativa phi + phi^2 + ... + phi^h per ciascun topic
+        phi_powers = fitted['phi'][:, None] ** steps[None, :]
+        damping = np.cumsum(phi_powers, axis=1)
+        forecast = fitted['level'][:, None] + damping * fitted['trend'][:, None]
+
+        return {
+            'forecast': np.clip(forecast, 0.0, None),
+            'model': np.array(MODEL_NAMES, dtype=object)[fitted['model_index']]
+        }
+
+    def forecast_topics(
+        self,
+        topics: List,
+        timestamps_by_topic: Sequence[Sequence[Optional[datetime]]],
+        now: Optional[datetime] = None
+    ) -> Dict[str, float]:
+        """
+        Calcola forecast_volume/forecast_velocity e li scrive sui Topic
+
+        Args:
+            topics: Topic objects (già con volume aggiornato)
+            timestamps_by_topic: published_at degli articoli, allineati a topics
+
+        Returns:
+            dict con topics, elapsed_ms, ms_per_topic
+        """
+        started = time.perf_counter()
+        horizon = settings.FORECAST_HORIZON_HOURS
+
+        Y = self.build_hourly_matrix(
+            timestamps_by_topic,
+            history_hours=settings.FORECAST_HISTORY_HOURS,
+            now=now
+        )
+        result = self.forecast(Y, horizon)
+        forecast_volumes = result['forecast'].sum(axis=1)
+
+        for topic, forecast_volume, model in zip(topics, forecast_volumes, result['model']):
+            current = topic.volume or 0
+            forecast_volume = round(float(forecast_volume), 2)
+
+            # Stessa convenzione di MetricsService.calculate_velocity
+            if current == 0:
+                forecast_velocity = 1.0 if forecast_volume > 0 else 0.0
+            else:
+                forecast_velocity = round((forecast_volume - current) / current, 2)
+
+            topic.forecast_volume = forecast_volume
+            topic.forecast_velocity = forecast_velocity
+            topic.forecast_model = str(model)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.last_run_stats = {
+            'topics': len(topics),
+            'horizon_hours': horizon,
+            'elapsed_ms': round(elapsed_ms, 3),
+            'ms_per_topic': round(elapsed_ms / len(topics), 4) if topics else 0.0
+        }
+        return self.last_run_stats
+
+
+# Singleton instance
+forecast_service = ForecastService()
@@ -0,0 +1,162 @@
+"""
+Geo Matcher
+Automa Aho-Corasick su token per il riconoscimento di luoghi nel testo
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Token = sequenze di lettere/cifre Unicode: i confini di parola sono impliciti,
+# quindi 'uk' non matcha dentro 'ukraine' e 'usa' non matcha dentro 'causa'
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class GeoMatcher:
+    """
+    Matcher multi-pattern per nomi geografici (anche multi-parola)
+
+    L'automa lavora su token invece che su caratteri: ogni testo viene
+    scansionato una sola volta, con costo indipendente dal numero di nomi
+    nel gazetteer.
+    """
+
+    def __init__(self, keywords: Optional[Dict[str, Iterable[str]]] = None):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        self.size = 0
+
+        for country, names in (keywords or {}).items():
+            for name in names:
+                self.add(name, country)
+        self.build()
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        base: Optional[Dict[str, Iterable[str]]] = None
+    ) -> "GeoMatcher":
+        """
+        Carica un gazetteer da file, unito alle keyword `base`
+
+        Formati supportati:
+            .json  {"ITA": ["roma", "milano", ...], ...}
+            .tsv   una riga per nome: "<nome>\\t<country code>"
+        """
+        keywords: Dict[str, List[str]] = {
+            country: list(names) for country, names in (base or {}).items()
+        }
+
+        if path.endswith('.json'):
+            with open(path, encoding='utf-8') as f:
+                for country, names in json.load(f).items():
+                    keywords.setdefault(country, []).extend(names)
+        else:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    name, _, country = line.rpartition('\t')
+                    if name and country:
+                        keywords.setdefault(country.strip(), []).append(name)
+
+        return cls(keywords)
+
+    def add(self, name: str, country: str):
+        """Aggiunge un nome (richiede build() prima di match)"""
+        tokens = TOKEN_PATTERN.findall(name.lower())
+        if not tokens:
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][token] = next_state
+            state = next_state
+
+        if country not in self._out[state]:
+            self._out[state] += (country,)
+            self.size += 1
+
+    def build(self):
+        """Calcola i failure link (BFS) e propaga gli output"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(token, 0)
+                inherited = self._out[self._fail[child]]
+                if inherited:
+                    self._out[child] += tuple(
+                        c for c in inherited if c not in self._out[child]
+                    )
+
+    def scan(self, text: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Scansiona il testo una volta
+
+        Returns:
+            {country: (numero match, posizione token del primo match)}
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        root = goto[0]
+
+        matches: Dict[str, Tuple[int, int]] = {}
+        state = 0
+
+        for position, token in enumerate(TOKEN_PATTERN.findall(text.lower())):
+            if state == 0 and token not in root:
+                continue
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+
+            for country in out[state]:
+                count, first = matches.get(country, (0, position))
+                matches[country] = (count + 1, first)
+
+        return matches
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Numero di match per paese"""
+        return {country: count for country, (count, _) in self.scan(text).items()}
+
+    def best_match(self, text: str) -> Optional[str]:
+        """
+        Paese più citato; a parità vince quello citato per primo
+        (il titolo precede il testo, quindi pesa di più)
+        """
+        matches = self.scan(text)
+        if not matches:
+            return None
+        return min(matches.items(), key=lambda item: (-item[1][0], item[1][1]))[0]
+
+
+def load_geo_matcher(
+    base: Dict[str, Iterable[str]],
+    path: Optional[str] = None
+) -> GeoMatcher:
+    """Matcher da gazetteer su file se presente, altrimenti solo da `base`"""
+    if path and os.path.exists(path):
+        return GeoMatcher.from_file(path, base=base)
+    return GeoMatcher(base)
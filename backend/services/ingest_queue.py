@@ -0,0 +1,234 @@
+"""
+Ingest Queue
+Coda asyncio limitata tra scraper (produttori) e storage (consumer a micro-batch)
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from config import settings
+from models.record import ArticleRecord
+from services.processing_service import processing_service
+from services.storage_service import storage_service
+from services.telemetry import ARTICLES_FETCHED, INGEST_DROPPED_RECORDS, INGEST_LAG_SECONDS, INGEST_QUEUE_DEPTH
+
+
+def process_and_save(records: List[ArticleRecord]) -> int:
+    """Parse/enrich/dedup e salvataggio bulk di un micro-batch (eseguito in un thread)"""
+    result = processing_service.process_records(records)
+    if result['errors']:
+        print(f"  ⚠️  {result['errors']} articles failed processing")
+    return storage_service.save_records(result['articles'])
+
+
+class IngestQueue:
+    """
+    Batch di record in attesa di essere salvati
+    
+    put() attende quando la coda è piena: gli scraper rallentano invece di
+    accumulare pagine in memoria. Il consumer raccoglie batch finché non
+    arriva a flush_records record o sono passati flush_seconds dal primo,
+    poi processa e salva in un thread (l'event loop resta libero).
+    Un flush fallito viene ritentato con backoff esponenziale (il dedup per
+    source_id rende sicuro ripetere un batch salvato a metà); dopo
+    flush_retries tentativi i record sono contati come scartati.
+    """
+    
+    def __init__(
+        self,
+        max_batches: Optional[int] = None,
+        flush_records: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        store: Callable[[List[ArticleRecord]], int] = process_and_save,
+        flush_retries: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None
+    ):
+        self.max_batches = max_batches or settings.INGEST_QUEUE_MAX_BATCHES
+        self.flush_records = flush_records or settings.INGEST_FLUSH_RECORDS
+        self.flush_seconds = flush_seconds if flush_seconds is not None else settings.INGEST_FLUSH_SECONDS
+        self.store = store
+        self.flush_retries = flush_retries if flush_retries is not None else settings.INGEST_FLUSH_RETRIES
+        self.retry_backoff_seconds = (
+            retry_backoff_seconds if retry_backoff_seconds is not None else settings.INGEST_RETRY_BACKOFF_SECONDS
+        )
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._enqueued_at: deque = deque()  # Un timestamp per batch in coda o in flush
+        self._pending_records = 0
+        self._listeners: List[Callable[[Dict], None]] = []
+        self.stats = {
+            'enqueued_batches': 0,
+            'enqueued_records': 0,
+            'flushes': 0,
+            'saved': 0,
+            'errors': 0,
+            'flush_retries': 0,
+            'dropped': 0,
+            'max_depth': 0,
+            'producer_waits': 0,
+            'producer_wait_seconds': 0.0,
+            'last_lag_seconds': None,
+            'max_lag_seconds': 0.0,
+            'last_flush': None,
+            'last_error': None,
+        }
+    
+    @property
+    def running(self) -> bool:
+        return self._consumer is not None and not self._consumer.done()
+    
+    def start(self):
+        """Avvia il consumer sul loop corrente (idempotente)"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_batches)
+        self._enqueued_at.clear()
+        self._pending_records = 0
+        self._consumer = self._loop.create_task(self._consume())
+    
+    async def join(self):
+        """Attende che tutto ciò che è in coda sia stato salvato"""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def stop(self, timeout: Optional[float] = None):
+        """Svuota la coda (al massimo `timeout` secondi) e ferma il consumer"""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️  Ingest queue stopped with {self._queue.qsize()} batches pending")
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
+    
+    def on_flush(self, listener: Callable[[Dict], None]):
+        """listener(info) dopo ogni micro-batch salvato (info: records, saved, lag_seconds, depth)"""
+        self._listeners.append(listener)
+    
+    def is_saturated(self) -> bool:
+        return self._queue is not None and self._queue.full()
+    
+    async def put(self, source: str, records: List[ArticleRecord]):
+        """Accoda un batch; se la coda è piena attende che il consumer liberi spazio"""
+        if not records:
+            return
+        self.start()
+        
+        if self._queue.full():
+            self.stats['producer_waits'] += 1
+            started = time.monotonic()
+            await self._queue.put((source, records))
+            self.stats['producer_wait_seconds'] += time.monotonic() - started
+        else:
+            self._queue.put_nowait((source, records))
+        
+        self._enqueued_at.append(time.monotonic())
+        self._pending_records += len(records)
+        self.stats['enqueued_batches'] += 1
+        self.stats['enqueued_records'] += len(records)
+        self.stats['max_depth'] = max(self.stats['max_depth'], self._queue.qsize())
+        ARTICLES_FETCHED.labels(source).inc(len(records))
+        INGEST_QUEUE_DEPTH.set(self._queue.qsize())
+    
+    def put_threadsafe(self, source: str, records: List[ArticleRecord]):
+        """put() da un thread produttore: blocca il thread finché il batch non entra in coda"""
+        if self._loop is None or not self.running:
+            raise RuntimeError("ingest queue not started")
+        asyncio.run_coroutine_threadsafe(self.put(source, records), self._loop).result()
+    
+    async def _consume(self):
+        while True:
+            batches = [await self._queue.get()]
+            count = len(batches[0][1])
+            deadline = time.monotonic() + self.flush_seconds
+            
+            # Micro-batch: fino a flush_records record o flush_seconds di attesa
+            while count < self.flush_records:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batches.append(item)
+                count += len(item[1])
+            
+            try:
+                await self._flush(batches, count)
+            finally:
+                for _ in batches:
+                    self._enqueued_at.popleft()
+                    self._queue.task_done()
+    
+    async def _flush(self, batches: List[tuple], count: int):
+        records = [record for _, batch in batches for record in batch]
+        lag = time.monotonic() - self._enqueued_at[0]
+        
+        try:
+            attempt = 0
+            while True:
+                try:
+                    saved = await asyncio.to_thread(self.store, records)
+                    break
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    self.stats['last_error'] = str(e)
+                    if attempt >= self.flush_retries:
+                        self.stats['dropped'] += count
+                        INGEST_DROPPED_RECORDS.inc(count)
+                        print(f"❌ Ingest flush failed ({count} records dropped after {attempt + 1} attempts): {e}")
+                        return
+                    delay = self.retry_backoff_seconds * 2 ** attempt
+                    print(f"⚠️  Ingest flush failed ({count} records), retry in {delay:.1f}s: {e}")
+                    self.stats['flush_retries'] += 1
+                    attempt += 1
+                    await asyncio.sleep(delay)
+        finally:
+            self._pending_records -= count
+        
+        self.stats['flushes'] += 1
+        self.stats['saved'] += saved
+        self.stats['last_lag_seconds'] = round(lag, 3)
+        self.stats['max_lag_seconds'] = round(max(self.stats['max_lag_seconds'], lag), 3)
+        self.stats['last_flush'] = time.time()
+        INGEST_LAG_SECONDS.observe(lag)
+        INGEST_QUEUE_DEPTH.set(self._queue.qsize())
+        
+        info = {
+            'records': count,
+            'saved': saved,
+            'lag_seconds': round(lag, 3),
+            'depth': self._queue.qsize(),
+        }
+        for listener in self._listeners:
+            try:
+                listener(info)
+            except Exception as e:
+                print(f"⚠️  Ingest listener error: {e}")
+    
+    def snapshot(self) -> Dict:
+        """Profondità, record in attesa e lag (età del batch più vecchio non salvato)"""
+        oldest = self._enqueued_at[0] if self._enqueued_at else None
+        return dict(
+            self.stats,
+            running=self.running,
+            depth=self._queue.qsize() if self._queue is not None else 0,
+            capacity=self.max_batches,
+            pending_records=self._pending_records,
+            lag_seconds=round(time.monotonic() - oldest, 3) if oldest is not None else 0.0,
+            producer_wait_seconds=round(self.stats['producer_wait_seconds'], 3),
+        )
+
+
+# Singleton
+ingest_queue = IngestQueue()
@@ -2,9 +2,30 @@
 Language Detection Service
 Detecta lingua e georeferenziazione degli articoli
 """
-from typing import Optional, Dict
-from langdetect import detect, LangDetectException
+from typing import Optional, Dict, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from langdetect import detect, DetectorFactory, LangDetectException
+import hashlib
+import os
 import re
+import sys
+from config import settings
+from models.record import ArticleRecord
+from services.geo_matcher import load_geo_matcher
+
+# langdetect campiona n-gram a caso: con seed fisso lo stesso testo
+# produce sempre la stessa lingua
+DetectorFactory.seed = 0
+
+# Pattern: sequenze di 2+ parole capitalize
+ENTITY_PATTERN = re.compile(r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b')
+LOCATION_KEYWORDS = ('city', 'country', 'province', 'region', 'state')
+
+
+def _enrich_chunk(pairs: List[Tuple[str, str]]) -> List[Tuple]:
+    """Worker per ProcessPoolExecutor: enrichment di (title, text) senza cache"""
+    return [language_service._compute_enrichment(title, text) for title, text in pairs]
 
 
 class LanguageService:
@@ -28,16 +49,28 @@ class LanguageService:
         'CHN': ['china', 'beijing', 'chinese', 'shanghai'],
     }
     
+    def __init__(self):
+        # Automa geo: GEO_KEYWORDS + gazetteer su file (migliaia di nomi, una sola scansione)
+        self.geo_matcher = load_geo_matcher(self.GEO_KEYWORDS, settings.GEO_GAZETTEER_PATH)
+        
+        # Cache LRU: hash(title, text) -> (language, country, entities)
+        self._cache: OrderedDict = OrderedDict()
+        self.cache_size = settings.LANGUAGE_CACHE_SIZE
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
     def detect_language(self, text: str) -> Optional[str]:
         """
         Detecta la lingua del testo
+        Usa solo i primi LANGDETECT_MAX_CHARS caratteri: bastano per il
+        profilo n-gram e langdetect è lineare nella lunghezza del testo
         Returns: ISO 639-1 code (it, en, de, etc.)
         """
         if not text or len(text.strip()) < 10:
             return None
         
         try:
-            lang = detect(text)
+            lang = detect(text[:settings.LANGDETECT_MAX_CHARS])
             return lang
         except LangDetectException:
             return None
@@ -53,11 +86,10 @@ class LanguageService:
         Returns: ISO 3166-1 alpha-3 code (ITA, USA, etc.)
         """
         # Step 1: Check keywords geografiche nel titolo/testo
-        combined_text = f"{title} {text}".lower()
-        
-        for country_code, keywords in self.GEO_KEYWORDS.items():
-            if any(kw in combined_text for kw in keywords):
-                return country_code
+        # (match a parola intera, vince il paese più citato)
+        country_code = self.geo_matcher.best_match(f"{title} {text}")
+        if country_code:
+            return country_code
         
         # Step 2: Fallback su lingua
         if language:
@@ -76,15 +108,11 @@ class LanguageService:
         }
         
         # Estrai capitalized words (potenziali entità)
-        # Pattern: sequenze di 2+ parole capitalize
-        pattern = r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b'
-        matches = re.findall(pattern, text)
+        matches = ENTITY_PATTERN.findall(text)
         
         # Filtro base: locations se contengono keyword comuni
-        location_keywords = ['city', 'country', 'province', 'region', 'state']
-        
         for match in matches:
-            if any(kw in match.lower() for kw in location_keywords):
+            if any(kw in match.lower() for kw in LOCATION_KEYWORDS):
                 entities['locations'].append(match)
             else:
                 entities['organizations'].append(match)
@@ -95,28 +123,151 @@ class LanguageService:
         
         return entities
     
+    def _compute_enrichment(self, title: str, text: str) -> Tuple:
+        """Calcola (language, country, entities) senza passare dalla cache"""
+        language = self.detect_language(text)
+        country = self.detect_country(text, title, language)
+        entities = self.extract_entities(f"{title}. {text}")
+        return language, country, entities
+    
+    @staticmethod
+    def _content_key(title: str, text: str) -> bytes:
+        """Hash del contenuto: la stessa storia da fonti/cicli diversi ha la stessa chiave"""
+        payload = f"{title}\x00{text}".encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[Tuple]:
+        result = self._cache.get(key)
+        if result is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        return result
+    
+    def _cache_put(self, key: bytes, result: Tuple):
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    @staticmethod
+    def _apply(article_data: dict, result: Tuple) -> dict:
+        language, country, entities = result
+        article_data['language'] = language
+        article_data['country'] = country
+        # Copia: articoli con lo stesso contenuto non condividono le liste
+        article_data['entities'] = {k: list(v) for k, v in entities.items()}
+        return article_data
+    
     def enrich_article(self, article_data: dict) -> dict:
         """
         Arricchisce l'articolo con language, country, entities
         """
-        text = article_data.get('content', '')
-        title = article_data.get('title', '')
+        text = article_data.get('content') or ''
+        title = article_data.get('title') or ''
         
-        # Detect language
-        language = self.detect_language(text)
+        key = self._content_key(title, text)
+        result = self._cache_get(key)
+        if result is None:
+            result = self._compute_enrichment(title, text)
+            self._cache_put(key, result)
         
-        # Detect country
-        country = self.detect_country(text, title, language)
+        return self._apply(article_data, result)
+    
+    def _enrich_batch(
+        self,
+        pairs: List[Tuple[str, str]],
+        workers: Optional[int] = None
+    ) -> List[Tuple]:
+        """
+        Risultati (language, country, entities) allineati a pairs (title, text)
         
-        # Extract entities
-        entities = self.extract_entities(f"{title}. {text}")
+        - contenuti identici nel batch vengono analizzati una sola volta
+        - i risultati sono in cache tra una chiamata e l'altra
+        - sopra LANGUAGE_POOL_THRESHOLD testi nuovi si usa un process pool
+        """
+        keys = []
+        resolved: Dict[bytes, Tuple] = {}
+        pending: Dict[bytes, Tuple[str, str]] = {}
         
-        # Aggiungi al dict
-        article_data['language'] = language
-        article_data['country'] = country
-        article_data['entities'] = entities
+        for title, text in pairs:
+            key = self._content_key(title, text)
+            keys.append(key)
+            
+            if key in resolved or key in pending:
+                continue
+            cached = self._cache_get(key)
+            if cached is not None:
+                resolved[key] = cached
+            else:
+                pending[key] = (title, text)
         
-        return article_data
+        if pending:
+            todo = list(pending.values())
+            
+            if workers is None:
+                workers = settings.LANGUAGE_POOL_WORKERS or os.cpu_count() or 1
+            
+            if workers > 1 and len(todo) >= settings.LANGUAGE_POOL_THRESHOLD:
+                chunk_size = max(1, len(todo) // (workers * 4))
+                chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = [r for chunk in executor.map(_enrich_chunk, chunks) for r in chunk]
+            else:
+                results = [self._compute_enrichment(title, text) for title, text in todo]
+            
+            for key, (language, country, entities) in zip(pending.keys(), results):
+                # Interning: poche lingue/paesi distinti su batch molto grandi
+                result = (
+                    sys.intern(language) if language else language,
+                    sys.intern(country) if country else country,
+                    entities
+                )
+                resolved[key] = result
+                self._cache_put(key, result)
+        
+        return [resolved[key] for key in keys]
+    
+    def enrich_articles(
+        self,
+        articles: List[dict],
+        workers: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Enrichment batch di una lista di articoli (modificati in place)
+        
+        Args:
+            articles: dict con almeno title e content
+            workers: processi per il pool (None = LANGUAGE_POOL_WORKERS, 0 = seriale)
+        
+        Returns:
+            La stessa lista, arricchita
+        """
+        pairs = [
+            (article_data.get('title') or '', article_data.get('content') or '')
+            for article_data in articles
+        ]
+        for article_data, result in zip(articles, self._enrich_batch(pairs, workers)):
+            self._apply(article_data, result)
+        
+        return articles
+    
+    def enrich_records(
+        self,
+        records: List[ArticleRecord],
+        workers: Optional[int] = None
+    ) -> List[ArticleRecord]:
+        """
+        Come enrich_articles ma su ArticleRecord (modificati in place)
+        """
+        pairs = [(record.title or '', record.content or '') for record in records]
+        for record, (language, country, entities) in zip(records, self._enrich_batch(pairs, workers)):
+            record.language = language
+            record.country = country
+            record.entities = {k: list(v) for k, v in entities.items()}
+        
+        return records
 
 
 # Singleton instance
@@ -2,12 +2,17 @@
 Metrics Service
 Calcola i 6 Pulse Metrics per ogni topic
 """
+import time
 from typing import List, Dict
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from models.topic import Topic
 from models.article import Article
 from models.database import SessionLocal
+from services.forecast_service import forecast_service
+from services.event_bus import event_bus
+from services.response_cache import invalidate_responses
+from services.telemetry import METRICS_REFRESH_SECONDS
 
 
 # Authority scores per fonte (0.0 - 1.0)
@@ -21,6 +26,9 @@ AUTHORITY_SCORES = {
     'default': 0.5
 }
 
+# Campi dei topic inviati nell'evento live 'topics' quando cambiano
+LIVE_FIELDS = ('pulse_score', 'volume', 'velocity', 'spread', 'novelty', 'forecast_velocity')
+
 
 class MetricsService:
     """Servizio per calcolare Pulse Metrics"""
@@ -230,6 +238,7 @@ class MetricsService:
             topic.pulse_score = pulse_score
             topic.last_updated = datetime.utcnow()
             db.commit()
+            invalidate_responses('topics')
         
         return metrics
     
@@ -245,6 +254,7 @@ class MetricsService:
         Returns:
             int: numero di topic aggiornati
         """
+        started = time.perf_counter()
         should_close = False
         if db is None:
             db = SessionLocal()
@@ -253,8 +263,11 @@ class MetricsService:
         try:
             # Query tutti i topic
             topics = db.query(Topic).all()
+            before = {topic.topic_id: self._live_metrics(topic) for topic in topics}
             
             updated_count = 0
+            updated_topics = []
+            timestamps_by_topic = []
             
             for topic in topics:
                 # Query articoli del topic
@@ -266,13 +279,42 @@ class MetricsService:
                     # Calcola e aggiorna metrics
                     self.calculate_all_metrics(topic, articles, db)
                     updated_count += 1
+                    updated_topics.append(topic)
+                    timestamps_by_topic.append([art.published_at for art in articles])
+            
+            # Forecast batch su tutti i topic in una sola passata
+            if updated_topics:
+                stats = forecast_service.forecast_topics(updated_topics, timestamps_by_topic)
+                db.commit()
+                invalidate_responses('topics')
+                changed = []
+                for topic in updated_topics:
+                    metrics = self._live_metrics(topic)
+                    if metrics != before[topic.topic_id]:
+                        changed.append({'topic_id': topic.topic_id, **metrics})
+                if changed:
+                    event_bus.publish('topics', {'topics': changed})
+                print(
+                    f"🔮 Forecast {stats['horizon_hours']}h for {stats['topics']} topics "
+                    f"in {stats['elapsed_ms']:.1f}ms ({stats['ms_per_topic']:.3f}ms/topic)"
+                )
             
+            METRICS_REFRESH_SECONDS.observe(time.perf_counter() - started)
             print(f"✅ Updated metrics for {updated_count} topics")
             return updated_count
-            
+        
         finally:
             if should_close:
                 db.close()
+    
+    @staticmethod
+    def _live_metrics(topic: Topic) -> Dict[str, float]:
+        """Metriche arrotondate: variazioni sotto la precisione mostrata non generano eventi"""
+        metrics = {}
+        for field in LIVE_FIELDS:
+            value = getattr(topic, field)
+            metrics[field] = round(value, 2) if isinstance(value, float) else value
+        return metrics
 
 
 # Singleton instance
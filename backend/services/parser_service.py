@@ -3,12 +3,66 @@ Parser and Normalizer Service
 Standardizes scraped articles before database storage
 """
 import re
+import sys
+import html
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Iterable
 import pandas as pd
 from bs4 import BeautifulSoup
 from difflib import SequenceMatcher
+from config import settings
 from models import ArticleCreate
+from models.record import ArticleRecord
+
+# Parser HTML veloci opzionali (fallback su BeautifulSoup)
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:
+    SelectolaxParser = None
+
+try:
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+# Un tag vero e proprio: '<' seguito da lettera, '/' o '!' ("3 < 5" non è markup)
+MARKUP_PATTERN = re.compile(r'<[A-Za-z/!]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# \w copre già tutte le lettere Unicode; in più si tengono i segni diacritici
+# combinanti (indiano, thai, arabo, ...) e la punteggiatura tipografica
+DISALLOWED_CHARS_PATTERN = re.compile(
+    r"[^\w\s.,!?;:()\-'\"%€$’‘“”«»–—…"
+    r"\u0300-\u036f\u0483-\u0489\u0591-\u05c7\u0610-\u061a\u064b-\u065f\u0670"
+    r"\u06d6-\u06ed\u0900-\u0dff\u0e00-\u0eff\u1ab0-\u1aff\u1dc0-\u1dff"
+    r"\u20d0-\u20ff\ufe20-\ufe2f]"
+)
+# Contenuto da scartare (non è testo dell'articolo)
+DROP_TAGS = ('script', 'style', 'noscript', 'template')
+
+
+def _extract_text(markup: str, engine: str) -> str:
+    """Estrae il testo visibile da HTML con il parser più veloce disponibile"""
+    if engine in ('auto', 'selectolax') and SelectolaxParser is not None:
+        tree = SelectolaxParser(markup)
+        tree.strip_tags(list(DROP_TAGS))
+        root = tree.body or tree.root
+        return root.text(separator=' ', strip=True) if root is not None else ''
+    
+    if engine in ('auto', 'lxml') and lxml_html is not None:
+        try:
+            root = lxml_html.fragment_fromstring(markup, create_parent='div')
+        except Exception:
+            root = None
+        if root is not None:
+            for element in list(root.iter(*DROP_TAGS)):
+                element.drop_tree()
+            return ' '.join(root.itertext())
+    
+    soup = BeautifulSoup(markup, 'html.parser')
+    for element in soup(DROP_TAGS):
+        element.decompose()
+    return soup.get_text(separator=' ', strip=True)
 
 
 class ParserService:
@@ -16,22 +70,49 @@ class ParserService:
     
     @staticmethod
     def clean_html(text: str) -> str:
-        """Remove HTML tags and clean text"""
+        """
+        Remove HTML tags and clean text
+        
+        Testo senza markup salta il parser (solo unescape delle entità);
+        per HTML reale usa selectolax/lxml se installati, altrimenti BeautifulSoup
+        """
         if not text:
             return ""
         
-        # Parse with BeautifulSoup
-        soup = BeautifulSoup(text, 'html.parser')
-        text = soup.get_text(separator=' ', strip=True)
+        if MARKUP_PATTERN.search(text):
+            text = _extract_text(text, settings.HTML_CLEANER_ENGINE)
+        elif '&' in text:
+            text = html.unescape(text)
         
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
+        # Remove special characters but keep letters and punctuation
+        text = DISALLOWED_CHARS_PATTERN.sub('', text)
         
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:()\-\'"àèéìòùÀÈÉÌÒÙäöüÄÖÜßñÑ]', '', text)
+        # Remove extra whitespace
+        text = WHITESPACE_PATTERN.sub(' ', text)
         
         return text.strip()
     
+    @staticmethod
+    def clean_many(texts: Iterable[Optional[str]]) -> List[str]:
+        """
+        Batch di clean_html: stringhe ripetute (titoli cross-source,
+        boilerplate) vengono pulite una volta sola
+        """
+        cleaned: Dict[str, str] = {}
+        results = []
+        
+        for text in texts:
+            if not text:
+                results.append("")
+                continue
+            result = cleaned.get(text)
+            if result is None:
+                result = ParserService.clean_html(text)
+                cleaned[text] = result
+            results.append(result)
+        
+        return results
+    
     @staticmethod
     def normalize_date(date_input) -> Optional[datetime]:
         """
@@ -43,9 +124,13 @@ class ParserService:
         Returns:
             datetime object or None
         """
-        if date_input is None:
+        if date_input is None or date_input is pd.NaT:
             return None
         
+        # Timestamp pandas (da DataFrame/to_dict) -> datetime nativo
+        if isinstance(date_input, pd.Timestamp):
+            return date_input.to_pydatetime()
+        
         # Already datetime
         if isinstance(date_input, datetime):
             return date_input
@@ -88,6 +173,9 @@ class ParserService:
             Structured metadata dict
         """
         metadata = raw_article.get('metadata', {})
+        if not isinstance(metadata, dict):
+            # Celle vuote di un DataFrame arrivano come NaN
+            metadata = {}
         
         # Source-specific metadata handling
         if source == 'reddit':
@@ -96,7 +184,7 @@ class ParserService:
                 'score': metadata.get('score', 0),
                 'upvotes': metadata.get('upvotes', 0),
                 'word_count': metadata.get('word_count', 0),
-                'subreddit': 'italy',
+                'subreddit': metadata.get('subreddit', 'unknown'),
             }
         elif source == 'hackernews':
             return {
@@ -111,16 +199,12 @@ class ParserService:
         return metadata
     
     @staticmethod
-    def normalize_article(raw_article: Dict, source: str) -> ArticleCreate:
+    def normalize_fields(raw_article: Dict, source: str) -> Dict:
         """
-        Normalize a raw article into ArticleCreate model
+        Normalize a raw article into a plain dict of ArticleCreate fields
         
-        Args:
-            raw_article: Dict with keys: title, content, published_at, url, source_id, metadata
-            source: Source name
-        
-        Returns:
-            ArticleCreate instance ready for DB insertion
+        Stessa logica di normalize_article senza validazione Pydantic:
+        usato dagli stage batch/paralleli che validano solo al salvataggio
         """
         # Clean text fields
         title = ParserService.clean_html(raw_article.get('title', ''))
@@ -134,16 +218,48 @@ class ParserService:
         # Extract metadata
         raw_metadata = ParserService.extract_metadata(raw_article, source)
         
-        # Create ArticleCreate instance
-        return ArticleCreate(
-            source=source,
-            source_id=raw_article.get('source_id', ''),
-            title=title,
-            content=content,
-            url=raw_article.get('url'),
-            published_at=published_at,
-            raw_metadata=raw_metadata
+        return {
+            'source': source,
+            'source_id': str(raw_article.get('source_id') or ''),
+            'title': title,
+            'content': content,
+            'url': raw_article.get('url'),
+            'published_at': published_at,
+            'raw_metadata': raw_metadata
+        }
+    
+    @staticmethod
+    def normalize_record(record: ArticleRecord) -> ArticleRecord:
+        """
+        Normalize in place an ArticleRecord coming from a scraper
+        
+        Stesse regole di normalize_fields, senza dict intermedi né Pydantic;
+        la fonte è internata (poche stringhe distinte su milioni di record)
+        """
+        source = sys.intern(record.source or 'unknown')
+        record.source = source
+        record.source_id = str(record.source_id or '')
+        record.title = ParserService.clean_html(record.title)
+        record.content = ParserService.clean_html(record.content)
+        record.published_at = ParserService.normalize_date(record.published_at)
+        record.raw_metadata = ParserService.extract_metadata(
+            {'metadata': record.raw_metadata}, source
         )
+        return record
+    
+    @staticmethod
+    def normalize_article(raw_article: Dict, source: str) -> ArticleCreate:
+        """
+        Normalize a raw article into ArticleCreate model
+        
+        Args:
+            raw_article: Dict with keys: title, content, published_at, url, source_id, metadata
+            source: Source name
+        
+        Returns:
+            ArticleCreate instance ready for DB insertion
+        """
+        return ArticleCreate(**ParserService.normalize_fields(raw_article, source))
     
     @staticmethod
     def similarity_ratio(text1: str, text2: str) -> float:
@@ -207,7 +323,8 @@ class ParserService:
         """
         articles = []
         
-        for _, row in df.iterrows():
+        # to_dict('records') evita la costruzione di una Series per riga
+        for row in df.to_dict('records'):
             try:
                 source = row.get('source', 'unknown')
                 
@@ -0,0 +1,174 @@
+"""
+Processing Service
+Stage parallelo parse -> clean -> dedup hash -> language enrichment
+"""
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from models.record import ArticleRecord
+from services.parser_service import ParserService
+from services.language_service import language_service
+from services.telemetry import ARTICLES_DUPLICATES, PIPELINE_ERRORS, STAGE_SECONDS
+
+
+# Limite errori riportati per esteso (il conteggio resta completo)
+MAX_ERROR_SAMPLES = 20
+
+
+def _content_hash(title: str, content: str) -> str:
+    """Hash del testo normalizzato: stesso articolo con source_id diversi/mancanti"""
+    normalized = " ".join(f"{title} {content}".lower().split())
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=12).hexdigest()
+
+
+def _process_chunk(
+    chunk: Tuple[int, List[ArticleRecord]]
+) -> Tuple[List[Tuple[int, ArticleRecord]], List[Tuple[int, str]], Dict[str, float]]:
+    """
+    Worker: processa un blocco di record dello scraper (modificati in place)
+
+    Returns:
+        (record con indice di input, errori (index, messaggio), secondi per stage)
+    """
+    offset, records = chunk
+    parsed = []
+    errors = []
+    started = time.perf_counter()
+
+    for i, record in enumerate(records):
+        try:
+            ParserService.normalize_record(record)
+        except Exception as e:
+            errors.append((offset + i, f"parse: {e}"))
+            continue
+        if not record.source_id:
+            record.source_id = _content_hash(record.title, record.content or '')
+        parsed.append((offset + i, record))
+
+    parsed_at = time.perf_counter()
+
+    # Enrichment batch nel processo (cache per processo, nessun pool annidato)
+    language_service.enrich_records([record for _, record in parsed], workers=0)
+
+    # Tempi restituiti al padre: le metriche dei worker del pool andrebbero perse
+    timings = {'parse': parsed_at - started, 'enrich': time.perf_counter() - parsed_at}
+    return parsed, errors, timings
+
+
+def _observe_stages(timings: Dict[str, float]):
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def _intern(record: ArticleRecord) -> ArticleRecord:
+    """Re-interning dopo il pickling dei worker (ogni blocco ha le sue copie)"""
+    record.source = sys.intern(record.source)
+    if record.language:
+        record.language = sys.intern(record.language)
+    if record.country:
+        record.country = sys.intern(record.country)
+    return record
+
+
+class ProcessingService:
+    """Servizio per il processing (parallelo) dei batch scrapati"""
+
+    def process_records(
+        self,
+        records: List[ArticleRecord],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Dict:
+        """
+        Parse, pulizia, dedup ed enrichment di una lista di record dello scraper
+
+        I blocchi vengono distribuiti su un ProcessPoolExecutor; l'ordine dei
+        risultati segue quello dell'input. In modalità seriale i record sono
+        modificati in place, senza copie né validazione Pydantic.
+
+        Args:
+            records: ArticleRecord prodotti dagli scraper
+            workers: processi (None = PROCESSING_WORKERS o os.cpu_count(), <=1 = seriale)
+            chunk_size: record per blocco (None = automatico)
+
+        Returns:
+            dict con articles (ArticleRecord), duplicates, errors, error_samples, elapsed_s
+        """
+        started = time.perf_counter()
+        total = len(records)
+
+        if workers is None:
+            workers = settings.PROCESSING_WORKERS or os.cpu_count() or 1
+        if total < settings.PROCESSING_POOL_THRESHOLD:
+            workers = 1
+        if chunk_size is None:
+            chunk_size = max(100, -(-total // (max(workers, 1) * 4)))
+
+        chunks = [
+            (offset, records[offset:offset + chunk_size])
+            for offset in range(0, total, chunk_size)
+        ]
+
+        processed: List[Tuple[int, ArticleRecord]] = []
+        errors: List[Tuple[int, str]] = []
+        pooled = workers > 1 and len(chunks) > 1
+
+        if pooled:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_process_chunk, chunk) for chunk in chunks]
+                for (offset, chunk_records), future in zip(chunks, futures):
+                    try:
+                        chunk_result, chunk_errors, timings = future.result()
+                    except Exception as e:
+                        # Worker morto: tutto il blocco conta come errore
+                        chunk_errors = [(offset + i, f"worker: {e}") for i in range(len(chunk_records))]
+                        chunk_result, timings = [], {}
+                    processed.extend(chunk_result)
+                    errors.extend(chunk_errors)
+                    _observe_stages(timings)
+        else:
+            for chunk in chunks:
+                chunk_result, chunk_errors, timings = _process_chunk(chunk)
+                processed.extend(chunk_result)
+                errors.extend(chunk_errors)
+                _observe_stages(timings)
+
+        # Dedup nel batch su (source, source_id), mantenendo la prima occorrenza
+        seen = set()
+        articles = []
+        duplicates = 0
+        for _, record in processed:
+            dedup_key = (record.source, record.source_id)
+            if dedup_key in seen:
+                duplicates += 1
+                continue
+            seen.add(dedup_key)
+            articles.append(_intern(record) if pooled else record)
+
+        errors.sort()
+        elapsed = time.perf_counter() - started
+        if duplicates:
+            ARTICLES_DUPLICATES.labels('batch').inc(duplicates)
+        if errors:
+            PIPELINE_ERRORS.labels('parse').inc(len(errors))
+
+        return {
+            'articles': articles,
+            'total': total,
+            'duplicates': duplicates,
+            'errors': len(errors),
+            'error_samples': [
+                {'index': index, 'error': message} for index, message in errors[:MAX_ERROR_SAMPLES]
+            ],
+            'workers': workers,
+            'elapsed_s': round(elapsed, 3)
+        }
+
+
+# Singleton instance
+processing_service = ProcessingService()
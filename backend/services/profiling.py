@@ -0,0 +1,356 @@
+"""
+Profiling
+Profilo campionato dei job (cProfile o pyinstrument) con conteggio e tempi
+delle query SQL, salvato come artifact in PROFILING_DIR
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config import settings
+
+# pyinstrument opzionale: albero delle chiamate più leggibile di cProfile
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+
+# Funzioni e statement SQL riportati nel sommario JSON
+TOP_FUNCTIONS = 40
+TOP_STATEMENTS = 25
+STATEMENT_MAX_CHARS = 300
+
+# Liste di placeholder espanse (IN ...) ridotte: stessa query, stessa riga
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:\?|%\(\w+\)s|:\w+)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def normalize_statement(statement: str) -> str:
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _PLACEHOLDER_LIST.sub('(?, ...)', statement)
+    return statement[:STATEMENT_MAX_CHARS]
+
+
+class ProfileSession:
+    """
+    Profilo di un run: un profiler per thread, statement SQL dei thread profilati
+    
+    Il thread che apre la sessione con thread() è profilato; i thread worker
+    del job (es. uno per fonte nello scraping) usano anche loro thread() e
+    i loro profili vengono uniti a fine run. Una sessione disabilitata
+    (run non campionato) accetta le stesse chiamate e non misura nulla.
+    """
+    
+    def __init__(self, job: str, directory: Optional[str] = None, engine: Optional[str] = None, enabled: bool = True):
+        self.job = job
+        self.enabled = enabled
+        self.directory = directory
+        self.engine = engine or settings.PROFILING_ENGINE
+        if self.engine == 'pyinstrument' and PyinstrumentProfiler is None:
+            self.engine = 'cprofile'
+        self.profile_id = f"{job}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+        self.report: Optional[Dict] = None
+        
+        self._started = time.perf_counter()
+        self._started_at = datetime.now()
+        self._lock = threading.Lock()
+        self._threads = set()
+        self._stats: Optional[pstats.Stats] = None
+        self._trees: List[str] = []
+        self._sql = defaultdict(lambda: [0, 0.0, 0.0])  # statement -> [count, total_s, max_s]
+    
+    def captures(self, thread_id: int) -> bool:
+        return thread_id in self._threads
+    
+    @contextmanager
+    def thread(self):
+        """Profila il thread corrente fino all'uscita dal blocco"""
+        if not self.enabled or self.captures(threading.get_ident()):
+            yield self
+            return
+        
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._threads.add(thread_id)
+        
+        if self.engine == 'pyinstrument':
+            profiler = PyinstrumentProfiler(async_mode='disabled')
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            yield self
+        finally:
+            if self.engine == 'pyinstrument':
+                profiler.stop()
+                tree = profiler.output_text(unicode=True, color=False)
+            else:
+                profiler.disable()
+            with self._lock:
+                self._threads.discard(thread_id)
+                if self.engine == 'pyinstrument':
+                    self._trees.append(tree)
+                elif self._stats is None:
+                    self._stats = pstats.Stats(profiler)
+                else:
+                    self._stats.add(profiler)
+    
+    def record_sql(self, statement: str, seconds: float):
+        entry = self._sql[normalize_statement(statement)]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] = max(entry[2], seconds)
+    
+    def finish(self) -> Optional[Dict]:
+        """Chiude la sessione e salva gli artifact (.json, .prof o .txt)"""
+        if not self.enabled:
+            return None
+        
+        statements = sorted(self._sql.items(), key=lambda item: item[1][1], reverse=True)
+        self.report = {
+            'id': self.profile_id,
+            'job': self.job,
+            'engine': self.engine,
+            'started': self._started_at.isoformat(),
+            'duration_s': round(time.perf_counter() - self._started, 3),
+            'sql': {
+                'statements': sum(entry[0] for _, entry in statements),
+                'distinct': len(statements),
+                'total_s': round(sum(entry[1] for _, entry in statements), 4),
+                'top': [
+                    {
+                        'statement': statement,
+                        'count': count,
+                        'total_s': round(total, 4),
+                        'max_s': round(slowest, 4),
+                    }
+                    for statement, (count, total, slowest) in statements[:TOP_STATEMENTS]
+                ],
+            },
+            'functions': self._top_functions(),
+            'artifacts': [],
+        }
+        
+        if self.directory:
+            self._save()
+        return self.report
+    
+    def _top_functions(self) -> List[Dict]:
+        if self._stats is None:
+            return []
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in self._stats.stats.items():
+            if filename.startswith(_BACKEND_DIR):
+                filename = os.path.relpath(filename, _BACKEND_DIR)
+            rows.append({
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'total_s': round(tottime, 4),
+                'cumulative_s': round(cumtime, 4),
+            })
+        rows.sort(key=lambda row: row['cumulative_s'], reverse=True)
+        return rows[:TOP_FUNCTIONS]
+    
+    def _save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.profile_id)
+        
+        if self._stats is not None:
+            self._stats.dump_stats(base + '.prof')  # snakeviz / pstats
+            self.report['artifacts'].append(self.profile_id + '.prof')
+        if self._trees:
+            with open(base + '.txt', 'w') as f:
+                f.write('\n\n'.join(self._trees))
+            self.report['artifacts'].append(self.profile_id + '.txt')
+        
+        with open(base + '.json', 'w') as f:
+            json.dump(self.report, f, indent=2)
+    
+    def summary(self) -> str:
+        """Riepilogo testuale (log dei job, output dei test)"""
+        if self.report is None:
+            return ''
+        sql = self.report['sql']
+        lines = [
+            f"⏱️  Profile {self.report['id']}: {self.report['duration_s']}s, "
+            f"{sql['statements']} SQL statements ({sql['distinct']} distinct, {sql['total_s']}s)"
+        ]
+        for row in self.report['functions'][:5]:
+            lines.append(f"   {row['cumulative_s']:>8.3f}s  {row['function']}")
+        return '\n'.join(lines)
+
+
+class JobProfiler:
+    """
+    Decide quali run profilare e conserva gli artifact
+    
+    Un run è profilato se PROFILING_ENABLED e il job è in PROFILING_JOBS (con
+    probabilità PROFILING_SAMPLE_RATE), oppure se è stato armato con arm():
+    il marker è un file nella directory degli artifact, così lo vede anche
+    il worker leader che esegue i job.
+    """
+    
+    def __init__(self, directory: Optional[str] = None):
+        self._directory = directory
+        self._active: List[ProfileSession] = []
+        self._active_lock = threading.Lock()
+        self._engines = set()
+        self._info_key = f"profile_started_{id(self)}"  # Un profiler, una pila per connessione
+    
+    @property
+    def directory(self) -> str:
+        return self._directory or settings.PROFILING_DIR or os.path.join(settings.DATA_DIR, 'profiles')
+    
+    def arm(self, job: str):
+        """Profila il prossimo run di `job` indipendentemente dal campionamento"""
+        os.makedirs(self.directory, exist_ok=True)
+        open(os.path.join(self.directory, f"{job}.armed"), 'w').close()
+    
+    def _claim(self, job: str) -> bool:
+        try:
+            os.remove(os.path.join(self.directory, f"{job}.armed"))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def should_sample(self, job: str) -> bool:
+        if self._claim(job):
+            return True
+        return (
+            settings.PROFILING_ENABLED
+            and job in settings.PROFILING_JOBS
+            and random.random() < settings.PROFILING_SAMPLE_RATE
+        )
+    
+    def capture_sql(self, engine):
+        """Statement e tempi SQL di `engine` attribuiti alle sessioni dei thread che li eseguono"""
+        if id(engine) in self._engines:
+            return
+        from sqlalchemy import event
+        
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _before(conn, cursor, statement, parameters, context, executemany):
+            if self._active:
+                conn.info.setdefault(self._info_key, []).append(time.perf_counter())
+        
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _after(conn, cursor, statement, parameters, context, executemany):
+            pending = conn.info.get(self._info_key)
+            if not pending:
+                return
+            seconds = time.perf_counter() - pending.pop()
+            thread_id = threading.get_ident()
+            for session in list(self._active):
+                if session.captures(thread_id):
+                    session.record_sql(statement, seconds)
+        
+        @event.listens_for(engine, 'handle_error')
+        def _error(context):
+            pending = context.connection.info.get(self._info_key) if context.connection is not None else None
+            if pending:
+                pending.pop()
+        
+        self._engines.add(id(engine))
+    
+    @contextmanager
+    def session(self, job: str, force: bool = False, directory: Optional[str] = None):
+        """
+        Sessione di un run (disabilitata se il run non è campionato)
+        
+        Non profila nessun thread da sola: chi esegue il lavoro usa session.thread().
+        """
+        enabled = force or self.should_sample(job)
+        session = ProfileSession(job, directory or self.directory, enabled=enabled)
+        if enabled:
+            from models.database import engine
+            self.capture_sql(engine)
+            with self._active_lock:
+                self._active.append(session)
+        try:
+            yield session
+        finally:
+            if enabled:
+                with self._active_lock:
+                    self._active.remove(session)
+                session.finish()
+                self._prune(session.directory)
+                print(session.summary())
+    
+    @contextmanager
+    def profile(self, job: str, force: bool = False, directory: Optional[str] = None):
+        """session() + profilo del thread corrente (job sincroni)"""
+        with self.session(job, force, directory) as session, session.thread():
+            yield session
+    
+    def _prune(self, directory: str):
+        """Tiene gli ultimi PROFILING_KEEP profili (tutti i job)"""
+        # Id = {job}-{YYYYmmdd-HHMMSS-ffffff}: ordine per timestamp, non per nome del job
+        reports = sorted(
+            (name for name in os.listdir(directory) if name.endswith('.json')),
+            key=lambda name: name[:-len('.json')].rsplit('-', 3)[1:]
+        )
+        for name in reports[:-settings.PROFILING_KEEP] if settings.PROFILING_KEEP else []:
+            stem = name[:-len('.json')]
+            for suffix in ('.json', '.prof', '.txt'):
+                try:
+                    os.remove(os.path.join(directory, stem + suffix))
+                except FileNotFoundError:
+                    pass
+    
+    def list_profiles(self, job: Optional[str] = None) -> List[Dict]:
+        """Sommari salvati, dal più recente (senza l'elenco delle funzioni)"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            report = self.load(name[:-len('.json')])
+            if report is None or (job and report['job'] != job):
+                continue
+            report.pop('functions', None)
+            report['sql'].pop('top', None)
+            profiles.append(report)
+        profiles.sort(key=lambda report: report['started'], reverse=True)
+        return profiles
+    
+    def load(self, profile_id: str) -> Optional[Dict]:
+        path = self.artifact_path(profile_id + '.json')
+        if path is None:
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def artifact_path(self, name: str) -> Optional[str]:
+        """Path di un artifact (None se il nome esce dalla directory o non esiste)"""
+        if os.path.basename(name) != name:
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+def format_stats(path: str, limit: int = 30) -> str:
+    """Tabella pstats di un artifact .prof ordinata per tempo cumulativo"""
+    output = io.StringIO()
+    pstats.Stats(path, stream=output).sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
+
+
+# Singleton
+job_profiler = JobProfiler()
@@ -0,0 +1,292 @@
+"""
+Response Cache
+Cache delle risposte GET di topic e stats con ETag forti e 304
+
+La chiave contiene la versione dei namespace da cui dipende la route
+('topics', 'articles'): refresh, salvataggio articoli e cleanup
+incrementano la versione e le entry vecchie non vengono più lette (poi
+escono per LRU/TTL). Le entry stanno in un LRU in-process; con
+RESPONSE_CACHE_BACKEND=redis versioni ed entry sono anche su Redis,
+condivise tra i worker uvicorn. Con le letture su una replica
+(DATABASE_READ_URL) la cache è disattivata.
+"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import Match
+
+from config import settings
+from services.telemetry import RESPONSE_CACHE_REQUESTS
+
+# redis opzionale: senza, versioni ed entry restano nel processo
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+# Route GET in cache (template FastAPI) -> namespace che le invalidano
+CACHED_ROUTES = {
+    '/api/topics': ('topics',),
+    '/api/topics/{topic_id}': ('topics',),
+    '/api/topics/{topic_id}/articles': ('topics',),
+    '/api/stats/overview': ('articles',),
+    '/api/stats/sources': ('articles',),
+    '/api/stats/languages': ('articles',),
+    '/api/stats/countries': ('articles',),
+}
+
+REDIS_PREFIX = 'pulse:response_cache'
+
+
+class CachedResponse:
+    """Risposta 200 serializzata: header (senza ETag) e body"""
+    
+    __slots__ = ('headers', 'body', 'etag', 'expires')
+    
+    def __init__(self, headers: List[Tuple[bytes, bytes]], body: bytes, etag: Optional[str] = None, expires: float = 0.0):
+        self.headers = headers
+        self.body = body
+        self.etag = etag or '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.expires = expires
+    
+    def dumps(self) -> bytes:
+        head = json.dumps({
+            'etag': self.etag,
+            'headers': [[k.decode('latin-1'), v.decode('latin-1')] for k, v in self.headers],
+        })
+        return head.encode('utf-8') + b'\n' + self.body
+    
+    @classmethod
+    def loads(cls, data: bytes, expires: float) -> 'CachedResponse':
+        head, body = data.split(b'\n', 1)
+        meta = json.loads(head)
+        headers = [(k.encode('latin-1'), v.encode('latin-1')) for k, v in meta['headers']]
+        return cls(headers, body, meta['etag'], expires)
+
+
+class ResponseCache:
+    """
+    LRU in-process con versioni per namespace, Redis opzionale
+    
+    Senza Redis le versioni sono locali al processo: con più worker un
+    worker che non ha eseguito il job vede i dati nuovi al più dopo
+    RESPONSE_CACHE_TTL_SECONDS.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None, backend: Optional[str] = None):
+        self.max_entries = max_entries or settings.RESPONSE_CACHE_MAX_ENTRIES
+        self.ttl = ttl if ttl is not None else settings.RESPONSE_CACHE_TTL_SECONDS
+        self.backend = backend or settings.RESPONSE_CACHE_BACKEND
+        self._entries: OrderedDict = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._redis = None
+        if self.backend == 'redis':
+            if redis is None:
+                print("⚠️  Response cache: redis not installed, using in-process cache")
+                self.backend = 'memory'
+            else:
+                self._redis = redis.Redis.from_url(
+                    settings.REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+                )
+    
+    @property
+    def remote(self) -> bool:
+        """True se le chiamate fanno I/O di rete (da eseguire fuori dall'event loop)"""
+        return self._redis is not None
+    
+    def versions(self, namespaces: Iterable[str]) -> str:
+        namespaces = list(namespaces)
+        if self._redis is not None:
+            try:
+                values = self._redis.mget([f"{REDIS_PREFIX}:version:{ns}" for ns in namespaces])
+                return '.'.join(f"{ns}{int(value or 0)}" for ns, value in zip(namespaces, values))
+            except redis.RedisError as e:
+                print(f"⚠️  Response cache: redis unavailable ({e})")
+                return ''  # Chiave non valida: la richiesta non usa la cache
+        with self._lock:
+            return '.'.join(f"{ns}{self._versions.get(ns, 0)}" for ns in namespaces)
+    
+    def invalidate(self, *namespaces: str):
+        """Nuova versione dei namespace: le risposte che ne dipendono non sono più servite"""
+        with self._lock:
+            for ns in namespaces:
+                self._versions[ns] = self._versions.get(ns, 0) + 1
+        if self._redis is not None:
+            try:
+                pipe = self._redis.pipeline()
+                for ns in namespaces:
+                    pipe.incr(f"{REDIS_PREFIX}:version:{ns}")
+                pipe.execute()
+            except redis.RedisError as e:
+                print(f"⚠️  Response cache: invalidation of {', '.join(namespaces)} not shared ({e})")
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self._entries.move_to_end(key)
+                    return entry
+                del self._entries[key]
+        
+        if self._redis is None:
+            return None
+        try:
+            data = self._redis.get(f"{REDIS_PREFIX}:entry:{key}")
+        except redis.RedisError:
+            return None
+        if data is None:
+            return None
+        entry = CachedResponse.loads(data, now + self.ttl)
+        self._store_local(key, entry)
+        return entry
+    
+    def put(self, key: str, entry: CachedResponse):
+        entry.expires = time.monotonic() + self.ttl
+        self._store_local(key, entry)
+        if self._redis is not None:
+            try:
+                self._redis.set(f"{REDIS_PREFIX}:entry:{key}", entry.dumps(), ex=max(1, int(self.ttl)))
+            except redis.RedisError:
+                pass
+    
+    def _store_local(self, key: str, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Confronto debole di If-None-Match (RFC 9110): W/ ignorato, * = qualsiasi"""
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+class ResponseCacheMiddleware:
+    """
+    Middleware ASGI: risposte di CACHED_ROUTES servite dalla cache
+    
+    La route si risolve qui (stesso matching del router) e viene messa in
+    scope, così MetricsMiddleware etichetta anche le hit col template.
+    Risposte diverse da 200 non vengono messe in cache.
+    """
+    
+    def __init__(self, app, router, cache: Optional[ResponseCache] = None):
+        self.app = app
+        self.router = router
+        self.cache = cache or response_cache
+    
+    def _match(self, scope):
+        for route in self.router.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return route, child_scope
+        return None, None
+    
+    async def _call(self, fn, *args):
+        if self.cache.remote:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            await self.app(scope, receive, send)
+            return
+        route, child_scope = self._match(scope)
+        namespaces = CACHED_ROUTES.get(getattr(route, 'path', None))
+        if not namespaces:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict(scope['headers'])
+        if_none_match = headers.get(b'if-none-match', b'').decode('latin-1')
+        versions = await self._call(self.cache.versions, namespaces)
+        if not versions:
+            await self.app(scope, receive, send)
+            return
+        key = f"{versions}:{scope['path']}?{'&'.join(sorted(scope['query_string'].decode('latin-1').split('&')))}"
+        
+        entry = None
+        if b'no-cache' not in headers.get(b'cache-control', b''):
+            entry = await self._call(self.cache.get, key)
+        if entry is not None:
+            scope.update(child_scope)
+            await self._respond(send, entry, if_none_match, 'hit')
+            return
+        
+        start = {}
+        chunks = []
+        
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                start.update(message)
+                if message['status'] != 200:
+                    await send(message)
+                return
+            if start['status'] != 200:
+                await send(message)
+                return
+            chunks.append(message.get('body', b''))
+            if message.get('more_body', False):
+                return
+            entry = CachedResponse(
+                [(k, v) for k, v in start['headers'] if k.lower() != b'etag'], b''.join(chunks)
+            )
+            await self._call(self.cache.put, key, entry)
+            await self._respond(send, entry, if_none_match, 'miss')
+        
+        await self.app(scope, receive, send_wrapper)
+    
+    @staticmethod
+    async def _respond(send, entry: CachedResponse, if_none_match: str, result: str):
+        cache_headers = [(b'etag', entry.etag.encode('latin-1'))]
+        if not any(k.lower() == b'cache-control' for k, _ in entry.headers):
+            cache_headers.append((b'cache-control', b'no-cache'))  # Il browser rivalida con If-None-Match
+        
+        if if_none_match and etag_matches(if_none_match, entry.etag):
+            RESPONSE_CACHE_REQUESTS.labels('not_modified').inc()
+            await send({'type': 'http.response.start', 'status': 304, 'headers': cache_headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        RESPONSE_CACHE_REQUESTS.labels(result).inc()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': entry.headers + cache_headers})
+        await send({'type': 'http.response.body', 'body': entry.body})
+
+
+def response_cache_enabled() -> bool:
+    """
+    RESPONSE_CACHE_ENABLED e letture sullo stesso DB delle scritture
+    
+    Con una replica la richiesta subito dopo invalidate_responses può
+    leggere dati non ancora replicati e metterli in cache sotto la nuova
+    versione, serviti fino al TTL: meglio nessuna cache.
+    """
+    read_url = settings.DATABASE_READ_URL
+    return settings.RESPONSE_CACHE_ENABLED and (not read_url or read_url == settings.DATABASE_URL)
+
+
+def invalidate_responses(*namespaces: str):
+    """Chiamata da chi scrive: 'articles' (save, cleanup), 'topics' (refresh, metriche, cleanup)"""
+    if response_cache_enabled():
+        response_cache.invalidate(*namespaces)
+
+
+# Singleton
+response_cache = ResponseCache()
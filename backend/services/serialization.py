@@ -0,0 +1,62 @@
+"""
+Serialization
+Percorso veloce per le risposte JSON grandi (liste di articoli e topic)
+
+Le route di lista selezionano solo le colonne che servono (tuple, niente
+oggetti ORM né __dict__ con lo stato SQLAlchemy), costruiscono i dict una
+volta e li codificano con orjson in una FastJSONResponse: restituendo una
+Response FastAPI salta validazione e serializzazione del response_model,
+che resta solo per la documentazione OpenAPI.
+"""
+import json
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Sequence
+
+from fastapi.responses import JSONResponse
+
+from models.article import ArticleSchema
+from models.topic import TopicSchema
+
+# orjson opzionale: senza, json della stdlib con lo stesso output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+# Colonne delle risposte, nello stesso ordine degli schemi Pydantic
+ARTICLE_FIELDS = tuple(ArticleSchema.model_fields)
+TOPIC_FIELDS = tuple(TopicSchema.model_fields)
+
+
+def columns(model, fields: Sequence[str]) -> List:
+    """Attributi colonna per db.query(*columns(Article, fields))"""
+    return [getattr(model, field) for field in fields]
+
+
+def rows_to_dicts(fields: Sequence[str], rows: Iterable[tuple]) -> List[Dict]:
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content) -> bytes:
+    """JSON compatto UTF-8; datetime in ISO 8601 come Pydantic"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_default, ensure_ascii=False, allow_nan=False, separators=(',', ':')
+    ).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificata con orjson (fallback stdlib)"""
+    
+    def render(self, content) -> bytes:
+        return dumps(content)
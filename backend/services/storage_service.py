@@ -2,12 +2,22 @@
 Storage Service
 Gestisce salvataggio e recupero articoli dal database
 """
-from typing import List, Optional, Dict
+import time
+from collections import Counter
+from typing import List, Optional, Dict, Sequence
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_, or_
+from sqlalchemy import Select, desc, func, and_, or_, insert, select
 from models import Article, ArticleCreate
 from models.database import SessionLocal
+from models.record import ArticleRecord
+from services.event_bus import event_bus
+from services.response_cache import invalidate_responses
+from services.telemetry import ARTICLES_DUPLICATES, PIPELINE_ERRORS, STAGE_SECONDS
+
+
+# source_id per query IN (sotto il limite di variabili di SQLite)
+SAVE_LOOKUP_CHUNK = 500
 
 
 class StorageService:
@@ -66,21 +76,147 @@ class StorageService:
                 saved.append(article)
             
             db.commit()
+            if saved:
+                invalidate_responses('articles')
+                self._publish_new_articles(article.source for article in saved)
             
             for article in saved:
                 db.refresh(article)
             
             print(f"✅ Saved {len(saved)} articles to database")
             return saved
+        
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Storage error: {e}")
+            raise
+        finally:
+            if should_close:
+                db.close()
+    
+    def save_records(
+        self,
+        records: List[ArticleRecord],
+        db: Optional[Session] = None
+    ) -> int:
+        """
+        Salvataggio bulk di ArticleRecord (già normalizzati e arricchiti)
+        
+        Una query IN per blocco di source_id invece di una SELECT per articolo,
+        insert in un'unica executemany e niente refresh degli oggetti.
+        Salta duplicati nel batch e in DB (source_id è unique).
+        
+        Returns:
+            Numero di articoli inseriti
+        """
+        started = time.perf_counter()
+        should_close = False
+        if db is None:
+            db = SessionLocal()
+            should_close = True
+        
+        try:
+            batch = {}
+            for record in records:
+                batch.setdefault(record.source_id, record)
+            batch_duplicates = len(records) - len(batch)
+            
+            source_ids = list(batch)
+            existing = set()
+            for i in range(0, len(source_ids), SAVE_LOOKUP_CHUNK):
+                chunk = source_ids[i:i + SAVE_LOOKUP_CHUNK]
+                existing.update(
+                    row[0] for row in db.query(Article.source_id).filter(Article.source_id.in_(chunk))
+                )
+            
+            rows = []
+            for source_id, record in batch.items():
+                if source_id in existing:
+                    continue
+                # Entities va in raw_metadata (come in save_articles)
+                raw_metadata = dict(record.raw_metadata or {})
+                if record.entities is not None:
+                    raw_metadata['entities'] = record.entities
+                rows.append({
+                    'source': record.source,
+                    'source_id': source_id,
+                    'title': record.title,
+                    'content': record.content,
+                    'url': record.url,
+                    'published_at': record.published_at,
+                    'language': record.language,
+                    'country': record.country,
+                    'raw_metadata': raw_metadata,
+                })
+            
+            if rows:
+                db.execute(insert(Article), rows)
+            db.commit()
+            if rows:
+                invalidate_responses('articles')
+                self._publish_new_articles(row['source'] for row in rows)
             
+            STAGE_SECONDS.labels('save').observe(time.perf_counter() - started)
+            ARTICLES_DUPLICATES.labels('batch').inc(batch_duplicates)
+            ARTICLES_DUPLICATES.labels('db').inc(len(existing))
+            print(
+                f"✅ Saved {len(rows)} articles to database "
+                f"({batch_duplicates} batch duplicates, {len(existing)} already in DB)"
+            )
+            return len(rows)
+        
         except Exception as e:
             db.rollback()
+            PIPELINE_ERRORS.labels('save').inc()
             print(f"❌ Storage error: {e}")
             raise
         finally:
             if should_close:
                 db.close()
     
+    @staticmethod
+    def _publish_new_articles(sources):
+        """Evento live 'articles': conteggio dei nuovi per fonte"""
+        counts = Counter(sources)
+        event_bus.publish('articles', {'total': sum(counts.values()), 'sources': dict(counts)})
+    
+    @staticmethod
+    def _filter_articles(
+        query,
+        source: Optional[str] = None,
+        language: Optional[str] = None,
+        country: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_query: Optional[str] = None
+    ):
+        """Filtri comuni di get_articles / article_rows_statement"""
+        if source:
+            query = query.filter(Article.source == source)
+        
+        if language:
+            query = query.filter(Article.language == language)
+        
+        if country:
+            query = query.filter(Article.country == country)
+        
+        if start_date:
+            query = query.filter(Article.published_at >= start_date)
+        
+        if end_date:
+            query = query.filter(Article.published_at <= end_date)
+        
+        if search_query:
+            search_pattern = f"%{search_query}%"
+            query = query.filter(
+                or_(
+                    Article.title.ilike(search_pattern),
+                    Article.content.ilike(search_pattern)
+                )
+            )
+        
+        return query
+    
     def get_articles(
         self,
         db: Optional[Session] = None,
@@ -102,32 +238,9 @@ class StorageService:
             should_close = True
         
         try:
-            query = db.query(Article)
-            
-            # Filtri
-            if source:
-                query = query.filter(Article.source == source)
-            
-            if language:
-                query = query.filter(Article.language == language)
-            
-            if country:
-                query = query.filter(Article.country == country)
-            
-            if start_date:
-                query = query.filter(Article.published_at >= start_date)
-            
-            if end_date:
-                query = query.filter(Article.published_at <= end_date)
-            
-            if search_query:
-                search_pattern = f"%{search_query}%"
-                query = query.filter(
-                    or_(
-                        Article.title.ilike(search_pattern),
-                        Article.content.ilike(search_pattern)
-                    )
-                )
+            query = self._filter_articles(
+                db.query(Article), source, language, country, start_date, end_date, search_query
+            )
             
             # Ordina per data decrescente
             query = query.order_by(desc(Article.published_at))
@@ -136,11 +249,22 @@ class StorageService:
             articles = query.limit(limit).offset(offset).all()
             
             return articles
-            
+        
         finally:
             if should_close:
                 db.close()
     
+    def article_rows_statement(
+        self,
+        fields: Sequence[str],
+        limit: int = 100,
+        offset: int = 0,
+        **filters
+    ) -> Select:
+        """SELECT delle colonne `fields` con filtri e ordinamento di get_articles"""
+        statement = self._filter_articles(select(*[getattr(Article, field) for field in fields]), **filters)
+        return statement.order_by(desc(Article.published_at)).limit(limit).offset(offset)
+    
     def get_article_by_id(
         self, 
         article_id: int, 
@@ -158,6 +282,18 @@ class StorageService:
             if should_close:
                 db.close()
     
+    @staticmethod
+    def count_statement(source: Optional[str] = None, start_date: Optional[datetime] = None) -> Select:
+        statement = select(func.count(Article.id))
+        
+        if source:
+            statement = statement.where(Article.source == source)
+        
+        if start_date:
+            statement = statement.where(Article.published_at >= start_date)
+        
+        return statement
+    
     def count_articles(
         self,
         db: Optional[Session] = None,
@@ -171,20 +307,37 @@ class StorageService:
             should_close = True
         
         try:
-            query = db.query(func.count(Article.id))
-            
-            if source:
-                query = query.filter(Article.source == source)
-            
-            if start_date:
-                query = query.filter(Article.published_at >= start_date)
-            
-            return query.scalar()
-            
+            return db.execute(self.count_statement(source, start_date)).scalar()
+        
         finally:
             if should_close:
                 db.close()
     
+    @staticmethod
+    def stats_statements() -> Dict[str, Select]:
+        """Query delle statistiche generali (eseguite da get_article_stats o da una ReadSession)"""
+        yesterday = datetime.now() - timedelta(days=1)
+        return {
+            'total': select(func.count(Article.id)),
+            # Count per source / language / country
+            'by_source': select(Article.source, func.count(Article.id)).group_by(Article.source),
+            'by_language': select(Article.language, func.count(Article.id)).group_by(Article.language),
+            'by_country': select(Article.country, func.count(Article.id)).group_by(Article.country),
+            # Last 24h
+            'last_24h': select(func.count(Article.id)).where(Article.published_at >= yesterday),
+        }
+    
+    @staticmethod
+    def stats_from_rows(rows: Dict[str, list]) -> Dict:
+        """Risultati di stats_statements (righe per nome) -> dict delle statistiche"""
+        return {
+            'total_articles': rows['total'][0][0],
+            'last_24h': rows['last_24h'][0][0],
+            'by_source': {src: count for src, count in rows['by_source']},
+            'by_language': {lang: count for lang, count in rows['by_language'] if lang},
+            'by_country': {country: count for country, count in rows['by_country'] if country}
+        }
+    
     def get_article_stats(self, db: Optional[Session] = None) -> Dict:
         """Statistiche generali sugli articoli"""
         should_close = False
@@ -193,40 +346,10 @@ class StorageService:
             should_close = True
         
         try:
-            total = db.query(func.count(Article.id)).scalar()
-            
-            # Count per source
-            by_source = db.query(
-                Article.source,
-                func.count(Article.id).label('count')
-            ).group_by(Article.source).all()
-            
-            # Count per language
-            by_language = db.query(
-                Article.language,
-                func.count(Article.id).label('count')
-            ).group_by(Article.language).all()
-            
-            # Count per country
-            by_country = db.query(
-                Article.country,
-                func.count(Article.id).label('count')
-            ).group_by(Article.country).all()
-            
-            # Last 24h
-            yesterday = datetime.now() - timedelta(days=1)
-            last_24h = db.query(func.count(Article.id)).filter(
-                Article.published_at >= yesterday
-            ).scalar()
-            
-            return {
-                'total_articles': total,
-                'last_24h': last_24h,
-                'by_source': {src: count for src, count in by_source},
-                'by_language': {lang: count for lang, count in by_language if lang},
-                'by_country': {country: count for country, count in by_country if country}
-            }
-            
+            return self.stats_from_rows({
+                name: db.execute(statement).all() for name, statement in self.stats_statements().items()
+            })
+        
         finally:
             if should_close:
                 db.close()
@@ -0,0 +1,216 @@
+"""
+Telemetry
+Metriche Prometheus di pipeline (fetch, parse, enrich, save, embedding,
+K-Means, refresh), query DB e latenza HTTP per route, esposte su /metrics
+"""
+import os
+import time
+from typing import Tuple
+
+# prometheus-client non è nei requirements core: senza, le metriche sono no-op
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        REGISTRY,
+        generate_latest,
+    )
+    from prometheus_client import multiprocess
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Bucket per durata: richieste/query brevi, stage di pipeline, job ML lunghi
+FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+
+
+class _NoopMetric:
+    """Stessa interfaccia di Counter/Gauge/Histogram, non registra nulla"""
+    
+    def labels(self, *args, **kwargs):
+        return self
+    
+    def inc(self, amount: float = 1):
+        pass
+    
+    def dec(self, amount: float = 1):
+        pass
+    
+    def set(self, value: float):
+        pass
+    
+    def observe(self, value: float):
+        pass
+    
+    def time(self):
+        return _NoopTimer()
+
+
+def _histogram(name: str, documentation: str, labels: Tuple[str, ...] = (), buckets=STAGE_BUCKETS):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Histogram(name, documentation, labels, buckets=buckets)
+
+
+def _counter(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    return Counter(name, documentation, labels)
+
+
+def _gauge(name: str, documentation: str, labels: Tuple[str, ...] = ()):
+    if not PROMETHEUS_AVAILABLE:
+        return _NoopMetric()
+    # livesum: con più worker uvicorn si somma sui processi vivi
+    return Gauge(name, documentation, labels, multiprocess_mode='livesum')
+
+
+# Scraping
+FETCH_SECONDS = _histogram(
+    'pulse_fetch_seconds', 'Latenza di una richiesta di rete verso la fonte', ('source',), FAST_BUCKETS + (10.0, 30.0)
+)
+ARTICLES_FETCHED = _counter('pulse_articles_fetched_total', 'Record prodotti dagli scraper', ('source',))
+ARTICLES_DUPLICATES = _counter(
+    'pulse_articles_duplicates_total', 'Record scartati come duplicati', ('stage',)  # scraper | batch | db
+)
+PIPELINE_ERRORS = _counter(
+    'pulse_pipeline_errors_total', 'Errori per stage', ('stage',)  # fetch | parse | save | refresh
+)
+
+# Ingest
+STAGE_SECONDS = _histogram(
+    'pulse_stage_seconds', 'Durata di uno stage di ingest per blocco/batch', ('stage',)  # parse | enrich | save
+)
+INGEST_QUEUE_DEPTH = _gauge('pulse_ingest_queue_depth', 'Batch in coda di ingest')
+INGEST_LAG_SECONDS = _histogram(
+    'pulse_ingest_lag_seconds', 'Attesa in coda del batch più vecchio di un flush', buckets=STAGE_BUCKETS
+)
+INGEST_DROPPED_RECORDS = _counter('pulse_ingest_dropped_records_total', 'Record scartati dopo tutti i retry del flush')
+
+# Topic refresh
+EMBEDDING_SECONDS = _histogram('pulse_embedding_seconds', 'Durata del calcolo embedding', buckets=JOB_BUCKETS)
+EMBEDDED_TEXTS = _counter('pulse_embedded_texts_total', 'Testi trasformati in embedding')
+KMEANS_SECONDS = _histogram('pulse_kmeans_seconds', 'Durata del fit K-Means', buckets=JOB_BUCKETS)
+METRICS_REFRESH_SECONDS = _histogram(
+    'pulse_metrics_refresh_seconds', 'Ricalcolo metriche Pulse e forecast di tutti i topic', buckets=JOB_BUCKETS
+)
+TOPIC_REFRESH_SECONDS = _histogram(
+    'pulse_topic_refresh_seconds', 'Run del refresh topic per esito', ('status',), JOB_BUCKETS
+)
+
+# DB e API
+DB_QUERY_SECONDS = _histogram('pulse_db_query_seconds', 'Latenza query SQL', ('operation',), FAST_BUCKETS)
+SQLITE_WRITE_WAIT_SECONDS = _histogram(
+    'pulse_sqlite_write_wait_seconds', 'Attesa nella coda di scrittura SQLite', buckets=FAST_BUCKETS + (10.0, 30.0)
+)
+HTTP_REQUEST_SECONDS = _histogram(
+    'pulse_http_request_seconds', 'Latenza richieste API per route', ('method', 'route', 'status'), FAST_BUCKETS
+)
+RESPONSE_CACHE_REQUESTS = _counter(
+    'pulse_response_cache_requests_total', 'Richieste alle route in cache per esito', ('result',)  # hit | miss | not_modified
+)
+STREAM_CLIENTS = _gauge('pulse_stream_clients', 'Client SSE connessi a /api/stream')
+STREAM_EVENTS = _counter('pulse_stream_events_total', 'Eventi live pubblicati', ('type',))  # articles | topics | refresh
+STREAM_OVERFLOWS = _counter('pulse_stream_overflows_total', 'Code client piene sostituite da un resync')
+EVENT_LOOP_LAG_SECONDS = _histogram(
+    'pulse_event_loop_lag_seconds', 'Ritardo di risveglio del watchdog dell\'event loop', buckets=FAST_BUCKETS
+)
+
+
+def instrument_engine(engine):
+    """Latenza di ogni statement SQL, etichettata con il verbo (SELECT, INSERT, ...)"""
+    if not PROMETHEUS_AVAILABLE or getattr(engine, '_pulse_instrumented', False):
+        return
+    from sqlalchemy import event
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info['query_started'].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'OTHER'
+        DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - started)
+    
+    @event.listens_for(engine, 'handle_error')
+    def _error(context):
+        # after_cursor_execute non arriva: si scarta l'inizio rimasto in pila
+        if context.connection is not None:
+            pending = context.connection.info.get('query_started')
+            if pending:
+                pending.pop()
+    
+    engine._pulse_instrumented = True
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: latenza per route (template, es. /api/topics/{topic_id})
+    
+    ASGI puro invece di BaseHTTPMiddleware: le risposte in streaming non
+    vengono bufferizzate. La durata arriva fino all'ultimo chunk inviato.
+    """
+    
+    def __init__(self, app, skip_paths: Tuple[str, ...] = ('/metrics',)):
+        self.app = app
+        self.skip_paths = skip_paths
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        started = time.perf_counter()
+        status = {'code': 500}
+        
+        async def send_wrapper(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUEST_SECONDS.labels(
+                scope['method'], self.route_template(scope), str(status['code'])
+            ).observe(time.perf_counter() - started)
+    
+    @staticmethod
+    def route_template(scope) -> str:
+        """Path della route FastAPI che ha servito la richiesta (cardinalità limitata)"""
+        route = scope.get('route')
+        path = getattr(route, 'path', None)
+        return path or 'unmatched'
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Testo esposizione Prometheus e content type
+    
+    Con PROMETHEUS_MULTIPROC_DIR (più worker uvicorn) si aggregano i file
+    scritti da tutti i processi invece del solo registry locale.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        return b"# prometheus-client not installed\n", CONTENT_TYPE_LATEST
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
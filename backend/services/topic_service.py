@@ -2,8 +2,10 @@
 Topic Service - Clustering articles without BERTopic dependency
 Uses sentence-transformers + K-Means for ARM64 compatibility
 """
+import time
+from concurrent.futures import Executor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 from sentence_transformers import SentenceTransformer
 from sklearn.cluster import KMeans
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -12,6 +14,24 @@ import numpy as np
 from models.article import Article
 from models.topic import Topic
 from models.database import get_db
+from services.telemetry import EMBEDDED_TEXTS, EMBEDDING_SECONDS, KMEANS_SECONDS
+
+# Testi per chiamata a encode quando il clustering è interrompibile
+EMBEDDING_CHUNK_SIZE = 256
+
+
+class ClusteringCancelled(Exception):
+    """Clustering interrotto da should_stop() prima di scrivere sul DB"""
+
+
+def _check_stop(should_stop: Optional[Callable[[], bool]]):
+    if should_stop is not None and should_stop():
+        raise ClusteringCancelled("topic clustering cancelled")
+
+
+def _cluster_texts_worker(texts: List[str]) -> Dict:
+    """Worker del process pool: modello caricato una volta per processo (singleton)"""
+    return topic_service.cluster_texts(texts)
 
 
 class TopicService:
@@ -22,23 +42,37 @@ class TopicService:
         self.embedding_model = SentenceTransformer('paraphrase-multilingual-mpnet-base-v2')
         self.tfidf_vectorizer = TfidfVectorizer(max_features=50, stop_words='english')
         self.cluster_model = None
-        
-    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+    
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> np.ndarray:
         """
         Generate embeddings for texts using sentence-transformers
         
         Args:
             texts: List of text strings to embed
-            
+            should_stop: checked between chunks of EMBEDDING_CHUNK_SIZE texts
+        
         Returns:
             numpy array of embeddings
         """
-        return self.embedding_model.encode(texts, show_progress_bar=True)
+        if should_stop is None:
+            return self.embedding_model.encode(texts, show_progress_bar=True)
+        
+        chunks = []
+        for start in range(0, len(texts), EMBEDDING_CHUNK_SIZE):
+            _check_stop(should_stop)
+            chunks.append(self.embedding_model.encode(texts[start:start + EMBEDDING_CHUNK_SIZE]))
+        return np.vstack(chunks)
     
     def cluster_articles(
         self,
         articles: List[Article],
-        min_cluster_size: int = 3
+        min_cluster_size: int = 3,
+        should_stop: Optional[Callable[[], bool]] = None,
+        executor: Optional[Executor] = None
     ) -> Dict:
         """
         Cluster articles into topics using K-Means
@@ -46,7 +80,10 @@ class TopicService:
         Args:
             articles: List of Article objects to cluster
             min_cluster_size: Minimum articles per cluster
-            
+            should_stop: raises ClusteringCancelled when it returns True
+            executor: process pool for embeddings + K-Means (None = this process);
+                      should_stop is then checked only before and after
+        
         Returns:
             Dictionary with cluster assignments and topic info
         """
@@ -57,17 +94,47 @@ class TopicService:
         texts = [f"{art.title}. {art.content[:500] if art.content else ''}" 
                  for art in articles]
         
+        if executor is None:
+            result = self.cluster_texts(texts, should_stop)
+        else:
+            _check_stop(should_stop)
+            result = executor.submit(_cluster_texts_worker, texts).result()
+            _check_stop(should_stop)
+        
+        # Osservati qui: nel process pool le metriche del worker andrebbero perse
+        timings = result['timings']
+        EMBEDDING_SECONDS.observe(timings['embedding_s'])
+        EMBEDDED_TEXTS.inc(len(texts))
+        KMEANS_SECONDS.observe(timings['kmeans_s'])
+        return result
+    
+    def cluster_texts(
+        self,
+        texts: List[str],
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Dict:
+        """
+        Embeddings, K-Means and TF-IDF keywords for prepared texts
+        
+        Returns:
+            Dictionary with cluster assignments, topic info and timings (seconds)
+        """
         # Generate embeddings
         print(f"Generating embeddings for {len(texts)} articles...")
-        embeddings = self.generate_embeddings(texts)
+        started = time.perf_counter()
+        embeddings = self.generate_embeddings(texts, should_stop)
+        embedding_s = time.perf_counter() - started
+        _check_stop(should_stop)
         
         # Determine number of clusters (rule of thumb: sqrt(n/2))
-        n_clusters = max(2, min(10, int(np.sqrt(len(articles) / 2))))
+        n_clusters = max(2, min(10, int(np.sqrt(len(texts) / 2))))
         print(f"Creating {n_clusters} clusters...")
         
         # K-Means clustering
         self.cluster_model = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
+        started = time.perf_counter()
         labels = self.cluster_model.fit_predict(embeddings)
+        kmeans_s = time.perf_counter() - started
         
         # Extract keywords using TF-IDF
         keywords_per_topic = {}
@@ -93,7 +160,8 @@ class TopicService:
             "assignments": labels,
             "n_clusters": n_clusters,
             "topic_counts": topic_counts,
-            "keywords": keywords_per_topic
+            "keywords": keywords_per_topic,
+            "timings": {"embedding_s": embedding_s, "kmeans_s": kmeans_s}
         }
     
     def extract_topic_keywords(self, topic_id: int, keywords_dict: Dict) -> List[str]:
@@ -103,7 +171,7 @@ class TopicService:
         Args:
             topic_id: Cluster ID
             keywords_dict: Dictionary of keywords per topic
-            
+        
         Returns:
             List of keyword strings
         """
@@ -118,7 +186,7 @@ class TopicService:
         Args:
             articles: Articles in this topic
             keywords: Topic keywords from BERTopic
-            
+        
         Returns:
             Topic label string
         """
@@ -135,7 +203,9 @@ class TopicService:
     def cluster_and_save_topics(
         self,
         days_back: int = 7,
-        min_cluster_size: int = 3
+        min_cluster_size: int = 3,
+        should_stop: Optional[Callable[[], bool]] = None,
+        executor: Optional[Executor] = None
     ) -> List[Topic]:
         """
         Main method: cluster recent articles and save topics to database
@@ -143,7 +213,9 @@ class TopicService:
         Args:
             days_back: Number of days to look back for articles
             min_cluster_size: Minimum articles per topic
-            
+            should_stop: checked until the topics are written (then the run completes)
+            executor: process pool for the CPU-bound clustering (see cluster_articles)
+        
         Returns:
             List of created Topic objects
         """
@@ -162,7 +234,17 @@ class TopicService:
         print(f"Clustering {len(articles)} articles from last {days_back} days...")
         
         # Cluster
-        result = self.cluster_articles(articles, min_cluster_size=min_cluster_size)
+        try:
+            result = self.cluster_articles(
+                articles,
+                min_cluster_size=min_cluster_size,
+                should_stop=should_stop,
+                executor=executor
+            )
+            _check_stop(should_stop)
+        except ClusteringCancelled:
+            db.rollback()
+            raise
         
         if not result or "assignments" not in result:
             print("Clustering failed")
@@ -231,7 +313,7 @@ class TopicService:
         
         Args:
             min_cluster_size: Minimum articles per topic
-            
+        
         Returns:
             List of updated Topic objects
         """
@@ -0,0 +1,185 @@
+"""
+Test sessioni di lettura per le route async
+Driver async opzionale, query lente senza bloccare l'event loop, route su ReadSession
+"""
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, func, inspect, select, text
+
+from api import articles, stats, topics
+from benchmarks.corpus import SyntheticCorpus
+from models import database
+from services.storage_service import storage_service
+
+
+def _with_db(test):
+    """DB SQLite temporaneo con corpus; pulse_sleep(s) disponibile nelle query"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'read.db')}")
+        database.bind_engines(engine)
+        engines = [engine]
+        if database.bound_async_engine is not None:
+            engines.append(database.bound_async_engine.sync_engine)
+        for bound in engines:  # Prima di aprire connessioni
+            event.listen(bound, 'connect', lambda conn, record: conn.create_function('pulse_sleep', 1, time.sleep))
+        database.Base.metadata.create_all(bind=engine)
+        try:
+            storage_service.save_records(SyntheticCorpus(200, topics=4, seed=11).records(enriched=True))
+            return test()
+        finally:
+            database.bind_engines()
+            engine.dispose()
+
+
+def test_async_database_url():
+    """Driver async solo se installato; dialetti senza driver -> None"""
+    for url, driver in (("sqlite:///tmp/x.db", 'aiosqlite'), ("postgresql://u:p@db:5432/pulse", 'asyncpg')):
+        expected = url.replace('://', f"+{driver}://", 1) if importlib.util.find_spec(driver) else None
+        assert database.async_database_url(url) == expected
+    assert database.async_database_url("postgresql+psycopg2://u:p@db/pulse") in (None, "postgresql+asyncpg://u:p@db/pulse")
+    assert database.async_database_url("mysql://u:p@db/pulse") is None
+    print("✅ Async database URL OK")
+
+
+def test_import_with_sqlite_urls():
+    """models.database si importa con file, sqlite:// e :memory: (col driver async se installato)"""
+    probe = (
+        "from models import database; "
+        "print(database.read_engine.pool.__class__.__name__, database.async_read_engine is not None)"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for url, pool in ((f"sqlite:///{os.path.join(tmp, 'pulse.db')}", 'QueuePool'),
+                          ("sqlite://", 'SingletonThreadPool'), ("sqlite:///:memory:", 'SingletonThreadPool')):
+            env = {**os.environ, 'DATABASE_URL': url}
+            env.pop('DATABASE_READ_URL', None)
+            result = subprocess.run(
+                [sys.executable, '-c', probe], cwd=os.path.dirname(os.path.abspath(__file__)),
+                env=env, capture_output=True, text=True, timeout=60
+            )
+            assert result.returncode == 0, result.stderr
+            with_driver = importlib.util.find_spec('aiosqlite') is not None
+            assert result.stdout.strip().splitlines()[-1] == f"{pool} {with_driver}"
+    print("✅ Import with SQLite URLs OK")
+
+
+# Tabella topics com'era prima delle colonne forecast_*
+BASELINE_TOPICS = """
+CREATE TABLE topics (
+    id INTEGER PRIMARY KEY, topic_id VARCHAR(50) UNIQUE, label VARCHAR(255), keywords JSON,
+    description TEXT, pulse_score FLOAT, volume INTEGER, velocity FLOAT, spread INTEGER,
+    authority FLOAT, novelty FLOAT, variance FLOAT, sentiment_avg FLOAT, country VARCHAR(10),
+    sector VARCHAR(50), first_seen DATETIME, last_updated DATETIME, history JSON
+)
+"""
+
+
+def test_upgrade_baseline_schema():
+    """DB con la tabella topics precedente: colonne aggiunte una volta, route dei topic funzionanti"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'baseline.db')}")
+        with engine.begin() as conn:
+            conn.execute(text(BASELINE_TOPICS))
+            conn.execute(text(
+                "INSERT INTO topics (topic_id, label, keywords, pulse_score, volume, velocity) "
+                "VALUES ('topic_0', 'Old topic', '[]', 50.0, 3, 1.0)"
+            ))
+        database.Base.metadata.create_all(bind=engine)  # Come init_db: crea solo le tabelle mancanti
+        
+        added = database.upgrade_schema(engine)
+        assert added == ['topics.forecast_volume', 'topics.forecast_velocity', 'topics.forecast_model']
+        assert database.upgrade_schema(engine) == []
+        assert {'forecast_volume', 'forecast_model'} <= {column['name'] for column in inspect(engine).get_columns('topics')}
+        
+        app = FastAPI()
+        app.include_router(topics.router)
+        
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.get("/api/topics?sort_by=forecast_velocity")
+        
+        database.bind_engines(engine)
+        try:
+            response = asyncio.run(scenario())
+        finally:
+            database.bind_engines()
+            engine.dispose()
+    assert response.status_code == 200
+    assert response.json()[0]['topic_id'] == 'topic_0'
+    assert response.json()[0]['forecast_volume'] == 0.0
+    print("✅ Upgrade baseline schema OK")
+
+
+def test_slow_reads_do_not_block_loop():
+    """Due letture lente in parallelo: durano come una e il loop continua a girare"""
+    async def scenario():
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        async def slow_read():
+            db = database.ReadSession()
+            try:
+                return await db.scalar(select(func.pulse_sleep(0.3)))
+            finally:
+                await db.close()
+        
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        await asyncio.gather(slow_read(), slow_read())
+        elapsed = time.perf_counter() - started
+        task.cancel()
+        return elapsed, ticks
+    
+    elapsed, ticks = _with_db(lambda: asyncio.run(scenario()))
+    assert elapsed < 0.5
+    assert ticks >= 10
+    print("✅ Slow reads do not block loop OK")
+
+
+def test_routes_on_read_session():
+    """Stats e conteggi dalle route async uguali alle query sync"""
+    app = FastAPI()
+    app.include_router(articles.router, prefix="/api/articles")
+    app.include_router(stats.router, prefix="/api/stats")
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            overview = (await client.get("/api/stats/overview")).json()
+            count = (await client.get("/api/articles/count/total?source=ansa")).json()
+            first = (await client.get("/api/articles/1")).json()
+            missing = await client.get("/api/articles/100000")
+            return overview, count, first, missing
+    
+    def check():
+        overview, count, first, missing = asyncio.run(scenario())
+        assert overview == storage_service.get_article_stats()
+        assert overview['total_articles'] == 200
+        assert count == {'count': storage_service.count_articles(source='ansa')}
+        assert first['id'] == 1 and first['title']
+        assert missing.status_code == 404
+    
+    _with_db(check)
+    print("✅ Routes on read session OK")
+
+
+if __name__ == "__main__":
+    test_async_database_url()
+    test_import_with_sqlite_urls()
+    test_upgrade_baseline_schema()
+    test_slow_reads_do_not_block_loop()
+    test_routes_on_read_session()
+    print("\n✅ All database tests passed!")
@@ -0,0 +1,204 @@
+"""
+Test event bus e stream SSE
+Consegna da thread, filtro per tipo, coda limitata con resync, Last-Event-ID, /api/stream
+"""
+import asyncio
+import queue
+import threading
+import time
+
+from fastapi import FastAPI
+
+from api import stream
+from services.event_bus import EventBus, event_bus
+
+
+def test_publish_from_thread_and_filter():
+    """Eventi pubblicati da un thread di job arrivano sul loop del client, filtrati per tipo"""
+    async def scenario():
+        bus = EventBus(history_size=10, buffer_size=5, backend='memory')
+        subscription = bus.subscribe(types=['topics'])
+        
+        def job():
+            bus.publish('articles', {'total': 3, 'sources': {'ansa': 3}})
+            bus.publish('topics', {'topics': [{'topic_id': 'topic_1', 'pulse_score': 71.5}]})
+        
+        thread = threading.Thread(target=job)
+        thread.start()
+        thread.join()
+        event = await subscription.get(timeout=1.0)
+        nothing = await subscription.get(timeout=0.05)
+        bus.unsubscribe(subscription)
+        return bus, event, nothing
+    
+    bus, event, nothing = asyncio.run(scenario())
+    assert event.type == 'topics' and event.id == 2
+    assert event.data['topics'][0]['topic_id'] == 'topic_1'
+    assert nothing is None and bus.clients == 0
+    print("✅ Publish from thread + filter OK")
+
+
+def test_slow_client_resync():
+    """Coda piena: svuotata e sostituita da un solo resync, gli eventi successivi arrivano"""
+    async def scenario():
+        bus = EventBus(history_size=10, buffer_size=3, backend='memory')
+        subscription = bus.subscribe()
+        for i in range(5):
+            bus.publish('articles', {'total': i})
+        await asyncio.sleep(0)  # Consegne call_soon_threadsafe
+        first = await subscription.get(timeout=1.0)
+        bus.publish('refresh', {'topics': 4})
+        await asyncio.sleep(0)
+        following = [await subscription.get(timeout=1.0) for _ in range(2)]
+        return subscription, first, following
+    
+    subscription, first, following = asyncio.run(scenario())
+    assert first.type == 'resync' and subscription.overflows == 1
+    assert subscription.queue.empty()
+    assert [(event.id, event.type) for event in following] == [(5, 'articles'), (6, 'refresh')]
+    print("✅ Slow client resync OK")
+
+
+def test_resume_with_last_event_id():
+    """Eventi persi rimandati dallo storico; oltre lo storico un resync"""
+    async def scenario():
+        bus = EventBus(history_size=3, buffer_size=10, backend='memory')
+        for i in range(5):
+            bus.publish('articles', {'total': i})
+        resumed = bus.subscribe(last_event_id=3)
+        expired = bus.subscribe(last_event_id=1)
+        current = bus.subscribe(last_event_id=5)
+        return (
+            [(await resumed.get(0.1)).id for _ in range(2)],
+            (await expired.get(0.1)).type,
+            await current.get(0.05),
+        )
+    
+    resumed, expired, current = asyncio.run(scenario())
+    assert resumed == [4, 5]
+    assert expired == 'resync'
+    assert current is None
+    print("✅ Resume with Last-Event-ID OK")
+
+
+class _FakeRedis:
+    """Canale pub/sub e INCR in memoria, condivisi tra i bus di due worker"""
+    
+    def __init__(self):
+        self.counter = 0
+        self.listeners = []
+    
+    def incr(self, key):
+        self.counter += 1
+        return self.counter
+    
+    def publish(self, channel, message):
+        for listener in self.listeners:
+            listener.put({'data': message})
+    
+    def pubsub(self, **kwargs):
+        return _FakePubSub(self)
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.messages = queue.Queue()
+        redis.listeners.append(self.messages)
+    
+    def subscribe(self, channel):
+        pass
+    
+    def listen(self):
+        while True:
+            yield self.messages.get()
+
+
+def test_redis_ids_across_workers():
+    """Id assegnati alla pubblicazione: Last-Event-ID valido su un altro worker, resync se sconosciuto"""
+    shared = _FakeRedis()
+    leader, other = EventBus(history_size=10, backend='memory'), EventBus(history_size=10, backend='memory')
+    leader._redis = other._redis = shared
+    
+    def wait_for(bus, event_id):
+        deadline = time.monotonic() + 2.0
+        while bus._last_id < event_id:
+            assert time.monotonic() < deadline, "event not delivered"
+            time.sleep(0.005)
+    
+    async def scenario():
+        leader.subscribe()  # Avvia il listener del leader
+        for i in range(3):
+            leader.publish('articles', {'total': i})
+        wait_for(leader, 3)
+        # Worker senza listener: non conosce l'id 2, niente replay da un'altra sequenza
+        unknown = other.subscribe(last_event_id=2)
+        first = await unknown.get(0.5)
+        
+        for i in range(3, 5):
+            leader.publish('articles', {'total': i})
+        wait_for(other, 5)
+        resumed = other.subscribe(last_event_id=3)
+        expired = other.subscribe(last_event_id=2)  # 3 mai ricevuto da questo worker
+        return first, [(await resumed.get(0.5)).id for _ in range(2)], (await expired.get(0.5)).type
+    
+    first, resumed, expired = asyncio.run(scenario())
+    assert first.type == 'resync'
+    assert resumed == [4, 5]
+    assert expired == 'resync'
+    assert [event.id for event in leader._history] == [1, 2, 3, 4, 5]
+    print("✅ Redis ids across workers OK")
+
+
+def test_stream_endpoint():
+    """Frame SSE dal router; alla disconnessione il client viene rimosso dal bus"""
+    app = FastAPI()
+    app.include_router(stream.router)
+    
+    async def scenario():
+        chunks = []
+        received = asyncio.Event()
+        disconnected = asyncio.Event()
+        
+        async def receive():
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+        
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                chunks.append(dict(message['headers']))
+            elif message.get('body'):
+                chunks.append(message['body'])
+                received.set()
+        
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': '/api/stream', 'raw_path': b'/api/stream',
+            'query_string': b'types=refresh', 'headers': [], 'scheme': 'http',
+            'server': ('test', 80), 'client': ('test', 1234), 'root_path': '', 'http_version': '1.1',
+        }
+        task = asyncio.create_task(app(scope, receive, send))
+        await asyncio.wait_for(received.wait(), 1.0)
+        received.clear()
+        clients = event_bus.clients
+        event_bus.publish('articles', {'total': 1})
+        event_bus.publish('refresh', {'topics': 7, 'articles': 120, 'metrics_updated': 7})
+        await asyncio.wait_for(received.wait(), 1.0)
+        disconnected.set()
+        await asyncio.wait_for(task, 1.0)
+        return chunks, clients
+    
+    chunks, clients = asyncio.run(scenario())
+    headers, connected, event = chunks[0], chunks[1], chunks[2]
+    assert headers[b'content-type'].startswith(b'text/event-stream')
+    assert connected.startswith(b'retry: ')
+    assert b'event: refresh\ndata: {"topics":7,"articles":120,"metrics_updated":7}\n\n' in event
+    assert clients == 1 and event_bus.clients == 0
+    print("✅ Stream endpoint OK")
+
+
+if __name__ == "__main__":
+    test_publish_from_thread_and_filter()
+    test_slow_client_resync()
+    test_resume_with_last_event_id()
+    test_redis_ids_across_workers()
+    test_stream_endpoint()
+    print("\n✅ All event bus tests passed!")
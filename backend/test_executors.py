@@ -0,0 +1,66 @@
+"""
+Test executor dei job
+Limite di concorrenza per job e watchdog del lag dell'event loop
+"""
+import asyncio
+import threading
+import time
+
+from config import settings
+from jobs.executors import LoopLagMonitor, job_stats, run_io
+
+
+def test_job_concurrency_limit():
+    """JOB_CONCURRENCY['scrape'] = 2: mai più di 2 thread dello stesso job insieme"""
+    original = settings.JOB_CONCURRENCY
+    settings.JOB_CONCURRENCY = dict(original, scrape=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+    
+    def work():
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+    
+    async def scenario():
+        await asyncio.gather(*(run_io('scrape', work) for _ in range(6)))
+    
+    try:
+        asyncio.run(scenario())
+    finally:
+        settings.JOB_CONCURRENCY = original
+    
+    stats = job_stats()['scrape']
+    assert max(peak) == 2
+    assert stats['completed'] >= 6 and stats['running'] == 0 and stats['waiting'] == 0
+    print("✅ Job concurrency limit OK")
+
+
+def test_loop_lag_monitor_detects_block():
+    """Codice sincrono nel loop -> lag registrato; in un thread -> nessuno stallo"""
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.02, warn_ms=100)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await run_io('bench', time.sleep, 0.2)
+        clean = monitor.snapshot()['stalls']
+        time.sleep(0.2)  # Blocca il loop
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return clean, monitor.snapshot()
+    
+    clean, snapshot = asyncio.run(scenario())
+    
+    assert clean == 0
+    assert snapshot['stalls'] == 1 and snapshot['max_ms'] >= 150
+    print("✅ Loop lag monitor OK")
+
+
+if __name__ == "__main__":
+    test_job_concurrency_limit()
+    test_loop_lag_monitor_detects_block()
+    print("\n✅ All executor tests passed!")
@@ -0,0 +1,109 @@
+"""
+Test export in streaming
+NDJSON a blocchi con filtri e colonne, gzip, Arrow/Parquet (se pyarrow è installato)
+"""
+import asyncio
+import gzip
+import io
+import json
+import os
+import tempfile
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+
+from api import export
+from benchmarks.corpus import SyntheticCorpus
+from models import database
+from services.export_service import ARROW_AVAILABLE, export_service
+from services.storage_service import storage_service
+
+
+def _with_corpus(test, n: int = 300):
+    """Esegue test(corpus) su un DB SQLite temporaneo popolato col corpus sintetico"""
+    corpus = SyntheticCorpus(n, topics=5, seed=7)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'export.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        try:
+            storage_service.save_records(corpus.records(enriched=True))
+            return test(corpus)
+        finally:
+            database.bind_engines()
+            engine.dispose()
+
+
+def _get(path: str) -> httpx.Response:
+    app = FastAPI()
+    app.include_router(export.router)
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path)
+    
+    return asyncio.run(scenario())
+
+
+def test_ndjson_batches_and_filters():
+    """Un chunk per blocco di yield_per; filtro per fonte e colonne selezionate"""
+    def check(corpus):
+        chunks = list(export_service.export('ndjson', ('id', 'source'), batch_size=64))
+        rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+        assert len(chunks) == 5 and len(rows) == corpus.n
+        assert [row['id'] for row in rows] == list(range(1, corpus.n + 1))
+        
+        response = _get("/api/export/articles?source=ansa&fields=id,source,published_at,raw_metadata")
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/x-ndjson'
+        assert 'attachment; filename="articles-' in response.headers['content-disposition']
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        expected = sum(1 for a in corpus.iter_articles() if a['source'] == 'ansa')
+        assert len(rows) == expected and {row['source'] for row in rows} == {'ansa'}
+        assert set(rows[0]) == {'id', 'source', 'published_at', 'raw_metadata'}
+    
+    _with_corpus(check)
+    print("✅ NDJSON batches + filters OK")
+
+
+def test_gzip_and_validation():
+    """gzip decomprimibile con lo stesso contenuto; colonne sconosciute rifiutate"""
+    def check(corpus):
+        plain = _get("/api/export/articles?fields=id,title")
+        packed = _get("/api/export/articles?fields=id,title&gzip=true")
+        assert packed.headers['content-type'] == 'application/gzip'
+        assert gzip.decompress(packed.content) == plain.content
+        assert len(packed.content) < len(plain.content)
+        assert _get("/api/export/articles?fields=id,embedding_vector").status_code == 400
+    
+    _with_corpus(check)
+    print("✅ Gzip + validation OK")
+
+
+def test_arrow_formats():
+    """Parquet e Arrow IPC rileggibili con pyarrow; senza pyarrow 501"""
+    def check(corpus):
+        parquet = _get("/api/export/articles?format=parquet&fields=id,title,published_at,engagement_score")
+        arrow = _get("/api/export/articles?format=arrow&language=it")
+        if not ARROW_AVAILABLE:
+            assert parquet.status_code == 501 and arrow.status_code == 501
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pq.read_table(io.BytesIO(parquet.content))
+        assert table.num_rows == corpus.n
+        assert table.column_names == ['id', 'title', 'published_at', 'engagement_score']
+        stream = pa.ipc.open_stream(arrow.content).read_all()
+        assert set(stream.column('language').to_pylist()) == {'it'}
+    
+    _with_corpus(check)
+    print("✅ Arrow formats OK")
+
+
+if __name__ == "__main__":
+    test_ndjson_batches_and_filters()
+    test_gzip_and_validation()
+    test_arrow_formats()
+    print("\n✅ All export tests passed!")
@@ -0,0 +1,259 @@
+"""
+Test HTTP client degli scraper
+Cache su disco, richieste condizionali ed eviction contro un server HTTP locale
+"""
+import gzip
+import json
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+from config import settings
+from scrapers import hackernews_scraper
+from scrapers.hackernews_scraper import HackerNewsScraper
+from scrapers.http_client import HttpClient, ResponseCache
+from scrapers.rate_limiter import CircuitOpenError, TokenBucket, parse_retry_after
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Risponde con ETag fisso; 304 se il client lo rimanda"""
+    body = json.dumps({'hits': list(range(200))}).encode('utf-8')
+    hits = 0
+    
+    def do_GET(self):
+        _Handler.hits += 1
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        payload = gzip.compress(self.body)
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """429 con Retry-After per le prime `failures` richieste, poi 200"""
+    failures = 1
+    hits = 0
+    
+    def do_GET(self):
+        _FlakyHandler.hits += 1
+        if _FlakyHandler.hits <= _FlakyHandler.failures:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+    
+    def log_message(self, *args):
+        pass
+
+
+def _serve(handler=_Handler):
+    server = HTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/search"
+
+
+def test_ttl_hit_then_conditional_304():
+    """Primo GET scarica, entro TTL nessuna richiesta, dopo TTL un 304"""
+    server, url = _serve()
+    with tempfile.TemporaryDirectory() as tmp:
+        client = HttpClient(cache=ResponseCache(tmp, max_bytes=10**6, max_age_seconds=3600))
+        _Handler.hits = 0
+        
+        first = client.get(url, params={'q': 'ai'})
+        assert first.status_code == 200 and not first.unchanged
+        assert first.json()['hits'][:3] == [0, 1, 2]
+        
+        cached = client.get(url, params={'q': 'ai'}, ttl=60)
+        assert cached.from_cache and cached.content == _Handler.body
+        assert _Handler.hits == 1
+        
+        revalidated = client.get(url, params={'q': 'ai'}, ttl=0)
+        assert revalidated.not_modified and revalidated.content == _Handler.body
+        assert _Handler.hits == 2
+        
+        other = client.get(url, params={'q': 'ml'}, ttl=60)
+        assert not other.unchanged
+        assert client.stats == {
+            'requests': 4,
+            'downloads': 2,
+            'not_modified': 1,
+            'cache_hits': 1,
+            'bytes_downloaded': 2 * len(_Handler.body),
+            'retries': 0,
+            'throttled': 0,
+        }
+    server.shutdown()
+    print("✅ TTL hit + 304 revalidation OK")
+
+
+def test_cached_pages_still_parsed():
+    """Pagine servite dalla cache o con 304: i record tornano comunque (li scarta il dedup sul DB)"""
+    hits = [
+        {'title': 'Cached story', 'objectID': '101', 'created_at': '2025-01-02T03:04:05Z', 'points': 5},
+        {'title': 'Another story', 'objectID': '102', 'created_at': '2025-01-02T04:05:06Z', 'points': 1},
+    ]
+    
+    class _AlgoliaHandler(_Handler):
+        def do_GET(self):
+            self.body = json.dumps({'hits': hits if 'page=0' in self.path else []}).encode('utf-8')
+            super().do_GET()
+    
+    server, url = _serve(_AlgoliaHandler)
+    original = hackernews_scraper.http_client
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            hackernews_scraper.http_client = HttpClient(
+                cache=ResponseCache(tmp, max_bytes=10**6, max_age_seconds=3600)
+            )
+            scraper = HackerNewsScraper()
+            scraper.api_url = url
+            runs = [[record.source_id for page in scraper.iter_pages('ai') for record in page] for _ in range(2)]
+            assert hackernews_scraper.http_client.stats['downloads'] == 2  # Pagina 0 e pagina 1 vuota
+    finally:
+        hackernews_scraper.http_client = original
+        server.shutdown()
+    assert runs == [['101', '102'], ['101', '102']]
+    print("✅ Cached pages still parsed OK")
+
+
+def test_cache_persists_and_evicts():
+    """Entry rilette da una nuova istanza; oltre max_bytes si elimina la meno recente"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(tmp, max_bytes=10**6, max_age_seconds=3600)
+        cache.put('a' * 32, 'http://x/a', {'etag': '"a"'}, b'A' * 100)
+        cache.put('b' * 32, 'http://x/b', {}, b'B' * 100)
+        
+        reopened = ResponseCache(tmp, max_bytes=10**6, max_age_seconds=3600)
+        assert reopened.get('a' * 32)['content'] == b'A' * 100
+        assert reopened.get('a' * 32)['headers'] == {'etag': '"a"'}
+        assert len(reopened) == 2
+        
+        entry_size = reopened.total_bytes // 2
+        small = ResponseCache(tmp, max_bytes=int(entry_size * 2.5), max_age_seconds=3600)
+        small.get('b' * 32)
+        small.get('a' * 32)  # 'b' diventa la meno recente
+        small.put('c' * 32, 'http://x/c', {}, b'C' * 100)
+        assert small.get('b' * 32) is None
+        assert small.get('a' * 32) is not None
+        assert small.get('c' * 32) is not None
+        
+        expired = ResponseCache(tmp, max_bytes=10**6, max_age_seconds=-1)
+        assert expired.get('a' * 32) is None
+    print("✅ Disk cache persistence + LRU eviction OK")
+
+
+def test_retry_budget_and_circuit_breaker():
+    """429 ritentato fino al successo; budget esaurito e breaker aperto fermano la fonte"""
+    server, url = _serve(_FlakyHandler)
+    original = (
+        settings.HTTP_BACKOFF_BASE_SECONDS,
+        settings.HTTP_RETRY_BUDGET_PER_RUN,
+        settings.HTTP_RATE_LIMITS
+    )
+    settings.HTTP_BACKOFF_BASE_SECONDS = 0.01
+    settings.HTTP_RATE_LIMITS = {'127.0.0.1': 1000.0}
+    try:
+        client = HttpClient(cache=None)
+        client.cache = None
+        client.start_run()
+        
+        _FlakyHandler.failures, _FlakyHandler.hits = 1, 0
+        response = client.get(url, source='flaky')
+        assert response.status_code == 200 and response.content == b'ok'
+        assert client.stats['retries'] == 1 and client.stats['throttled'] == 1
+        
+        # Sempre 429: retry consumati dal budget, poi fallimenti verso il breaker
+        settings.HTTP_RETRY_BUDGET_PER_RUN = 2
+        client.start_run()
+        client.breaker.threshold = 2
+        _FlakyHandler.failures, _FlakyHandler.hits = 10**6, 0
+        assert client.get(url, source='flaky').status_code == 429
+        assert _FlakyHandler.hits == 3  # 1 + 2 retry del budget
+        assert client.get(url, source='flaky').status_code == 429
+        assert _FlakyHandler.hits == 4  # budget finito: nessun retry
+        
+        assert not client.is_available('flaky')
+        try:
+            client.get(url, source='flaky')
+            raise AssertionError("expected CircuitOpenError")
+        except CircuitOpenError:
+            pass
+        assert _FlakyHandler.hits == 4
+        assert client.is_available('other')
+    finally:
+        (
+            settings.HTTP_BACKOFF_BASE_SECONDS,
+            settings.HTTP_RETRY_BUDGET_PER_RUN,
+            settings.HTTP_RATE_LIMITS
+        ) = original
+        server.shutdown()
+    print("✅ Retry budget + circuit breaker OK")
+
+
+def test_half_open_probe_errors():
+    """Errori non ritentabili durante la prova half-open: il circuito si riapre e riprova dopo il cooldown"""
+    client = HttpClient(cache=None)
+    client.cache = None
+    client.breaker.threshold, client.breaker.cooldown = 1, 0.0
+    client.breaker.record_failure('broken')
+    
+    for error in (requests.TooManyRedirects, requests.exceptions.ChunkedEncodingError, RuntimeError):
+        def fail(*args, **kwargs):
+            raise error("boom")
+        client.session.get = fail
+        try:
+            client.get("http://127.0.0.1:9/feed", source='broken')
+            raise AssertionError("expected error")
+        except error:
+            pass
+        assert client.breaker.snapshot()['broken']['open'] is False  # Cooldown 0: nuova prova possibile
+        assert 'broken' not in client.breaker._probing
+    
+    # Errori di requests contano come fallimenti, gli altri chiudono solo la prova
+    assert client.breaker.snapshot()['broken']['failures'] == 3
+    print("✅ Half-open probe errors OK")
+
+
+def test_token_bucket_adapts():
+    """Burst senza attesa, poi 1/rate; 429 dimezza il rate e rispetta Retry-After"""
+    bucket = TokenBucket(rate=10.0, burst=2)
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    assert 0.09 < bucket.reserve() <= 0.1
+    
+    bucket.on_throttle(retry_after=5)
+    assert bucket.rate == 5.0
+    assert bucket.reserve() > 4.9
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 10.0
+    
+    assert parse_retry_after('120') == 120.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('soon') is None
+    print("✅ Adaptive token bucket OK")
+
+
+if __name__ == "__main__":
+    test_ttl_hit_then_conditional_304()
+    test_cached_pages_still_parsed()
+    test_cache_persists_and_evicts()
+    test_retry_budget_and_circuit_breaker()
+    test_half_open_probe_errors()
+    test_token_bucket_adapts()
+    print("\n✅ All HTTP client tests passed!")
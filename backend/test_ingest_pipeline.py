@@ -0,0 +1,70 @@
+"""
+Test pipeline di ingest in streaming
+Scraper reali su pagine sintetiche: salvataggi incrementali, dedup tra pagine e col DB
+"""
+import os
+import tempfile
+
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.synthetic import SyntheticSources
+from models import database
+from models.article import Article
+from scrapers.replay import use_cassette
+from services.ingest_pipeline import run_streaming_ingest
+from services.storage_service import storage_service
+
+
+class _RepeatedPageSources(SyntheticSources):
+    """La pagina 1 di HN ripete gli hit della pagina 0 (stessi objectID)"""
+    
+    def hn_page(self, query: str, page: int) -> bytes:
+        return super().hn_page(query, 0 if page == 1 else page)
+
+
+def test_incremental_saves_and_dedup():
+    """Primo salvataggio prima dell'ultima pagina; hit ripetuti tra pagine e run salvati una volta"""
+    sources = _RepeatedPageSources(pages=3)
+    requests_at_save = []
+    save_records = storage_service.save_records
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'ingest.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        try:
+            with use_cassette(generator=sources, strict=False) as adapter:
+                def tracked(records, db=None):
+                    requests_at_save.append(adapter.stats['generated'])
+                    return save_records(records, db)
+                
+                storage_service.save_records = tracked
+                first = run_streaming_ingest('ai', sources=['ansa', 'hackernews'], max_pages=10, batch_size=10)
+                total_requests = adapter.stats['generated']
+                second = run_streaming_ingest('ai', sources=['ansa', 'hackernews'], max_pages=10, batch_size=10)
+            
+            db = database.SessionLocal()
+            try:
+                stored = db.execute(select(func.count(Article.id))).scalar()
+                by_source = dict(db.execute(select(Article.source, func.count(Article.id)).group_by(Article.source)).all())
+            finally:
+                db.close()
+        finally:
+            del storage_service.save_records
+            database.bind_engines()
+            engine.dispose()
+    
+    # 3 pagine ANSA da 12; HN: pagine 0 e 2 da 20 (la 1 ripete la 0), poi pagina vuota
+    assert first['errors'] == 0
+    assert first['scraped'] == 36 + 40 and first['saved'] == 76 == stored
+    assert by_source == {'ansa': 36, 'hackernews': 40}
+    assert first['batches'] == 8 and first['first_save_s'] is not None
+    assert requests_at_save[0] == 1  # Primo batch salvato dopo la sola prima pagina ANSA
+    assert requests_at_save[0] < total_requests == 8
+    assert second['scraped'] == 76 and second['saved'] == 0
+    print("✅ Incremental saves + dedup OK")
+
+
+if __name__ == "__main__":
+    test_incremental_saves_and_dedup()
+    print("\n✅ All ingest pipeline tests passed!")
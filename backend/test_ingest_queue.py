@@ -0,0 +1,122 @@
+"""
+Test coda di ingest
+Backpressure sui produttori, micro-batch per dimensione e per tempo, lag
+"""
+import asyncio
+import threading
+import time
+
+from models.record import ArticleRecord
+from services.ingest_queue import IngestQueue
+
+
+def _records(source: str, start: int, count: int) -> list:
+    return [ArticleRecord(source=source, source_id=str(i), title=f"t{i}") for i in range(start, start + count)]
+
+
+class _SlowStore:
+    """Storage finto che impiega `delay` secondi per batch e registra le dimensioni"""
+    
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.sizes = []
+    
+    def __call__(self, records):
+        time.sleep(self.delay)
+        self.sizes.append(len(records))
+        return len(records)
+
+
+def test_backpressure_and_size_flush():
+    """Coda da 2 batch: il produttore aspetta, nessun batch perso, flush a 30 record"""
+    store = _SlowStore(delay=0.05)
+    queue = IngestQueue(max_batches=2, flush_records=30, flush_seconds=1.0, store=store)
+    
+    async def scenario():
+        queue.start()
+        for n in range(10):
+            await queue.put('ansa', _records('ansa', n * 10, 10))
+            assert queue.snapshot()['depth'] <= 2
+        await queue.stop(timeout=5)
+    
+    asyncio.run(scenario())
+    
+    stats = queue.snapshot()
+    assert sum(store.sizes) == 100 and stats['saved'] == 100
+    assert max(store.sizes) <= 30
+    assert stats['producer_waits'] > 0 and stats['max_depth'] <= 2
+    assert stats['pending_records'] == 0 and stats['lag_seconds'] == 0.0
+    print("✅ Backpressure + size flush OK")
+
+
+def test_time_flush_and_threaded_producers():
+    """Batch parziale salvato dopo flush_seconds; put_threadsafe da thread scraper"""
+    store = _SlowStore(delay=0.0)
+    queue = IngestQueue(max_batches=4, flush_records=1000, flush_seconds=0.1, store=store)
+    flushes = []
+    queue.on_flush(flushes.append)
+    
+    def producer(source):
+        for n in range(3):
+            queue.put_threadsafe(source, _records(source, n * 5, 5))
+    
+    async def scenario():
+        queue.start()
+        threads = [threading.Thread(target=producer, args=(s,)) for s in ('ansa', 'hackernews')]
+        for t in threads:
+            t.start()
+        await asyncio.to_thread(lambda: [t.join() for t in threads])
+        started = time.monotonic()
+        await queue.join()
+        waited = time.monotonic() - started
+        await queue.stop()
+        return waited
+    
+    waited = asyncio.run(scenario())
+    
+    assert sum(store.sizes) == 30
+    assert waited < 1.0
+    assert flushes and flushes[-1]['depth'] == 0
+    assert all(f['lag_seconds'] >= 0 for f in flushes)
+    print("✅ Time flush + threaded producers OK")
+
+
+def test_flush_retry_then_drop():
+    """Store che fallisce una volta: batch salvato al retry; store sempre in errore: record contati come scartati"""
+    calls = []
+    
+    def flaky(records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return len(records)
+    
+    def broken(records):
+        raise RuntimeError("disk full")
+    
+    async def scenario(queue):
+        queue.start()
+        await queue.put('ansa', _records('ansa', 0, 10))
+        await queue.join()
+        await queue.stop()
+    
+    queue = IngestQueue(flush_records=10, flush_seconds=0.01, store=flaky, flush_retries=2, retry_backoff_seconds=0.01)
+    asyncio.run(scenario(queue))
+    stats = queue.snapshot()
+    assert calls == [10, 10]
+    assert stats['saved'] == 10 and stats['flush_retries'] == 1 and stats['dropped'] == 0
+    
+    queue = IngestQueue(flush_records=10, flush_seconds=0.01, store=broken, flush_retries=2, retry_backoff_seconds=0.01)
+    asyncio.run(scenario(queue))
+    stats = queue.snapshot()
+    assert stats['saved'] == 0 and stats['errors'] == 3 and stats['flush_retries'] == 2
+    assert stats['dropped'] == 10 and stats['pending_records'] == 0
+    assert stats['last_error'] == "disk full"
+    print("✅ Flush retry + drop OK")
+
+
+if __name__ == "__main__":
+    test_backpressure_and_size_flush()
+    test_time_flush_and_threaded_producers()
+    test_flush_retry_then_drop()
+    print("\n✅ All ingest queue tests passed!")
@@ -38,6 +38,24 @@ test_cases = [
         'title': 'Tech startup raises funds',
         'text': 'Silicon Valley company secures investment',
         'expected': 'USA'
+    },
+    {
+        # 'uk' non deve matchare dentro 'ukraine'
+        'title': 'Ukraine receives new aid package',
+        'text': 'Kyiv welcomes the decision',
+        'expected': 'UKR'
+    },
+    {
+        # 'usa' non deve matchare dentro 'causa'
+        'title': 'Scuole chiuse a causa del maltempo',
+        'text': 'Le lezioni riprenderanno lunedì',
+        'expected': 'GLOBAL'
+    },
+    {
+        # Parità risolta per frequenza, non per ordine del dizionario
+        'title': 'Summit in London',
+        'text': 'Leaders met in Paris after Paris talks with France',
+        'expected': 'FRA'
     }
 ]
 
@@ -0,0 +1,148 @@
+"""
+Test leader election
+Due "worker" nello stesso processo: un solo leader, lock per job, failover
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from models.database import Base
+from models.job_lease import JobLease
+from jobs.leader import AdvisoryLockBackend, FileLockBackend, LeaderElector, LeaseBackend
+
+
+class _FakeConnection:
+    """Connection PostgreSQL finta: registra gli usi concorrenti dalla stessa connessione"""
+    
+    def __init__(self, overlaps):
+        self.overlaps = overlaps
+        self.busy = False
+        self.closed = False
+    
+    def _use(self):
+        if self.busy or self.closed:
+            self.overlaps.append(threading.get_ident())
+        self.busy = True
+        time.sleep(0.0005)
+        self.busy = False
+    
+    def execute(self, statement, params=None):
+        self._use()
+        return self
+    
+    def scalar(self):
+        return True
+    
+    def commit(self):
+        self._use()
+    
+    def close(self):
+        self._use()
+        self.closed = True
+
+
+class _FakeEngine:
+    def __init__(self):
+        self.overlaps = []
+    
+    def connect(self):
+        return _FakeConnection(self.overlaps)
+
+
+def _two_workers(make_backend):
+    async def scenario():
+        first = LeaderElector(make_backend('worker-1'), renew_seconds=60)
+        second = LeaderElector(make_backend('worker-2'), renew_seconds=60)
+        await first.check()
+        await second.check()
+        assert first.is_leader and not second.is_leader
+        
+        # Lock per job: un solo worker alla volta, anche se non leader
+        async with second.job_lock('scrape') as acquired:
+            assert acquired
+            async with first.job_lock('scrape') as other:
+                assert not other
+        
+        # Il leader si ferma (shutdown): l'altro subentra al giro successivo
+        await first.stop()
+        await second.check()
+        assert second.is_leader and not first.is_leader
+        await second.stop()
+        return first.stats, second.stats
+    
+    return asyncio.run(scenario())
+
+
+def test_file_lock_failover():
+    """flock: lock per file descriptor, due backend nello stesso processo si escludono"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = _two_workers(lambda identity: FileLockBackend(tmp, identity))
+    assert first['elections'] == 1 and second['elections'] == 1
+    assert first['job_locks_denied'] == 1
+    print("✅ File lock failover OK")
+
+
+def test_advisory_lock_thread_safety():
+    """renew dal thread di poll e acquire/release dai worker: mai due thread sulla stessa Connection"""
+    engine = _FakeEngine()
+    backend = AdvisoryLockBackend(engine, 'worker-1')
+    assert backend.try_acquire('job:refresh')
+    stop = threading.Event()
+    
+    def poll():
+        while not stop.is_set():
+            backend.renew('job:refresh')
+    
+    poller = threading.Thread(target=poll)
+    poller.start()
+    try:
+        for _ in range(100):
+            backend.release('job:refresh')
+            assert backend.try_acquire('job:refresh')
+    finally:
+        stop.set()
+        poller.join()
+    backend.release('job:refresh')
+    assert engine.overlaps == []
+    print("✅ Advisory lock thread safety OK")
+
+
+def test_lease_failover_and_expiry():
+    """Lease su DB: failover su rilascio e presa di un lease scaduto"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'leases.db')}")
+        Base.metadata.create_all(bind=engine, tables=[JobLease.__table__])
+        sessions = sessionmaker(bind=engine)
+        
+        _two_workers(lambda identity: LeaseBackend(sessions, identity, lease_seconds=30))
+        
+        # Un leader morto senza rilasciare: il lease scade e viene ripreso
+        crashed = LeaseBackend(sessions, 'crashed', lease_seconds=30)
+        survivor = LeaseBackend(sessions, 'survivor', lease_seconds=30)
+        assert crashed.try_acquire('job:cleanup')
+        assert not survivor.try_acquire('job:cleanup')
+        
+        db = sessions()
+        db.query(JobLease).filter(JobLease.name == 'job:cleanup').update(
+            {'expires_at': datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+        db.close()
+        
+        assert survivor.try_acquire('job:cleanup')
+        assert not crashed.renew('job:cleanup')
+        engine.dispose()
+    print("✅ Lease failover + expiry OK")
+
+
+if __name__ == "__main__":
+    test_file_lock_failover()
+    test_advisory_lock_thread_safety()
+    test_lease_failover_and_expiry()
+    print("\n✅ All leader election tests passed!")
@@ -1,12 +1,27 @@
 """
 Test script for Parser Service
+Offline: le pagine ANSA arrivano dalle sorgenti sintetiche (benchmarks/synthetic.py)
+clean_html: ogni motore confrontato col vecchio percorso BeautifulSoup sulle fixture
 """
+import importlib
+import os
+import re
 import sys
 from datetime import datetime, timedelta
-sys.path.append('/Users/Edoardo.dng/Desktop/Pulse/Pulse/backend')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from benchmarks.bench_clean_html import legacy_clean_html, load_corpus
+from benchmarks.synthetic import SyntheticSources
+from config import settings
 from scrapers import scraper_registry
-from services.parser_service import parser_service
+from scrapers.replay import use_cassette
+from services.parser_service import ParserService, parser_service
+
+# Il modulo (services.parser_service come attributo è il singleton)
+parser_module = importlib.import_module('services.parser_service')
+
+# Filtro caratteri del clean_html originale (prima dei segni tipografici)
+LEGACY_CHARS_PATTERN = re.compile(r'[^\w\s.,!?;:()\-\'"àèéìòùÀÈÉÌÒÙäöüÄÖÜßñÑ]')
 
 
 def test_parser_with_real_data():
@@ -17,29 +32,28 @@ def test_parser_with_real_data():
     print("=" * 60)
     
     # 1. Scrape real data
-    print("\n1️⃣  Scraping real articles from ANSA...")
+    print("\n1️⃣  Scraping synthetic ANSA pages (replay)...")
     
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
     
-    df = scraper_registry.scrape_all(
-        query="intelligenza artificiale",
-        sources=['ansa'],
-        max_pages=2,
-        start_date=start_date,
-        end_date=end_date
-    )
+    with use_cassette(generator=SyntheticSources(pages=2, now=end_date), strict=False):
+        df = scraper_registry.scrape_all(
+            query="intelligenza artificiale",
+            sources=['ansa'],
+            max_pages=2,
+            start_date=start_date,
+            end_date=end_date
+        )
     
-    if df.empty:
-        print("❌ No articles found!")
-        return
+    assert not df.empty, "No articles found!"
     
     print(f"✅ Scraped {len(df)} raw articles\n")
     
     # 2. Parse articles
     print("2️⃣  Parsing and normalizing articles...")
     
-    parsed_articles = parser_service.parse_dataframe(df, 'ansa')
+    parsed_articles = parser_service.parse_dataframe(df)
     
     print(f"✅ Parsed {len(parsed_articles)} articles\n")
     
@@ -104,5 +118,97 @@ def test_parser_with_real_data():
     print("=" * 60)
 
 
+def _engines():
+    """Motori HTML installati (bs4 sempre disponibile)"""
+    engines = ['auto', 'bs4']
+    if parser_module.lxml_html is not None:
+        engines.append('lxml')
+    if parser_module.SelectolaxParser is not None:
+        engines.append('selectolax')
+    return engines
+
+
+def _as_legacy(text: str) -> str:
+    """
+    Uscita nuova ridotta al set di caratteri originale; spazi normalizzati
+    (il vecchio filtro lasciava doppi spazi dove toglieva caratteri)
+    """
+    return ' '.join(LEGACY_CHARS_PATTERN.sub('', text).split())
+
+
+def test_clean_html_engines_match_legacy():
+    """Ogni motore dà lo stesso testo del vecchio percorso BeautifulSoup sulle fixture"""
+    corpus = load_corpus()
+    page = corpus['html_page'][0]
+    body = page[page.index('<body>'):page.index('</body>') + len('</body>')]
+    texts = corpus['plain_text'] + corpus['html_fragment'] + [body]
+    original_engine = settings.HTML_CLEANER_ENGINE
+    try:
+        for engine in _engines():
+            settings.HTML_CLEANER_ENGINE = engine
+            for text in texts:
+                assert _as_legacy(ParserService.clean_html(text)) == ' '.join(legacy_clean_html(text).split()), engine
+            # Pagina intera: script/style scartati da tutti i motori
+            assert 'margin' not in ParserService.clean_html(page)
+            assert ParserService.clean_html(page).endswith(ParserService.clean_html(body))
+    finally:
+        settings.HTML_CLEANER_ENGINE = original_engine
+    print("✅ clean_html engines match legacy OK")
+
+
+def test_clean_html_fast_path():
+    """Testo senza tag non passa dal parser HTML: solo unescape e filtri"""
+    extract_text = parser_module._extract_text
+    
+    def no_parser(markup, engine):
+        raise AssertionError(f"parser HTML chiamato su {markup!r}")
+    
+    parser_module._extract_text = no_parser
+    try:
+        assert ParserService.clean_html("Prezzi &egrave; 3 < 5 &amp; oltre") == "Prezzi è 3 5 oltre"
+        assert ParserService.clean_html("  Testo   già\n pulito ") == "Testo già pulito"
+        assert ParserService.clean_html("«Città» — l’euro… +5%") == "«Città» — l’euro… 5%"
+    finally:
+        parser_module._extract_text = extract_text
+    
+    for text in ("Prezzi &egrave; 3 < 5 &amp; oltre", "a<b>grassetto</b>"):
+        assert _as_legacy(ParserService.clean_html(text)) == ' '.join(legacy_clean_html(text).split())
+    print("✅ clean_html fast path OK")
+
+
+def test_clean_html_disallowed_chars():
+    """Caratteri di controllo ed emoji rimossi, segni combinanti e scritture non latine tenuti"""
+    assert ParserService.clean_html("A\x00B\x07C\x1bD\x7f") == "ABCD"
+    assert ParserService.clean_html("<p>Ciao\x00 mondo\x08</p>") == "Ciao mondo"
+    assert ParserService.clean_html("Titolo 🚀 ✓") == "Titolo"
+    assert ParserService.clean_html("क्षेत्र ไทย עִבְרִית") == "क्षेत्र ไทย עִבְרִית"
+    print("✅ clean_html disallowed chars OK")
+
+
+def test_clean_many():
+    """None e stringhe vuote danno '', stringhe ripetute pulite una volta sola"""
+    calls = []
+    clean_html = ParserService.clean_html
+    
+    def counted(text):
+        calls.append(text)
+        return clean_html(text)
+    
+    ParserService.clean_html = staticmethod(counted)
+    try:
+        texts = [None, '', '<p>Ciao</p>', 'Ciao &amp; co', '<p>Ciao</p>', None, 'Ciao &amp; co']
+        assert ParserService.clean_many(texts) == ['', '', 'Ciao', 'Ciao co', 'Ciao', '', 'Ciao co']
+        assert calls == ['<p>Ciao</p>', 'Ciao &amp; co']
+        assert ParserService.clean_many([]) == []
+        assert ParserService.clean_many(iter([None])) == ['']
+    finally:
+        ParserService.clean_html = staticmethod(clean_html)
+    print("✅ clean_many OK")
+
+
 if __name__ == "__main__":
     test_parser_with_real_data()
+    test_clean_html_engines_match_legacy()
+    test_clean_html_fast_path()
+    test_clean_html_disallowed_chars()
+    test_clean_many()
@@ -0,0 +1,89 @@
+"""
+Test processing service
+Percorso con process pool: ordine tra blocchi, dedup, hash di contenuto ed errori
+"""
+from config import settings
+from models.record import ArticleRecord
+from services.processing_service import ProcessingService, _content_hash
+
+SOURCES = ('ansa', 'hackernews')
+ERRORS = {i for i in range(300) if i % 50 == 7}
+SAME_TEXT = {120: 'ansa', 160: 'ansa', 220: 'ansa', 121: 'hackernews'}
+
+
+def _records():
+    """
+    300 record in 3 blocchi da 100: 250-299 ripetono i source_id 0-49
+    (stessa fonte, blocco diverso), alcuni senza source_id con lo stesso
+    testo, titoli non stringa che fanno fallire il parse
+    """
+    records = []
+    for i in range(300):
+        record = ArticleRecord(
+            source=SOURCES[i % 2], source_id=str(i % 250),
+            title=f"Titolo {i}", content=f"<p>Testo <b>{i}</b></p>"
+        )
+        if i in ERRORS:
+            record.title = 123
+        if i in SAME_TEXT:
+            record.source_id, record.title, record.content = '', 'Stesso testo', '<p>Uguale</p>'
+        records.append(record)
+    return records
+
+
+def test_pool_order_dedup_errors():
+    """workers>1: ordine di input, prima occorrenza tenuta, fallback hash, errori contati per indice"""
+    records = _records()
+    threshold = settings.PROCESSING_POOL_THRESHOLD
+    settings.PROCESSING_POOL_THRESHOLD = 0
+    try:
+        result = ProcessingService().process_records(records, workers=2, chunk_size=100)
+    finally:
+        settings.PROCESSING_POOL_THRESHOLD = threshold
+    
+    # Nel pool i record tornano come copie: gli originali restano intatti
+    assert records[0].content == "<p>Testo <b>0</b></p>"
+    assert result['workers'] == 2 and result['total'] == 300
+    
+    expected = []
+    for i in range(250):
+        if i in ERRORS or i in (160, 220):
+            continue
+        expected.append((SOURCES[i % 2], 'Stesso testo' if i in SAME_TEXT else f"Titolo {i}"))
+    articles = result['articles']
+    assert [(a.source, a.title) for a in articles] == expected
+    assert articles[0].content == "Testo 0"
+    
+    # Senza source_id: hash del testo, dedup solo nella stessa fonte
+    hashed = [a for a in articles if a.title == 'Stesso testo']
+    assert [a.source for a in hashed] == ['ansa', 'hackernews']
+    assert {a.source_id for a in hashed} == {_content_hash('Stesso testo', 'Uguale')}
+    
+    # 49 ripetizioni cross-blocco (257 è un errore) + 2 testi uguali
+    assert result['duplicates'] == 51
+    assert result['errors'] == len(ERRORS) == 6
+    assert [s['index'] for s in result['error_samples']] == sorted(ERRORS)
+    assert all(s['error'].startswith('parse:') for s in result['error_samples'])
+    print("✅ Pool order/dedup/errors OK")
+
+
+def test_pool_matches_serial():
+    """Stesso risultato con e senza pool"""
+    threshold = settings.PROCESSING_POOL_THRESHOLD
+    settings.PROCESSING_POOL_THRESHOLD = 0
+    try:
+        pooled = ProcessingService().process_records(_records(), workers=2, chunk_size=100)
+        serial = ProcessingService().process_records(_records(), workers=1, chunk_size=100)
+    finally:
+        settings.PROCESSING_POOL_THRESHOLD = threshold
+    
+    assert [a.to_dict() for a in pooled['articles']] == [a.to_dict() for a in serial['articles']]
+    for key in ('duplicates', 'errors', 'error_samples'):
+        assert pooled[key] == serial[key]
+    print("✅ Pool matches serial OK")
+
+
+if __name__ == "__main__":
+    test_pool_order_dedup_errors()
+    test_pool_matches_serial()
+    print("\n✅ All processing tests passed!")
@@ -0,0 +1,120 @@
+"""
+Test profiling dei job
+Profilo multi-thread unito, statement SQL per thread, artifact, arm/campionamento
+"""
+import os
+import tempfile
+import threading
+
+from sqlalchemy import text
+
+from config import settings
+from models.database import engine
+from services.profiling import JobProfiler, normalize_statement
+
+
+def _busy(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def _query(times: int):
+    with engine.connect() as conn:
+        for _ in range(times):
+            conn.execute(text("SELECT 1"))
+
+
+def test_session_threads_and_sql(tmp_path=None):
+    """Thread worker uniti nello stesso profilo; SQL contato solo per i thread profilati"""
+    directory = str(tmp_path or tempfile.mkdtemp())
+    profiler = JobProfiler(directory)
+    
+    def worker(session):
+        with session.thread():
+            _busy(20000)
+            _query(2)
+    
+    with profiler.session('scrape', force=True) as session:
+        threads = [threading.Thread(target=worker, args=(session,)) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        _query(5)  # Thread non profilato: non conta
+    
+    report = session.report
+    assert report['sql']['statements'] == 4
+    assert report['sql']['top'][0]['statement'] == 'SELECT 1'
+    busy = [row for row in report['functions'] if row['function'].endswith('(_busy)')]
+    assert busy and busy[0]['calls'] == 2
+    assert sorted(os.listdir(directory)) == sorted(report['artifacts'] + [report['id'] + '.json'])
+    assert profiler.list_profiles('scrape')[0]['id'] == report['id']
+    print("✅ Session threads + SQL OK")
+
+
+def test_arm_and_sampling(tmp_path=None):
+    """Run non campionati disabilitati; arm() profila esattamente il run successivo"""
+    directory = str(tmp_path or tempfile.mkdtemp())
+    profiler = JobProfiler(directory)
+    enabled = settings.PROFILING_ENABLED
+    settings.PROFILING_ENABLED = False
+    try:
+        with profiler.profile('cleanup') as session:
+            _busy(100)
+        assert not session.enabled and session.report is None
+        
+        profiler.arm('cleanup')
+        with profiler.profile('cleanup') as session:
+            _busy(100)
+        assert session.enabled and session.report is not None
+        
+        with profiler.profile('cleanup') as session:
+            pass
+        assert not session.enabled
+    finally:
+        settings.PROFILING_ENABLED = enabled
+    assert len(profiler.list_profiles()) == 1
+    print("✅ Arm + sampling OK")
+
+
+def test_prune_keeps_newest_across_jobs(tmp_path=None):
+    """Il profilo appena scritto resta anche se altri job hanno nomi che vengono dopo"""
+    directory = str(tmp_path or tempfile.mkdtemp())
+    profiler = JobProfiler(directory)
+    keep = settings.PROFILING_KEEP
+    settings.PROFILING_KEEP = 3
+    try:
+        for _ in range(5):
+            with profiler.session('scrape', force=True):
+                pass
+        with profiler.session('cleanup', force=True) as session:
+            pass
+    finally:
+        settings.PROFILING_KEEP = keep
+    
+    profiles = profiler.list_profiles()
+    assert [report['job'] for report in profiles] == ['cleanup', 'scrape', 'scrape']
+    assert profiles[0]['id'] == session.report['id']
+    print("✅ Prune across jobs OK")
+
+
+def test_profiler_fixture(profiler):
+    """Fixture pytest con gli stessi hook dei job"""
+    with profiler('fixture') as session:
+        _query(3)
+    assert session.report['sql']['statements'] == 3
+
+
+def test_normalize_statement():
+    """Liste IN espanse ridotte: stessa query con N parametri diversi, una riga"""
+    a = normalize_statement("SELECT id FROM articles\n WHERE source_id IN (?, ?, ?)")
+    b = normalize_statement("SELECT id FROM articles WHERE source_id IN (?, ?)")
+    assert a == b == "SELECT id FROM articles WHERE source_id IN (?, ...)"
+    print("✅ Normalize statement OK")
+
+
+if __name__ == "__main__":
+    test_session_threads_and_sql()
+    test_arm_and_sampling()
+    test_prune_keeps_newest_across_jobs()
+    test_normalize_statement()
+    print("\n✅ All profiling tests passed!")
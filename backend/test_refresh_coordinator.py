@@ -0,0 +1,112 @@
+"""
+Test coordinatore refresh topic
+Coalescing nella finestra di debounce, soglia articoli nuovi, cancellazione
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from jobs.refresh_coordinator import RefreshCoordinator
+
+
+class _FakeRefresh:
+    """Refresh che dura `duration` secondi controllando should_stop ogni 10ms"""
+    
+    def __init__(self, duration: float = 0.0):
+        self.duration = duration
+        self.runs = 0
+    
+    def __call__(self, should_stop):
+        self.runs += 1
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            if should_stop():
+                raise RuntimeError("stopped")
+            time.sleep(0.01)
+        return {'run': self.runs}
+
+
+def _coordinator(refresh, new_articles: int, **kwargs) -> RefreshCoordinator:
+    options = dict(debounce_seconds=0.05, max_delay_seconds=1.0, min_new_articles=10)
+    options.update(kwargs)
+    return RefreshCoordinator(refresh=refresh, count_new_articles=lambda since: new_articles, **options)
+
+
+async def _settle(coordinator: RefreshCoordinator, timeout: float = 3.0):
+    """Attende che non ci siano run in corso né richieste pendenti"""
+    deadline = time.monotonic() + timeout
+    while coordinator.running or coordinator._pending is not None:
+        assert time.monotonic() < deadline, "coordinator did not settle"
+        await asyncio.sleep(0.01)
+
+
+def test_coalescing_and_reasons():
+    """Richieste ravvicinate -> un solo run con tutti i motivi"""
+    refresh = _FakeRefresh()
+    coordinator = _coordinator(refresh, new_articles=50)
+    
+    async def scenario():
+        for _ in range(5):
+            coordinator.request('ingest', new_articles=20)
+            await asyncio.sleep(0.01)
+        coordinator.request('interval')
+        await _settle(coordinator)
+    
+    asyncio.run(scenario())
+    
+    assert refresh.runs == 1
+    entry = coordinator.history[-1]
+    assert entry['status'] == 'completed' and entry['reasons'] == ['ingest', 'interval']
+    assert entry['requested_new_articles'] == 100 and entry['new_articles'] == 50
+    # Stesso riferimento di Article.scraped_at (utcnow), non l'ora locale
+    assert abs((datetime.utcnow() - coordinator.last_refresh_at).total_seconds()) < 5
+    print("✅ Coalescing OK")
+
+
+def test_threshold_skip_and_force():
+    """Pochi articoli nuovi: run saltato, ma un refresh forzato parte comunque"""
+    refresh = _FakeRefresh()
+    coordinator = _coordinator(refresh, new_articles=3)
+    
+    async def scenario():
+        coordinator.request('interval')
+        await _settle(coordinator)
+        coordinator.request('manual', force=True)
+        await _settle(coordinator)
+    
+    asyncio.run(scenario())
+    
+    assert [e['status'] for e in coordinator.history] == ['skipped', 'completed']
+    assert refresh.runs == 1
+    print("✅ Threshold skip + force OK")
+
+
+def test_superseded_run_is_cancelled_once():
+    """Richiesta forzata durante un run: il run viene cancellato e ne parte uno nuovo"""
+    refresh = _FakeRefresh(duration=0.3)
+    coordinator = _coordinator(refresh, new_articles=50)
+    
+    async def scenario():
+        coordinator.request('ingest', new_articles=50)
+        await asyncio.sleep(0.15)  # run in corso
+        assert coordinator.running
+        coordinator.request('manual', force=True)
+        await asyncio.sleep(0.1)
+        # Una seconda richiesta non cancella di nuovo il run appena ripartito
+        coordinator.request('manual', force=True)
+        await _settle(coordinator)
+    
+    asyncio.run(scenario())
+    
+    statuses = [e['status'] for e in coordinator.history]
+    assert statuses[0] == 'cancelled' and statuses[-1] == 'completed'
+    assert statuses.count('cancelled') == 1
+    assert coordinator.snapshot()['counts']['cancelled'] == 1
+    print("✅ Supersede + cancel OK")
+
+
+if __name__ == "__main__":
+    test_coalescing_and_reasons()
+    test_threshold_skip_and_force()
+    test_superseded_run_is_cancelled_once()
+    print("\n✅ All refresh coordinator tests passed!")
@@ -0,0 +1,151 @@
+"""
+Test cache delle risposte
+Hit/miss per route e query, ETag e 304, invalidazione per namespace, LRU e TTL
+"""
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from config import settings
+from services.response_cache import (
+    CachedResponse, ResponseCache, ResponseCacheMiddleware, invalidate_responses, response_cache,
+    response_cache_enabled,
+)
+
+
+def _app(cache: ResponseCache):
+    """Route con gli stessi template di quelle in cache, contano le esecuzioni"""
+    app = FastAPI()
+    calls = {'topics': 0, 'topic': 0, 'stats': 0, 'articles': 0}
+    
+    @app.get("/api/topics")
+    def topics(limit: int = 20):
+        calls['topics'] += 1
+        return [{'topic_id': f"topic_{i}", 'version': calls['topics']} for i in range(limit)]
+    
+    @app.get("/api/topics/{topic_id}")
+    def topic(topic_id: str):
+        calls['topic'] += 1
+        raise HTTPException(status_code=404, detail=f"Topic {topic_id} not found")
+    
+    @app.get("/api/stats/overview")
+    async def overview():
+        calls['stats'] += 1
+        return {'total_articles': calls['stats']}
+    
+    @app.get("/api/articles/")
+    async def articles():
+        calls['articles'] += 1
+        return []
+    
+    app.add_middleware(ResponseCacheMiddleware, router=app.router, cache=cache)
+    return app, calls
+
+
+def _run(app, scenario):
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_hits_etag_and_304():
+    """Seconda richiesta servita dalla cache; If-None-Match con l'ETag -> 304 senza body"""
+    cache = ResponseCache(max_entries=10, ttl=60, backend='memory')
+    app, calls = _app(cache)
+    
+    async def scenario(client):
+        first = await client.get("/api/topics?limit=3")
+        second = await client.get("/api/topics?limit=3")
+        other = await client.get("/api/topics?limit=2")
+        revalidated = await client.get("/api/topics?limit=3", headers={'If-None-Match': first.headers['etag']})
+        stale = await client.get("/api/topics?limit=3", headers={'If-None-Match': '"old"'})
+        return first, second, other, revalidated, stale
+    
+    first, second, other, revalidated, stale = _run(app, scenario)
+    assert calls['topics'] == 2  # limit=3 e limit=2
+    assert first.json() == second.json() and len(other.json()) == 2
+    assert first.headers['etag'] == second.headers['etag'] != other.headers['etag']
+    assert first.headers['etag'].startswith('"') and first.headers['cache-control'] == 'no-cache'
+    assert revalidated.status_code == 304 and revalidated.content == b''
+    assert revalidated.headers['etag'] == first.headers['etag']
+    assert stale.status_code == 200 and stale.json() == first.json()
+    print("✅ Hits + ETag/304 OK")
+
+
+def test_invalidation_by_namespace():
+    """'articles' invalida le stats ma non i topic; route non in cache ed errori mai in cache"""
+    cache = ResponseCache(max_entries=10, ttl=60, backend='memory')
+    app, calls = _app(cache)
+    
+    async def scenario(client):
+        for path in ("/api/topics", "/api/stats/overview", "/api/articles/", "/api/topics/topic_9"):
+            await client.get(path)
+        cache.invalidate('articles')
+        before = await client.get("/api/stats/overview")
+        for path in ("/api/topics", "/api/stats/overview", "/api/articles/", "/api/topics/topic_9"):
+            await client.get(path)
+        cache.invalidate('topics')
+        await client.get("/api/topics")
+        return before
+    
+    before = _run(app, scenario)
+    assert before.json() == {'total_articles': 2}
+    assert calls == {'topics': 2, 'topic': 2, 'stats': 2, 'articles': 2}
+    print("✅ Invalidation by namespace OK")
+
+
+def test_lru_and_ttl():
+    """Oltre max_entries esce la meno usata; entry scadute non servite"""
+    cache = ResponseCache(max_entries=2, ttl=60, backend='memory')
+    for key in ('a', 'b'):
+        cache.put(key, CachedResponse([], key.encode()))
+    cache.get('a')
+    cache.put('c', CachedResponse([], b'c'))
+    assert cache.get('b') is None
+    assert cache.get('a').body == b'a' and cache.get('c').body == b'c'
+    
+    expiring = ResponseCache(max_entries=2, ttl=0.05, backend='memory')
+    expiring.put('a', CachedResponse([], b'a'))
+    time.sleep(0.1)
+    assert expiring.get('a') is None
+    
+    entry = CachedResponse([(b'content-type', b'application/json')], b'{"a": 1}\n')
+    restored = CachedResponse.loads(entry.dumps(), 0.0)
+    assert (restored.headers, restored.body, restored.etag) == (entry.headers, entry.body, entry.etag)
+    print("✅ LRU + TTL OK")
+
+
+def test_disabled_with_read_replica():
+    """Con DATABASE_READ_URL su una replica niente cache né invalidazioni"""
+    original = settings.RESPONSE_CACHE_ENABLED, settings.DATABASE_URL, settings.DATABASE_READ_URL
+    try:
+        settings.RESPONSE_CACHE_ENABLED = True
+        settings.DATABASE_URL = 'postgresql://primary/pulse'
+        for read_url in (None, 'postgresql://primary/pulse'):
+            settings.DATABASE_READ_URL = read_url
+            assert response_cache_enabled()
+        
+        settings.DATABASE_READ_URL = 'postgresql://replica/pulse'
+        assert not response_cache_enabled()
+        before = response_cache.versions(['articles'])
+        invalidate_responses('articles')
+        assert response_cache.versions(['articles']) == before
+        
+        settings.DATABASE_READ_URL = None
+        settings.RESPONSE_CACHE_ENABLED = False
+        assert not response_cache_enabled()
+    finally:
+        settings.RESPONSE_CACHE_ENABLED, settings.DATABASE_URL, settings.DATABASE_READ_URL = original
+    print("✅ Disabled with read replica OK")
+
+
+if __name__ == "__main__":
+    test_hits_etag_and_304()
+    test_invalidation_by_namespace()
+    test_lru_and_ttl()
+    test_disabled_with_read_replica()
+    print("\n✅ All response cache tests passed!")
@@ -0,0 +1,67 @@
+"""
+Test salvataggio bulk
+save_records: lookup IN a blocchi, duplicati nel batch e già in DB, conteggio inseriti
+"""
+import os
+import tempfile
+
+from sqlalchemy import create_engine, event, func, select
+
+from models import database
+from models.article import Article
+from models.record import ArticleRecord
+from services.storage_service import SAVE_LOOKUP_CHUNK, storage_service
+
+
+def _records(ids, title='Titolo'):
+    return [
+        ArticleRecord(source='ansa', source_id=f"id-{i}", title=f"{title} {i}", content="Testo", language='it')
+        for i in ids
+    ]
+
+
+def test_save_records_dedup():
+    """Righe già in DB saltate con una IN per blocco, duplicati nel batch alla prima occorrenza"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'save.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        lookups = []
+        
+        def count_lookups(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT') and ' IN (' in statement:
+                lookups.append(len(parameters))
+        
+        try:
+            assert storage_service.save_records(_records(range(600))) == 600
+            
+            # 400-1500 (1101 unici, 200 già in DB) + ripetizioni di 1000-1049 col titolo cambiato
+            batch = _records(range(400, 1501)) + _records(range(1000, 1050), title='Ripetuto')
+            event.listen(engine, 'before_cursor_execute', count_lookups)
+            try:
+                saved = storage_service.save_records(batch)
+            finally:
+                event.remove(engine, 'before_cursor_execute', count_lookups)
+            assert saved == 1101 - 200
+            assert lookups == [SAVE_LOOKUP_CHUNK, SAVE_LOOKUP_CHUNK, 101]
+            
+            assert storage_service.save_records(batch) == 0
+            assert storage_service.save_records([]) == 0
+            
+            db = database.SessionLocal()
+            try:
+                assert db.execute(select(func.count(Article.id))).scalar() == 1501
+                assert db.execute(select(func.count(func.distinct(Article.source_id)))).scalar() == 1501
+                title = db.execute(select(Article.title).where(Article.source_id == 'id-1000')).scalar()
+                assert title == 'Titolo 1000'
+            finally:
+                db.close()
+        finally:
+            database.bind_engines()
+            engine.dispose()
+    print("✅ save_records dedup OK")
+
+
+if __name__ == "__main__":
+    test_save_records_dedup()
+    print("\n✅ All save_records tests passed!")
@@ -0,0 +1,108 @@
+"""
+Test serializzazione veloce delle risposte
+Topic con fonti/conteggi aggregati, colonne degli articoli, orjson vs stdlib
+"""
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine
+
+from api import articles, topics
+from benchmarks.bench_suite import load_corpus
+from benchmarks.corpus import SyntheticCorpus
+from models import ArticleSchema, database
+from models.topic import TopicWithSources
+from services import serialization
+
+
+def _with_app(test):
+    """Esegue test(client, corpus) con le route reali su un DB SQLite temporaneo"""
+    corpus = SyntheticCorpus(400, topics=6, seed=3)
+    app = FastAPI()
+    app.include_router(articles.router, prefix="/api/articles")
+    app.include_router(topics.router)
+    
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await test(client, corpus)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'serialization.db')}")
+        database.Base.metadata.create_all(bind=engine)
+        database.bind_engines(engine)
+        try:
+            load_corpus(corpus)
+            asyncio.run(scenario())
+        finally:
+            database.bind_engines()
+            engine.dispose()
+
+
+def test_topics_with_sources():
+    """Conteggi e fonti dalla query aggregata, risposta conforme a TopicWithSources"""
+    async def check(client, corpus):
+        response = await client.get("/api/topics?limit=100")
+        assert response.status_code == 200
+        listed = response.json()
+        assert len(listed) == corpus.topics
+        
+        expected = {}
+        for article in corpus.iter_articles():
+            counts = expected.setdefault(f"topic_{article['topic']}", {})
+            counts[article['source']] = counts.get(article['source'], 0) + 1
+        for topic in listed:
+            TopicWithSources.model_validate(topic)
+            assert topic['article_count'] == sum(expected[topic['topic_id']].values())
+            assert topic['sources'] == sorted(expected[topic['topic_id']])
+        
+        single = (await client.get("/api/topics/topic_0")).json()
+        assert single == next(topic for topic in listed if topic['topic_id'] == 'topic_0')
+        assert (await client.get("/api/topics/missing")).status_code == 404
+    
+    _with_app(check)
+    print("✅ Topics with sources OK")
+
+
+def test_article_columns():
+    """Liste di articoli: solo le colonne previste, ordine per data, filtri"""
+    async def check(client, corpus):
+        page = (await client.get("/api/articles/?limit=500&language=it")).json()
+        assert page and {article['language'] for article in page} == {'it'}
+        assert [ArticleSchema.model_validate(article).id for article in page] == [article['id'] for article in page]
+        assert set(page[0]) == set(serialization.ARTICLE_FIELDS)
+        dates = [article['published_at'] for article in page]
+        assert dates == sorted(dates, reverse=True)
+        
+        topic_articles = (await client.get("/api/topics/topic_1/articles?limit=200")).json()
+        assert set(topic_articles[0]) == set(topics.TOPIC_ARTICLE_FIELDS)
+        assert 'embedding_vector' not in topic_articles[0]
+        assert {article['topic_id'] for article in topic_articles} == {'topic_1'}
+    
+    _with_app(check)
+    print("✅ Article columns OK")
+
+
+def test_dumps_fallback():
+    """Stesso JSON con orjson e con la stdlib (datetime ISO, UTF-8, compatto)"""
+    content = [{'title': "Città più calda", 'published_at': datetime(2025, 1, 2, 3, 4, 5, 6), 'score': 0.5, 'tags': None}]
+    fast = serialization.dumps(content)
+    available = serialization.ORJSON_AVAILABLE
+    serialization.ORJSON_AVAILABLE = False
+    try:
+        assert serialization.dumps(content) == fast
+    finally:
+        serialization.ORJSON_AVAILABLE = available
+    assert fast == '[{"title":"Città più calda","published_at":"2025-01-02T03:04:05.000006","score":0.5,"tags":null}]'.encode('utf-8')
+    print("✅ Dumps fallback OK")
+
+
+if __name__ == "__main__":
+    test_topics_with_sources()
+    test_article_columns()
+    test_dumps_fallback()
+    print("\n✅ All serialization tests passed!")
@@ -0,0 +1,143 @@
+"""
+Test profilo SQLite
+Pragma e WAL, lettori query_only, scritture in coda, letture durante una scrittura
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.sqlite import WriteQueue, tune_sqlite
+
+
+def _with_engines(test):
+    """test(write_engine, read_engine, queue) su un file SQLite temporaneo col profilo applicato"""
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'profile.db')}"
+        write_engine = create_engine(url, connect_args={"check_same_thread": False})
+        read_engine = create_engine(url, connect_args={"check_same_thread": False})
+        queue = WriteQueue()
+        tune_sqlite(write_engine, queue=queue)
+        tune_sqlite(write_engine, queue=queue)  # Idempotente
+        tune_sqlite(read_engine, query_only=True)
+        try:
+            with write_engine.begin() as conn:
+                conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, value TEXT)"))
+            return test(write_engine, read_engine, queue)
+        finally:
+            write_engine.dispose()
+            read_engine.dispose()
+
+
+def test_pragmas_applied():
+    """WAL, synchronous=NORMAL, busy_timeout sulle connessioni; lettori in sola lettura"""
+    def check(write_engine, read_engine, queue):
+        with write_engine.connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            assert pragma('journal_mode') == settings.SQLITE_JOURNAL_MODE.lower()
+            assert pragma('synchronous') == 1  # NORMAL
+            assert pragma('busy_timeout') == settings.SQLITE_BUSY_TIMEOUT_MS
+            assert pragma('cache_size') == -settings.SQLITE_CACHE_SIZE_KB
+            assert pragma('query_only') == 0
+        
+        with read_engine.connect() as conn:
+            assert conn.execute(text("PRAGMA query_only")).scalar() == 1
+            try:
+                conn.execute(text("INSERT INTO items (value) VALUES ('x')"))
+                assert False, "scrittura su connessione di lettura"
+            except OperationalError as exc:
+                assert 'readonly' in str(exc)
+        assert queue.writes == 1 and queue.depth == 0  # Solo il CREATE TABLE
+    
+    _with_engines(check)
+    print("✅ Pragmas applied OK")
+
+
+def test_writers_serialized():
+    """Writer concorrenti uno alla volta, in ordine, senza 'database is locked'; rollback libera la coda"""
+    def check(write_engine, read_engine, queue):
+        active, overlaps, errors = [0], [], []
+        lock = threading.Lock()
+        
+        def writer(n):
+            try:
+                with Session(write_engine) as db:
+                    db.execute(text("INSERT INTO items (value) VALUES (:v)"), {'v': f"w{n}"})
+                    with lock:
+                        active[0] += 1
+                        overlaps.append(active[0])
+                    time.sleep(0.02)  # Transazione aperta
+                    with lock:
+                        active[0] -= 1
+                    db.commit()
+            except OperationalError as exc:
+                errors.append(exc)
+        
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert errors == []
+        assert max(overlaps) == 1
+        
+        # Transazione abbandonata (close senza commit): la coda si libera
+        with Session(write_engine) as db:
+            db.execute(text("INSERT INTO items (value) VALUES ('discarded')"))
+        assert queue.acquire(timeout=0.5)
+        queue.release()
+        
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 8
+        assert queue.depth == 0
+    
+    _with_engines(check)
+    print("✅ Writers serialized OK")
+
+
+def test_reads_during_write():
+    """Con WAL le letture non aspettano una transazione di scrittura aperta"""
+    def check(write_engine, read_engine, queue):
+        with write_engine.begin() as conn:
+            conn.execute(text("INSERT INTO items (value) VALUES ('committed')"))
+        
+        opened, release = threading.Event(), threading.Event()
+        
+        def long_writer():
+            with Session(write_engine) as db:
+                db.execute(text("INSERT INTO items (value) VALUES ('pending')"))
+                db.flush()
+                opened.set()
+                release.wait(5)
+                db.commit()
+        
+        thread = threading.Thread(target=long_writer)
+        thread.start()
+        try:
+            assert opened.wait(5)
+            started = time.perf_counter()
+            with read_engine.connect() as conn:
+                count = conn.execute(text("SELECT COUNT(*) FROM items")).scalar()
+            assert count == 1  # Snapshot senza la riga non ancora committata
+            assert time.perf_counter() - started < 0.5
+        finally:
+            release.set()
+            thread.join()
+        
+        with read_engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM items")).scalar() == 2
+    
+    _with_engines(check)
+    print("✅ Reads during write OK")
+
+
+if __name__ == "__main__":
+    test_pragmas_applied()
+    test_writers_serialized()
+    test_reads_during_write()
+    print("\n✅ All SQLite tests passed!")
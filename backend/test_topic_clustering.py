@@ -1,8 +1,9 @@
 """
 Test Topic Clustering with real articles
 """
+import os
 import sys
-sys.path.insert(0, '/Users/Edoardo.dng/Desktop/Pulse/Pulse/backend')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from services.topic_service import topic_service
 from services.storage_service import storage_service
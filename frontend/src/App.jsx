@@ -1,6 +1,6 @@
 import React, { useMemo, useState, useEffect } from "react";
 import { Globe2, BellRing, FileText, Sparkles, ShieldCheck, Lock, Download, ChevronRight, LineChart, Search, RefreshCw } from "lucide-react";
-import { getTopics, getStats, transformTopic } from "./services/api";
+import { getTopics, getStats, subscribeToUpdates, transformTopic } from "./services/api";
 
 // Reference data
 const COUNTRIES = [
@@ -141,9 +141,37 @@ export default function App() {
 
   const gated = mode === "consumer";
 
-  // Load data from backend
+  // Load data from backend, then apply live updates instead of polling
   useEffect(() => {
     loadData();
+    return subscribeToUpdates({
+      // Changed metrics only: patch the topics already on screen
+      topics: ({ topics: changed }) => {
+        const byId = Object.fromEntries(changed.map((t) => [t.topic_id, t]));
+        setRawTopics((current) => current.map((t) => {
+          const update = byId[t.id];
+          if (!update) return t;
+          return {
+            ...t,
+            pulse: Math.round(update.pulse_score),
+            velocity: update.velocity,
+            spread: update.spread,
+            novelty: update.novelty,
+            volume: update.volume,
+          };
+        }));
+      },
+      articles: ({ total }) => {
+        setStats((current) => current && {
+          ...current,
+          total_articles: current.total_articles + total,
+          last_24h: current.last_24h + total,
+        });
+      },
+      // New clustering or missed events: reload the full state once
+      refresh: () => loadData(),
+      resync: () => loadData(),
+    });
   }, []);
 
   async function loadData() {
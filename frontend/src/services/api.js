@@ -184,6 +184,26 @@ export async function refreshAllMetrics() {
   });
 }
 
+/**
+ * Live updates via Server-Sent Events (/api/stream)
+ * handlers: { articles, topics, refresh, resync } called with the parsed event data.
+ * EventSource reconnects on its own and resumes from the last event id.
+ * Returns a function that closes the stream.
+ */
+export function subscribeToUpdates(handlers = {}) {
+  const types = Object.keys(handlers).filter((type) => type !== 'resync');
+  const params = new URLSearchParams();
+  if (types.length) params.append('types', types.join(','));
+
+  const source = new EventSource(`${API_BASE_URL}/api/stream?${params.toString()}`);
+  for (const [type, handler] of Object.entries(handlers)) {
+    source.addEventListener(type, (event) => handler(JSON.parse(event.data)));
+  }
+  source.onerror = () => console.warn('Live updates disconnected, retrying...');
+
+  return () => source.close();
+}
+
 /**
  * Transform backend topic to UI format
  */